@@ -0,0 +1,57 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+
+# ------------------------- Slot start lattice ------------------------
+class SlotLattice:
+    '''
+    Valid slot start times for one request - every step seconds from each local midnight in the anchor timezone
+    UTC with a step dividing the hour gives the same times as ceil_slot_to_interval (xx:00, xx:15 ...)
+    A local timezone keeps starts on its own hours, e.g. xx:00 / xx:30 in Asia/Kolkata instead of xx:30 / xx:00 UTC
+    Steps that do not divide the day restart at every local midnight, so each day starts at 00:00
+    Like ceil_slot_to_interval a window start already on a lattice point is kept
+    Midnights are precomputed once per request, each lookup after that is O(log days)
+    '''
+    __slots__ = ("step", "midnights")
+
+    def __init__(self, step:int, search_start:datetime, search_end:datetime, tz_name:str = "UTC"):
+        tz = ZoneInfo(tz_name)
+        self.step = step
+        # A day either side so windows touching the search bounds always have a lattice day
+        local_day = search_start.astimezone(tz).date() - timedelta(days=1)
+        last_day = search_end.astimezone(tz).date() + timedelta(days=2)
+        midnights = []
+        while local_day <= last_day:
+            midnights.append(int(datetime(local_day.year, local_day.month, local_day.day, tzinfo=tz).timestamp()))
+            local_day += timedelta(days=1)
+        self.midnights = midnights
+
+    def day_bounds(self, ts:int):
+        '''
+        (midnight, next midnight) of the lattice day holding ts
+        '''
+        i = bisect_right(self.midnights, ts) - 1
+        return self.midnights[i], self.midnights[i + 1]
+
+    def ceil(self, ts:int):
+        '''
+        First lattice point at or after ts O(log days)
+        '''
+        midnight, next_midnight = self.day_bounds(ts)
+        since_midnight = ts - midnight
+        if since_midnight % self.step == 0:
+            return ts
+        point = midnight + (since_midnight // self.step + 1) * self.step
+        return point if point < next_midnight else next_midnight
+
+    def slot_starts(self, window_start:int, window_end:int, length:int):
+        '''
+        Lattice starts of every slot of length seconds that fits in the window, one range per lattice day
+        '''
+        last_start = window_end - length
+        start = self.ceil(window_start)
+        while start <= last_start:
+            _, next_midnight = self.day_bounds(start)
+            yield range(start, min(last_start, next_midnight - 1) + 1, self.step)
+            start = next_midnight
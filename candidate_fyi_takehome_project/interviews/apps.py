@@ -5,3 +5,6 @@ class InterviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = "candidate_fyi_takehome_project.interviews"
     verbose_name = ("Interviews")
+
+    def ready(self):
+        import candidate_fyi_takehome_project.interviews.signals  # noqa: F401
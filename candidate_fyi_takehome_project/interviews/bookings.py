@@ -0,0 +1,244 @@
+from datetime import datetime, timedelta
+from typing import List, NamedTuple
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from psycopg.types.range import Range
+
+from candidate_fyi_takehome_project.interviews.holds import HoldConflictError, get_held_busy, get_hold, place_hold, release_hold
+from candidate_fyi_takehome_project.interviews.ingest import from_epoch, to_epoch
+from candidate_fyi_takehome_project.interviews.coalesce import bump_busy_versions
+from candidate_fyi_takehome_project.interviews.free_windows import get_panel_free_windows
+from candidate_fyi_takehome_project.interviews.interval_index import BusyIntervalIndex
+from candidate_fyi_takehome_project.interviews.intervals import IntervalSet
+from candidate_fyi_takehome_project.interviews.models import Booking, CalendarSync, InterviewerBooking
+from candidate_fyi_takehome_project.interviews.providers import get_free_busy_data
+from candidate_fyi_takehome_project.interviews.slots import SlotList
+from candidate_fyi_takehome_project.interviews.utils import compute_available_slots_from_free_lists, compute_available_slots_from_free_windows
+from services.busy_columns import BusyColumns
+
+logger = logging.getLogger(__name__)
+
+# interviewer id, bookings version -> every upcoming booked (start, end) epoch pair
+BOOKED_BUSY_KEY = "interviews:booked_busy:{}:{}"
+BOOKED_BUSY_TIMEOUT = 60 * 60
+# interviewer id -> bookings version, bumped on commit of any booking change so a fill that read the rows before
+# the change lands under a version nobody reads anymore
+BOOKED_VERSION_KEY = "interviews:booked_version:{}"
+
+# Re-validation searches this far either side of the slot so window edges never change its rounding
+REVALIDATE_MARGIN = timedelta(days=1)
+
+
+class SlotUnavailableError(Exception):
+    '''
+    The requested slot is not (or no longer) free for the whole panel
+    '''
+
+
+class PanelSlots(NamedTuple):
+    interviewers: List[dict]  # {"id", "name"} per interviewer
+    slots: SlotList
+    stale: bool  # some calendar came from a cached copy past its soft TTL
+
+
+# ------------------------- Panel busy blocks ------------------------
+def get_booked_busy(interviewer_ids, search_start:datetime, search_end:datetime, fresh:bool=False):
+    '''
+    Booked interviews overlapping the window as epoch (start, end) pairs per interviewer id
+    Served from the shared cache so warm availability requests stay off the DB, misses load in one indexed query
+    fresh skips the cache, for re-validating a booking
+    '''
+    # Read before the rows, a booking committing after the query bumps it and the fill below is never served
+    versions = get_booked_versions(interviewer_ids)
+    keys = {BOOKED_BUSY_KEY.format(interviewer_id, versions[interviewer_id]): interviewer_id for interviewer_id in interviewer_ids}
+    cached = {} if fresh else cache.get_many(keys)
+    booked_by_id = {keys[key]: pairs for key, pairs in cached.items()}
+
+    missing = [interviewer_id for interviewer_id in interviewer_ids if interviewer_id not in booked_by_id]
+    if missing:
+        loaded = {interviewer_id: [] for interviewer_id in missing}
+        rows = InterviewerBooking.objects.filter(
+            interviewer_id__in=missing, period__endswith__gt=timezone.now()
+        ).order_by("period").values_list("interviewer_id", "period")
+        for interviewer_id, period in rows:
+            loaded[interviewer_id].append((to_epoch(period.lower), to_epoch(period.upper, round_up=True)))
+        if not fresh:
+            cache.set_many(
+                {BOOKED_BUSY_KEY.format(interviewer_id, versions[interviewer_id]): pairs for interviewer_id, pairs in loaded.items()},
+                BOOKED_BUSY_TIMEOUT,
+            )
+        booked_by_id.update(loaded)
+
+    window_start = to_epoch(search_start)
+    window_end = to_epoch(search_end, round_up=True)
+    booked = {}
+    for interviewer_id, pairs in booked_by_id.items():
+        in_window = [(start, end) for start, end in pairs if start < window_end and end > window_start]
+        if in_window:
+            booked[interviewer_id] = in_window
+    return booked
+
+def get_booked_versions(interviewer_ids):
+    '''
+    interviewer id -> current bookings version
+    A missing version starts at the current time, so one evicted after a bump never brings back an older fill
+    '''
+    keys = {BOOKED_VERSION_KEY.format(interviewer_id): interviewer_id for interviewer_id in interviewer_ids}
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        versions.update(cache.get_many(missing))
+    return {interviewer_id: versions.get(key, 0) for key, interviewer_id in keys.items()}
+
+def invalidate_booked_busy(interviewer_ids):
+    '''
+    Retire cached bookings for the interviewers, call once the change is committed
+    '''
+    for interviewer_id in interviewer_ids:
+        key = BOOKED_VERSION_KEY.format(interviewer_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+    bump_busy_versions(interviewer_ids)
+
+def get_panel_busy(template, search_start:datetime, search_end:datetime, fresh:bool=False, exclude_hold:str=None):
+    '''
+    Provider busy blocks plus booked interviews and live holds for every interviewer on the template
+    Returns (provider records, busy list lined up with template.interviewers)
+    Raises CalendarProviderError when the provider fails
+    '''
+    interviewers = template.interviewers
+    interviewer_ids = [p.id for p in interviewers]
+    busy_data = get_free_busy_data(
+        interviewer_ids, timezones={p.id: p.timezone for p in interviewers},
+        columnar=True, search_window=(search_start, search_end), fresh=fresh,
+    )
+    booked = get_booked_busy(interviewer_ids, search_start, search_end, fresh=fresh)
+    held = get_held_busy(interviewer_ids, to_epoch(search_start), to_epoch(search_end, round_up=True), exclude_hold=exclude_hold)
+    busy_by_id = {interviewer_data["interviewerId"]: interviewer_data["busy"] for interviewer_data in busy_data}
+    busy_by_interviewer = []
+    for p in interviewers:
+        busy = busy_by_id.get(p.id, BusyColumns())
+        # Extra blocks go into the same column, the engine merges them in its one pass
+        extra = booked.get(p.id, []) + held.get(p.id, [])
+        if extra:
+            if isinstance(busy, BusyIntervalIndex):
+                # The index is shared by every request, its windows in the search go into a column with the extra blocks
+                busy = BusyColumns.from_pairs(busy.busy_between(to_epoch(search_start), to_epoch(search_end, round_up=True)))
+            busy = BusyColumns.concat([busy, BusyColumns.from_pairs(extra)])
+        busy_by_interviewer.append(busy)
+    return busy_data, busy_by_interviewer
+
+
+# ------------------------- Panel slots ------------------------
+def get_panel_slots(template, search_start:datetime, search_end:datetime, valid_interval:int, interval_timezone:str="UTC", fresh:bool=False, exclude_hold:str=None):
+    '''
+    Available slots for the template, with whichever engine INTERVIEWS_BUSY_SOURCE picks
+    "sql" merges the synced busy blocks and bookings into free windows inside PostgreSQL, the rest runs the free list engine
+    Returns PanelSlots
+    Raises CalendarProviderError when the provider fails
+    '''
+    if settings.INTERVIEWS_BUSY_SOURCE == "sql":
+        return get_panel_slots_in_db(template, search_start, search_end, valid_interval, interval_timezone, exclude_hold)
+    busy_data, busy_by_interviewer = get_panel_busy(template, search_start, search_end, fresh=fresh, exclude_hold=exclude_hold)
+    slots = compute_available_slots_from_free_lists(
+        search_start, search_end, valid_interval, busy_by_interviewer, template.interviewers, template.duration,
+        interval_timezone=interval_timezone,
+    )
+    return PanelSlots(
+        [{"id": i["interviewerId"], "name": i["name"]} for i in busy_data], slots,
+        any(i.get("stale", False) for i in busy_data),
+    )
+
+def get_panel_slots_in_db(template, search_start:datetime, search_end:datetime, valid_interval:int, interval_timezone:str, exclude_hold:str=None):
+    '''
+    SQL free window engine, bookings are read in the same query so they are always fresh
+    Holds live in the cache and are subtracted from the returned windows
+    '''
+    interviewer_ids = [p.id for p in template.interviewers]
+    free, split_points = get_panel_free_windows(interviewer_ids, search_start, search_end)
+    held = get_held_busy(interviewer_ids, to_epoch(search_start), to_epoch(search_end, round_up=True), exclude_hold=exclude_hold)
+    if held:
+        free = free.difference(IntervalSet.from_pairs(pair for pairs in held.values() for pair in pairs))
+    slots = compute_available_slots_from_free_windows(
+        search_start, search_end, valid_interval, free, template.interviewers, template.duration,
+        interval_timezone=interval_timezone, split_points=split_points,
+    )
+    names = dict(CalendarSync.objects.filter(interviewer_id__in=interviewer_ids).values_list("interviewer_id", "name"))
+    return PanelSlots([{"id": interviewer_id, "name": names.get(interviewer_id)} for interviewer_id in interviewer_ids], slots, False)
+
+
+# ------------------------- Holds and bookings ------------------------
+def check_slot_available(template, start:datetime, valid_interval:int, interval_timezone:str, fresh:bool=False, exclude_hold:str=None):
+    '''
+    Raises SlotUnavailableError unless start is a listed slot for the whole panel right now
+    '''
+    end = start + timedelta(minutes=template.duration)
+    search_start = start - REVALIDATE_MARGIN
+    search_end = end + REVALIDATE_MARGIN
+    panel = get_panel_slots(
+        template, search_start, search_end, valid_interval, interval_timezone, fresh=fresh, exclude_hold=exclude_hold,
+    )
+    if to_epoch(start) not in panel.slots.starts:
+        raise SlotUnavailableError()
+
+def hold_slot(template, start:datetime, valid_interval:int, interval_timezone:str="UTC"):
+    '''
+    Hold a listed slot for INTERVIEWS_HOLD_TTL seconds, it drops out of every other candidates listing until then
+    Only touches the cache, booked interviews come from the cached per interviewer bookings
+    Raises SlotUnavailableError, or CalendarProviderError when the provider fails
+    '''
+    check_slot_available(template, start, valid_interval, interval_timezone)
+    start_epoch = to_epoch(start)
+    try:
+        # Re-checks the holds under the interviewer locks, two candidates holding at once can't both win
+        return place_hold(
+            template.id, start_epoch, start_epoch + template.duration * 60,
+            [p.id for p in template.interviewers], settings.INTERVIEWS_HOLD_TTL,
+        )
+    except HoldConflictError as e:
+        raise SlotUnavailableError() from e
+
+def book_slot(template, start:datetime, candidate_email:str, valid_interval:int, interval_timezone:str="UTC", hold_id:str=None):
+    '''
+    Re-validate the slot against fresh availability, then insert the booking atomically
+    Two candidates racing for overlapping time both pass validation, the exclusion constraint rejects the second insert
+    hold_id - confirm a live hold instead, the slot was validated when it was held so no provider call is made
+    Raises SlotUnavailableError, or CalendarProviderError when the provider fails
+    '''
+    hold = None
+    if hold_id is not None:
+        hold = get_hold(hold_id)
+        if hold is None or hold.template_id != template.id:
+            raise SlotUnavailableError("Hold expired")
+        start = from_epoch(hold.start)
+    else:
+        check_slot_available(template, start, valid_interval, interval_timezone, fresh=True)
+    end = start + timedelta(minutes=template.duration)
+
+    try:
+        with transaction.atomic():
+            booking = Booking.objects.create(template_id=template.id, candidate_email=candidate_email, start=start, end=end)
+            InterviewerBooking.objects.bulk_create([
+                InterviewerBooking(booking=booking, interviewer_id=p.id, period=Range(start, end))
+                for p in template.interviewers
+            ])
+            interviewer_ids = [p.id for p in template.interviewers]
+            transaction.on_commit(lambda: invalidate_booked_busy(interviewer_ids))
+    except IntegrityError as e:
+        raise SlotUnavailableError() from e
+    if hold is not None:
+        try:
+            release_hold(hold)
+        except HoldConflictError:
+            # The booking is committed, the hold id is gone and its index entries only last until the hold expires
+            logger.warning("Could not release hold %s after booking %s", hold.id, booking.id, exc_info=True)
+    return booking
@@ -0,0 +1,99 @@
+from typing import NamedTuple, Tuple
+import time
+import logging
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from candidate_fyi_takehome_project.interviews.models import Interviewer, InterviewTemplate
+
+logger = logging.getLogger(__name__)
+
+# Shared version counter, lives in the default cache (Redis in production) so every worker sees bumps
+TEMPLATE_METADATA_VERSION_KEY = "interviews:template_metadata_version"
+
+
+class InterviewerMetadata(NamedTuple):
+    id: int
+    timezone: str
+    workday_start_hour: int
+    workday_end_hour: int
+    weekly_schedule: Tuple[Tuple[int, int, int], ...]
+
+
+class TemplateMetadata(NamedTuple):
+    id: int
+    name: str
+    duration: int
+    interviewers: Tuple[InterviewerMetadata, ...]
+
+
+# Per process cache - template_id -> TemplateMetadata, only valid for _cached_version
+_template_metadata = {}
+_cached_version = None
+
+
+# ------------------------- Template metadata cache ------------------------
+def get_template_metadata(template_id: int) -> TemplateMetadata:
+    '''
+    Returns the template -> interviewers graph needed to compute availability
+    Served from the per process cache while the shared version counter is unchanged, warm calls hit the DB zero times
+    Raises InterviewTemplate.DoesNotExist like a normal .get()
+    '''
+    global _cached_version
+
+    # Read the version before loading so a change landing mid load gets refetched on the next call
+    version = get_metadata_version()
+    if version is None:
+        # Shared cache unreachable, can't validate entries so always load fresh
+        return load_template_metadata(template_id)
+    if version != _cached_version:
+        # Every entry is stale once the version moves, drop them all to keep memory bounded
+        _template_metadata.clear()
+        _cached_version = version
+
+    metadata = _template_metadata.get(template_id)
+    if metadata is None:
+        metadata = load_template_metadata(template_id)
+        _template_metadata[template_id] = metadata
+
+    return metadata
+
+
+def load_template_metadata(template_id: int) -> TemplateMetadata:
+    '''
+    Load a template, its interviewers and their weekly schedules from the DB with prefetches
+    '''
+    template = InterviewTemplate.objects.prefetch_related(
+        Prefetch("interviewers", queryset=Interviewer.objects.order_by("id").prefetch_related("working_hours"))
+    ).get(id=template_id)
+
+    interviewers = tuple(
+        InterviewerMetadata(i.id, i.timezone, i.workday_start_hour, i.workday_end_hour, i.weekly_schedule)
+        for i in template.interviewers.all()
+    )
+    return TemplateMetadata(template.id, template.name, template.duration, interviewers)
+
+
+def get_metadata_version():
+    '''
+    Current shared version, initialized if the key is missing (first run or evicted)
+    '''
+    version = cache.get(TEMPLATE_METADATA_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a reset counter never matches a version cached before the eviction
+        cache.add(TEMPLATE_METADATA_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(TEMPLATE_METADATA_VERSION_KEY)
+    return version
+
+
+def bump_metadata_version():
+    '''
+    Invalidate every workers template metadata cache
+    '''
+    try:
+        cache.incr(TEMPLATE_METADATA_VERSION_KEY)
+    except ValueError:
+        # Key missing, any fresh value invalidates existing caches
+        cache.add(TEMPLATE_METADATA_VERSION_KEY, time.time_ns(), timeout=None)
+    logger.debug("Bumped interview template metadata version")
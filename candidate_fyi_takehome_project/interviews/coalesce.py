@@ -0,0 +1,137 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Published result of a computation, read by identical requests in other processes
+COALESCE_RESULT_KEY = "interviews:coalesce:result:{}"
+# Held by the one process computing the key
+COALESCE_LOCK_KEY = "interviews:coalesce:lock:{}"
+COALESCE_POLL_SECONDS = 0.01
+# interviewer id -> counter bumped whenever their bookings, holds or synced blocks change
+BUSY_VERSION_KEY = "interviews:busy_version:{}"
+
+
+# ------------------------- In process singleflight ------------------------
+class Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    '''
+    Runs one computation per key at a time, callers arriving while it runs wait and share its result or exception
+    Nothing is kept once the computation finishes, later callers run it again
+    '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def do(self, key, fn):
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+
+_flights = SingleFlight()
+
+
+# ------------------------- Cross process coalescing ------------------------
+def coalesce(key:str, fn):
+    '''
+    Run fn once for every identical concurrent call, in this process and across processes sharing the cache
+    Waiters in this process share one flight, that flight takes a short cache lock and publishes its result for
+     INTERVIEWS_COALESCE_TTL seconds, so other processes wait for it instead of running fn too
+    The published result also absorbs the burst after it lands, instead of every caller recomputing at once
+    Falls back to running fn when the lock holder fails or takes longer than the lock TTL
+    '''
+    return _flights.do(key, lambda: coalesce_shared(key, fn))
+
+def coalesce_shared(key:str, fn):
+    # Fixed length key, the inputs can hold any characters
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    result_key = COALESCE_RESULT_KEY.format(digest)
+    lock_key = COALESCE_LOCK_KEY.format(digest)
+    published = cache.get(result_key)
+    if published is not None:
+        return published
+
+    lock_ttl = max(1, int(settings.INTERVIEWS_CALENDAR_TIMEOUT * 2))
+    if cache.add(lock_key, 1, lock_ttl):
+        try:
+            result = fn()
+            cache.set(result_key, result, settings.INTERVIEWS_COALESCE_TTL)
+            return result
+        finally:
+            cache.delete(lock_key)
+
+    # Another process is computing it, wait for its result while it still holds the lock
+    deadline = time.monotonic() + lock_ttl
+    while time.monotonic() < deadline:
+        time.sleep(COALESCE_POLL_SECONDS)
+        published = cache.get(result_key)
+        if published is not None:
+            return published
+        if cache.get(lock_key) is None:
+            # Released, either the result landed since the read above or the holder failed
+            published = cache.get(result_key)
+            if published is not None:
+                return published
+            break
+    return fn()
+
+
+def availability_key(template, search_start, search_end, valid_interval:int, interval_timezone:str):
+    '''
+    Identifies one availability computation, identical requests share it
+    Busy versions move with every booking, hold and sync, so a shared result never hides one
+    '''
+    versions = get_busy_versions(p.id for p in template.interviewers)
+    return (
+        f"{template.id}:{search_start.timestamp()}:{search_end.timestamp()}:{valid_interval}:{interval_timezone}:"
+        f"{settings.INTERVIEWS_BUSY_SOURCE}:{versions}"
+    )
+
+
+# ------------------------- Busy versions ------------------------
+def get_busy_versions(interviewer_ids):
+    '''
+    Current busy versions of the panel, part of the coalescing key so a published result never outlives a change
+    '''
+    keys = [BUSY_VERSION_KEY.format(interviewer_id) for interviewer_id in interviewer_ids]
+    versions = cache.get_many(keys)
+    return tuple(versions.get(key, 0) for key in keys)
+
+def bump_busy_versions(interviewer_ids):
+    for interviewer_id in interviewer_ids:
+        key = BUSY_VERSION_KEY.format(interviewer_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing, start above the implicit 0 so results keyed before the eviction are not reused
+            cache.add(key, time.time_ns(), timeout=None)
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from django.db import connection
+
+from candidate_fyi_takehome_project.interviews.ingest import from_epoch, to_epoch
+from candidate_fyi_takehome_project.interviews.intervals import IntervalSet
+from candidate_fyi_takehome_project.interviews.models import BusyBlock, InterviewerBooking
+
+# Gaps left in the window once every synced busy block and booking of the panel is merged with range_agg,
+# plus the zero length blocks, which split windows in the Python engines and have no range to merge
+# Free lower bounds are busy ends so they round up, upper bounds are busy starts so they round down, same as to_epoch
+FREE_WINDOWS_SQL = """
+WITH search AS (
+    SELECT tstzrange(%(search_start)s, %(search_end)s) AS bounds
+), busy AS (
+    SELECT range_agg(period) AS merged FROM (
+        SELECT period FROM {busy_blocks}, search
+        WHERE interviewer_id = ANY(%(interviewer_ids)s) AND period && search.bounds
+        UNION ALL
+        SELECT period FROM {bookings}, search
+        WHERE interviewer_id = ANY(%(interviewer_ids)s) AND period && search.bounds
+    ) panel
+)
+SELECT 0, ceil(extract(epoch FROM lower(free)))::bigint, floor(extract(epoch FROM upper(free)))::bigint
+FROM search, busy, unnest(multirange(search.bounds) - coalesce(busy.merged, '{{}}'::tstzmultirange)) AS free
+UNION ALL
+SELECT 1, floor(extract(epoch FROM start))::bigint, NULL
+FROM {busy_blocks}
+WHERE interviewer_id = ANY(%(interviewer_ids)s) AND start = "end"
+    AND start > %(search_start)s AND start < %(search_end)s
+ORDER BY 1, 2
+"""
+
+
+# ------------------------- SQL free windows ------------------------
+def get_panel_free_windows(interviewer_ids, search_start:datetime, search_end:datetime):
+    '''
+    Free windows of the whole panel inside the search window, computed in PostgreSQL from the synced BusyBlock rows
+    and the booked interviews, one round trip
+    Only the merged gaps come back, instead of every busy block of every interviewer
+    Returns (IntervalSet of epoch free windows, sorted zero length block epochs)
+    '''
+    params = {
+        "interviewer_ids": list(interviewer_ids),
+        # Same whole second window as the Python engines
+        "search_start": from_epoch(to_epoch(search_start, round_up=True)),
+        "search_end": from_epoch(to_epoch(search_end)),
+    }
+    sql = FREE_WINDOWS_SQL.format(busy_blocks=BusyBlock._meta.db_table, bookings=InterviewerBooking._meta.db_table)
+    pairs = []
+    points = []
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for kind, lower, upper in cursor.fetchall():
+            if kind:
+                points.append(lower)
+            else:
+                pairs.append((lower, upper))
+    return IntervalSet.from_sorted(pairs), points
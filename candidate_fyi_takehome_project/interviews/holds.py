@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+from typing import NamedTuple, Tuple
+import secrets
+import time
+
+from django.core.cache import cache
+
+from candidate_fyi_takehome_project.interviews.coalesce import bump_busy_versions
+
+# hold id -> SlotHold, expires with the hold
+HOLD_KEY = "interviews:hold:{}"
+# interviewer id -> tuple of HoldEntry, the interviewers live holds, read in one get_many per panel
+HOLD_INDEX_KEY = "interviews:holds:{}"
+# Short lived add() lock guarding one interviewers index while it is rewritten
+HOLD_LOCK_KEY = "interviews:holds_lock:{}"
+HOLD_LOCK_TIMEOUT = 5
+HOLD_LOCK_WAIT = 1.0
+
+
+class HoldConflictError(Exception):
+    '''
+    The time overlaps another live hold, or the interviewers hold index stayed locked
+    '''
+
+
+class SlotHold(NamedTuple):
+    id: str
+    template_id: int
+    start: int  # UTC epoch seconds
+    end: int
+    interviewer_ids: Tuple[int, ...]
+    expires_at: float
+
+
+class HoldEntry(NamedTuple):
+    start: int
+    end: int
+    hold_id: str
+    expires_at: float
+
+
+# ------------------------- Slot holds ------------------------
+def get_held_busy(interviewer_ids, window_start:int, window_end:int, exclude_hold:str=None):
+    '''
+    Live holds overlapping [window_start, window_end) as epoch (start, end) pairs per interviewer id
+    One get_many for the whole panel, expired entries are skipped here and pruned on the next write
+    exclude_hold - a hold id to leave out, the holders own hold is not busy for them
+    '''
+    keys = {HOLD_INDEX_KEY.format(interviewer_id): interviewer_id for interviewer_id in interviewer_ids}
+    now = time.time()
+    held = {}
+    for key, entries in cache.get_many(keys).items():
+        pairs = [
+            (entry.start, entry.end) for entry in entries
+            if entry.expires_at > now and entry.hold_id != exclude_hold
+            and entry.start < window_end and entry.end > window_start
+        ]
+        if pairs:
+            held[keys[key]] = pairs
+    return held
+
+def get_hold(hold_id:str):
+    '''
+    Live SlotHold or None once it expired or was released
+    '''
+    hold = cache.get(HOLD_KEY.format(hold_id))
+    if hold is None or hold.expires_at <= time.time():
+        return None
+    return hold
+
+def place_hold(template_id:int, start:int, end:int, interviewer_ids, ttl:int):
+    '''
+    Hold [start, end) for every interviewer for ttl seconds
+    Raises HoldConflictError when any of them already has a live hold overlapping it
+    '''
+    interviewer_ids = tuple(interviewer_ids)
+    hold = SlotHold(secrets.token_urlsafe(16), template_id, start, end, interviewer_ids, time.time() + ttl)
+    with lock_hold_indexes(interviewer_ids):
+        indexes = read_live_indexes(interviewer_ids)
+        for entries in indexes.values():
+            if any(entry.start < end and entry.end > start for entry in entries):
+                raise HoldConflictError()
+        entry = HoldEntry(start, end, hold.id, hold.expires_at)
+        write_indexes({interviewer_id: entries + (entry,) for interviewer_id, entries in indexes.items()})
+        cache.set(HOLD_KEY.format(hold.id), hold, ttl)
+    bump_busy_versions(interviewer_ids)
+    return hold
+
+def release_hold(hold:SlotHold):
+    '''
+    Drop a hold before its TTL, e.g. once it became a booking
+    '''
+    cache.delete(HOLD_KEY.format(hold.id))
+    with lock_hold_indexes(hold.interviewer_ids):
+        indexes = read_live_indexes(hold.interviewer_ids)
+        write_indexes({
+            interviewer_id: tuple(entry for entry in entries if entry.hold_id != hold.id)
+            for interviewer_id, entries in indexes.items()
+        })
+    bump_busy_versions(hold.interviewer_ids)
+
+def read_live_indexes(interviewer_ids):
+    '''
+    interviewer id -> live HoldEntry tuple, expired entries dropped
+    '''
+    keys = {HOLD_INDEX_KEY.format(interviewer_id): interviewer_id for interviewer_id in interviewer_ids}
+    cached = cache.get_many(keys)
+    now = time.time()
+    return {
+        interviewer_id: tuple(entry for entry in cached.get(key, ()) if entry.expires_at > now)
+        for key, interviewer_id in keys.items()
+    }
+
+def write_indexes(indexes):
+    '''
+    Store the indexes, each lives as long as its last hold so idle interviewers leave nothing behind
+    '''
+    now = time.time()
+    for interviewer_id, entries in indexes.items():
+        key = HOLD_INDEX_KEY.format(interviewer_id)
+        if entries:
+            cache.set(key, entries, max(entry.expires_at for entry in entries) - now + 1)
+        else:
+            cache.delete(key)
+
+@contextmanager
+def lock_hold_indexes(interviewer_ids):
+    '''
+    Lock each interviewers index, in id order so overlapping panels never deadlock
+    Raises HoldConflictError when a lock is not free within HOLD_LOCK_WAIT
+    '''
+    acquired = []
+    try:
+        deadline = time.monotonic() + HOLD_LOCK_WAIT
+        for interviewer_id in sorted(set(interviewer_ids)):
+            key = HOLD_LOCK_KEY.format(interviewer_id)
+            while not cache.add(key, 1, HOLD_LOCK_TIMEOUT):
+                if time.monotonic() > deadline:
+                    raise HoldConflictError()
+                time.sleep(0.002)
+            acquired.append(key)
+        yield
+    finally:
+        cache.delete_many(acquired)
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone, timedelta
+from heapq import merge
+
+from services.busy_columns import BusyColumns
+from candidate_fyi_takehome_project.interviews.interval_index import BusyIntervalIndex
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_SECOND = timedelta(seconds=1)
+# Padding busy blocks added either side of the search window so the first and last gaps are closed
+BOUNDARY_SECONDS = 3600
+
+# Provider timestamps sit on a shared grid and repeat across interviewers and requests, memoize whole second parses
+_parsed_timestamps = {}
+MAX_PARSED_TIMESTAMPS = 500_000
+
+
+# ------------------------- Busy block ingestion ------------------------
+def to_epoch(value, round_up:bool=False):
+    '''
+    Convert an ISO string or datetime to UTC epoch seconds, raises TypeError for anything else
+    Sub second values are floored, or ceiled with round_up (busy ends, search start) so rounding never shrinks a busy block
+    '''
+    if isinstance(value, str):
+        parsed = _parsed_timestamps.get(value)
+        if parsed is not None:
+            return parsed
+        # fromisoformat handles the trailing Z and any offset, much faster than a format string parse
+        delta = datetime.fromisoformat(value) - EPOCH
+        if not delta.microseconds:
+            if len(_parsed_timestamps) >= MAX_PARSED_TIMESTAMPS:
+                _parsed_timestamps.clear()
+            parsed = _parsed_timestamps[value] = delta // ONE_SECOND
+            return parsed
+    elif isinstance(value, datetime):
+        if value.tzinfo is None:
+            # Naive datetimes are local time, same as astimezone()
+            value = value.astimezone(timezone.utc)
+        delta = value - EPOCH
+    else:
+        # e.g. a null timestamp in a provider response, callers treat TypeError as a bad payload
+        raise TypeError(f"Expected an ISO string or datetime, got {type(value).__name__}")
+
+    if round_up:
+        return -(-delta // ONE_SECOND)
+    return delta // ONE_SECOND
+
+def from_epoch(ts:int):
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+def parse_busy_epochs(busy_slots):
+    '''
+    Parse every busy block at once into parallel start / end epoch lists
+    Memo hits are resolved inline, only misses pay for a function call
+    '''
+    memo_get = _parsed_timestamps.get
+    starts = [
+        parsed if (parsed := memo_get(start)) is not None else to_epoch(start)
+        for start in [slot["start"] for slot in busy_slots]
+    ]
+    ends = [
+        parsed if (parsed := memo_get(end)) is not None else to_epoch(end, round_up=True)
+        for end in [slot["end"] for slot in busy_slots]
+    ]
+    return starts, ends
+
+def trim_busy_epochs_to_search_window(search_start:datetime, search_end:datetime, busy_slots):
+    '''
+    Bulk version of trim_busy_slots_to_search_window, works on epoch seconds
+    busy_slots - list of {"start", "end"} ISO string dicts, a BusyColumns which skips parsing entirely,
+     or a list of BusyIntervalIndex which only hands over their already merged windows inside the search window
+    Parses all blocks up front, then trims and drops out of window blocks while they are still plain ints
+    Returns [start, end] epoch pairs including the search window boundary blocks
+    '''
+    window_start = to_epoch(search_start, round_up=True)
+    window_end = to_epoch(search_end)
+    if isinstance(busy_slots, BusyColumns):
+        blocks = zip(busy_slots.starts, busy_slots.ends)
+    elif isinstance(busy_slots, BusyIntervalIndex):
+        blocks = busy_slots.busy_between(window_start, window_end)
+    elif busy_slots and isinstance(busy_slots[0], BusyIntervalIndex):
+        # Each index is sorted already, a k way merge keeps the output sorted for the merge stage
+        blocks = merge(*(index.busy_between(window_start, window_end) for index in busy_slots))
+    else:
+        blocks = zip(*parse_busy_epochs(busy_slots))
+
+    # Add start boundary slot, start of search window
+    trimmed_slots = [[window_start - BOUNDARY_SECONDS, window_start]]
+
+    for slot_start, slot_end in blocks:
+        # Same trimming rules as the datetime version
+        if slot_start < window_start and slot_end > window_start:
+            slot_start = window_start
+        if slot_end > window_end and slot_start < slot_end:
+            slot_end = window_end
+        if slot_start >= window_start and slot_end <= window_end:
+            trimmed_slots.append([slot_start, slot_end])
+
+    # Add end boundary slot, end of search window
+    trimmed_slots.append([window_end, window_end + BOUNDARY_SECONDS])
+
+    return trimmed_slots
+
+def make_window_filter(search_start:datetime=None, search_end:datetime=None):
+    '''
+    Busy block filter for streamed provider responses (services/json_stream.py)
+    Applies the trim_busy_epochs_to_search_window rules to one block at a time so out of window blocks are never kept
+    Without a window every block is kept, only parsed to epochs
+    Returns a function (start, end) -> trimmed epoch (start, end) or None
+    '''
+    memo_get = _parsed_timestamps.get
+
+    def parse_block(slot_start, slot_end):
+        slot_start = parsed if (parsed := memo_get(slot_start)) is not None else to_epoch(slot_start)
+        slot_end = parsed if (parsed := memo_get(slot_end)) is not None else to_epoch(slot_end, round_up=True)
+        return slot_start, slot_end
+
+    if search_start is None or search_end is None:
+        return parse_block
+
+    window_start = to_epoch(search_start, round_up=True)
+    window_end = to_epoch(search_end)
+
+    def keep_in_window(slot_start, slot_end):
+        slot_start, slot_end = parse_block(slot_start, slot_end)
+        if slot_start < window_start and slot_end > window_start:
+            slot_start = window_start
+        if slot_end > window_end and slot_start < slot_end:
+            slot_end = window_end
+        if slot_start >= window_start and slot_end <= window_end:
+            return slot_start, slot_end
+        return None
+
+    return keep_in_window
@@ -0,0 +1,114 @@
+import threading
+from bisect import bisect_left, bisect_right
+
+
+# ------------------------- Per interviewer busy interval index ------------------------
+class BusyIntervalIndex:
+    '''
+    One interviewers busy blocks as UTC epoch seconds, kept sorted so single block changes never need a full rebuild
+    blocks - every raw (start, end) block, sorted, so a block can be removed again
+    starts / ends - the merged busy windows, same merge rules as build_busy_windows (touching blocks merge)
+    Merged windows never touch, so starts and ends are both sorted and can be bisected
+    '''
+    __slots__ = ("blocks", "starts", "ends", "lock")
+
+    def __init__(self, blocks=()):
+        self.blocks = []
+        self.starts = []
+        self.ends = []
+        self.lock = threading.Lock()
+        self.replace(blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def replace(self, blocks):
+        '''
+        Swap in a full calendar at once O(n log n)
+        '''
+        blocks = sorted((start, end) for start, end in blocks)
+        starts, ends = merge_sorted_blocks(blocks)
+        with self.lock:
+            self.blocks, self.starts, self.ends = blocks, starts, ends
+
+    def insert(self, start:int, end:int):
+        '''
+        Add one busy block, merging it into every window it touches
+        Finding the windows is O(log n), the list insert and slice assignments shift the tail so the whole is O(n),
+         still no re-sort or re-merge of the calendar
+        '''
+        with self.lock:
+            blocks = self.blocks
+            blocks.insert(bisect_left(blocks, (start, end)), (start, end))
+            starts, ends = self.starts, self.ends
+            # Windows i..j-1 touch the block
+            i = bisect_left(ends, start)
+            j = bisect_right(starts, end)
+            if i < j:
+                start = min(start, starts[i])
+                end = max(end, ends[j - 1])
+            starts[i:j] = [start]
+            ends[i:j] = [end]
+
+    def remove(self, start:int, end:int):
+        '''
+        Remove one busy block, only the merged window it was part of is re-merged
+        O(n) for the list delete and slice assignment, plus the blocks in that window
+        Raises KeyError when the block is not in the index
+        '''
+        with self.lock:
+            blocks = self.blocks
+            position = bisect_left(blocks, (start, end))
+            if position == len(blocks) or blocks[position] != (start, end):
+                raise KeyError((start, end))
+            del blocks[position]
+
+            starts, ends = self.starts, self.ends
+            window = bisect_right(starts, start) - 1
+            window_start, window_end = starts[window], ends[window]
+            # Every block starting inside the old window belongs to it, nothing else does
+            lo = bisect_left(blocks, (window_start,))
+            hi = bisect_left(blocks, (window_end + 1,))
+            new_starts, new_ends = merge_sorted_blocks(blocks[lo:hi])
+            starts[window:window + 1] = new_starts
+            ends[window:window + 1] = new_ends
+
+    def busy_between(self, t0:int, t1:int):
+        '''
+        Merged busy windows touching [t0, t1] O(log n + k), not clipped
+        '''
+        with self.lock:
+            i = bisect_left(self.ends, t0)
+            j = bisect_right(self.starts, t1)
+            return list(zip(self.starts[i:j], self.ends[i:j]))
+
+    def free_between(self, t0:int, t1:int):
+        '''
+        Free (start, end) intervals between t0 and t1 O(log n + k)
+        '''
+        free = []
+        cursor = t0
+        for busy_start, busy_end in self.busy_between(t0, t1):
+            if busy_start > cursor:
+                free.append((cursor, min(busy_start, t1)))
+            cursor = max(cursor, busy_end)
+        if cursor < t1:
+            free.append((cursor, t1))
+        return free
+
+
+def merge_sorted_blocks(blocks):
+    '''
+    Merge sorted (start, end) blocks into parallel merged window starts / ends
+    '''
+    starts = []
+    ends = []
+    for start, end in blocks:
+        if ends and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
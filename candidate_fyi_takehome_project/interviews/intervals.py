@@ -0,0 +1,159 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+# ------------------------- Interval set algebra ------------------------
+class IntervalSet:
+    '''
+    Immutable set of half open [start, end) integer intervals (epoch seconds in the engine)
+    Backed by sorted parallel starts / ends arrays, always normalized - no empty, overlapping or touching intervals
+    Every set operation is a single linear merge over the two sorted inputs
+    '''
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts=(), ends=()):
+        # Callers must pass normalized arrays, use from_pairs / from_sorted for anything else
+        self.starts = starts if isinstance(starts, array) else array("q", starts)
+        self.ends = ends if isinstance(ends, array) else array("q", ends)
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        '''
+        Build from unsorted, possibly overlapping (start, end) pairs O(n log n)
+        '''
+        return cls.from_sorted(sorted(pairs))
+
+    @classmethod
+    def from_sorted(cls, pairs):
+        '''
+        Build from (start, end) pairs already sorted by start O(n), merges overlapping and touching pairs
+        '''
+        starts = []
+        ends = []
+        last_end = None
+        for start, end in pairs:
+            if start >= end:
+                continue
+            if last_end is not None and start <= last_end:
+                if end > last_end:
+                    ends[-1] = last_end = end
+            else:
+                starts.append(start)
+                ends.append(end)
+                last_end = end
+        return cls(array("q", starts), array("q", ends))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return f"IntervalSet({list(self)})"
+
+    def total(self):
+        '''
+        Combined length of every interval
+        '''
+        return sum(self.ends) - sum(self.starts)
+
+    def union(self, other):
+        a_starts, a_ends, b_starts, b_ends = self.starts, self.ends, other.starts, other.ends
+        i = j = 0
+        pairs = []
+        # Two pointer merge by start, from_sorted folds overlaps together
+        while i < len(a_starts) and j < len(b_starts):
+            if a_starts[i] <= b_starts[j]:
+                pairs.append((a_starts[i], a_ends[i]))
+                i += 1
+            else:
+                pairs.append((b_starts[j], b_ends[j]))
+                j += 1
+        pairs.extend(zip(a_starts[i:], a_ends[i:]))
+        pairs.extend(zip(b_starts[j:], b_ends[j:]))
+        return IntervalSet.from_sorted(pairs)
+
+    def intersection(self, other):
+        # Plain lists index faster than arrays in the hot loop
+        a_starts, a_ends = self.starts.tolist(), self.ends.tolist()
+        b_starts, b_ends = other.starts.tolist(), other.ends.tolist()
+        starts = []
+        ends = []
+        i = j = 0
+        a_count, b_count = len(a_starts), len(b_starts)
+        while i < a_count and j < b_count:
+            a_start, a_end, b_start, b_end = a_starts[i], a_ends[i], b_starts[j], b_ends[j]
+            start = a_start if a_start > b_start else b_start
+            end = a_end if a_end < b_end else b_end
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+            # Move past whichever interval ends first
+            if a_end < b_end:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(array("q", starts), array("q", ends))
+
+    def difference(self, other):
+        '''
+        Parts of this set not covered by other
+        '''
+        b_starts, b_ends = other.starts.tolist(), other.ends.tolist()
+        b_count = len(b_starts)
+        starts = []
+        ends = []
+        j = 0
+        for start, end in zip(self.starts, self.ends):
+            # Skip removals that end before this interval
+            while j < b_count and b_ends[j] <= start:
+                j += 1
+            k = j
+            while k < b_count and b_starts[k] < end:
+                if b_starts[k] > start:
+                    starts.append(start)
+                    ends.append(b_starts[k])
+                if b_ends[k] > start:
+                    start = b_ends[k]
+                k += 1
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+        return IntervalSet(array("q", starts), array("q", ends))
+
+    def complement(self, lo:int, hi:int):
+        '''
+        Gaps between the intervals within [lo, hi)
+        '''
+        return IntervalSet([lo], [hi]).difference(self) if lo < hi else IntervalSet()
+
+    def dilate(self, before:int, after:int = None):
+        '''
+        Grow every interval by before at the start and after at the end (buffers), merging any that now meet
+        Negative values shrink intervals, ones that become empty are dropped
+        '''
+        after = before if after is None else after
+        return IntervalSet.from_sorted(
+            (start - before, end + after) for start, end in zip(self.starts, self.ends)
+        )
+
+    def clip(self, lo:int, hi:int):
+        '''
+        Parts of the set within [lo, hi) O(log n + k)
+        '''
+        i = bisect_right(self.ends, lo)
+        j = bisect_left(self.starts, hi)
+        if i >= j:
+            return IntervalSet()
+        starts = self.starts[i:j]
+        ends = self.ends[i:j]
+        starts[0] = max(starts[0], lo)
+        ends[-1] = min(ends[-1], hi)
+        return IntervalSet(starts, ends)
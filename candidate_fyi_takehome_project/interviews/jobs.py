@@ -0,0 +1,128 @@
+from array import array
+from itertools import accumulate
+import base64
+import hashlib
+import sys
+import uuid
+import zlib
+
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core.cache import cache
+
+from candidate_fyi_takehome_project.interviews.coalesce import availability_key
+from candidate_fyi_takehome_project.interviews.slots import SlotList
+
+# job id -> interview template id, tells a known job still waiting in the queue apart from an unknown id
+JOB_KEY = "interviews:availability_job:{}"
+# Same as Celerys default result_expires, a job can be polled as long as its result is kept
+JOB_TTL = 24 * 60 * 60
+# availability key digest -> job id of the identical job still running
+INFLIGHT_JOB_KEY = "interviews:availability_job_inflight:{}"
+# Claims of the in flight key before giving up, a second only covers the running job finishing in between
+INFLIGHT_ATTEMPTS = 2
+
+class JobStoreUnavailableError(Exception):
+    '''
+    The cache keeping job ids can't be reached, a queued job could never be polled
+    '''
+
+
+JOB_STATUSES = {
+    "PENDING": "pending",
+    "RECEIVED": "pending",
+    "RETRY": "pending",
+    "STARTED": "running",
+    "SUCCESS": "done",
+    "FAILURE": "failed",
+    "REVOKED": "failed",
+}
+
+
+# ------------------------- Availability jobs ------------------------
+def start_availability_job(template, search_start, search_end, valid_interval:int, interval_timezone:str):
+    '''
+    Queue the availability computation on a Celery worker and return its job id
+    An identical job still running is reused instead of queueing another
+    Raises kombu OperationalError when the broker can't be reached,
+     JobStoreUnavailableError when the cache can't (it fails silently in production, add and get both come back empty)
+    '''
+    # Imported here, the tasks module imports this one
+    from candidate_fyi_takehome_project.interviews.tasks import compute_availability
+
+    digest = hashlib.sha1(
+        availability_key(template, search_start, search_end, valid_interval, interval_timezone).encode()
+    ).hexdigest()
+    inflight_key = INFLIGHT_JOB_KEY.format(digest)
+    for _ in range(INFLIGHT_ATTEMPTS):
+        job_id = str(uuid.uuid4())
+        # Cleared by the task when it finishes, the time limit bounds it when a worker dies mid job
+        if cache.add(inflight_key, job_id, settings.CELERY_TASK_TIME_LIMIT):
+            break
+        running = cache.get(inflight_key)
+        if running is not None:
+            return running
+    else:
+        raise JobStoreUnavailableError()
+
+    cache.set(JOB_KEY.format(job_id), template.id, JOB_TTL)
+    try:
+        compute_availability.apply_async(
+            args=[template.id, search_start.isoformat(), search_end.isoformat(), valid_interval, interval_timezone, digest],
+            task_id=job_id,
+        )
+    except Exception:
+        cache.delete_many([inflight_key, JOB_KEY.format(job_id)])
+        raise
+    return job_id
+
+def get_availability_job(job_id:str):
+    '''
+    (status, result) for a job, result is the availability payload once status is "done"
+    Returns None for an unknown or expired job
+    '''
+    if cache.get(JOB_KEY.format(job_id)) is None:
+        return None
+    result = AsyncResult(job_id)
+    status = JOB_STATUSES.get(result.state, "pending")
+    if status != "done":
+        return status, None
+    return status, decode_job_result(result.result)
+
+def clear_inflight_job(digest:str):
+    cache.delete(INFLIGHT_JOB_KEY.format(digest))
+
+
+# ------------------------- Compressed results ------------------------
+def encode_job_result(template, panel):
+    '''
+    JSON safe job result, the slot starts delta encoded as little endian int64 and zlib compressed
+    Starts sit on the interval grid so the deltas repeat, a 90 day search is ~10KB instead of ~1MB of JSON
+    '''
+    return {
+        "interviewId": template.id,
+        "name": template.name,
+        "duration": template.duration,
+        "interviewers": panel.interviewers,
+        "stale": panel.stale,
+        "availableSlots": pack_starts(panel.slots.starts),
+    }
+
+def decode_job_result(result):
+    '''
+    The availability payload back, "availableSlots" as a SlotList
+    '''
+    return {**result, "availableSlots": SlotList(unpack_starts(result["availableSlots"]), result["duration"] * 60)}
+
+def pack_starts(starts) -> str:
+    deltas = array("q", (b - a for a, b in zip([0, *starts], starts)))
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    return base64.b64encode(zlib.compress(deltas.tobytes())).decode()
+
+def unpack_starts(packed:str):
+    deltas = array("q")
+    deltas.frombytes(zlib.decompress(base64.b64decode(packed)))
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    return array("q", accumulate(deltas))
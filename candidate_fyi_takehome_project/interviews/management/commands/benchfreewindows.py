@@ -0,0 +1,127 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from candidate_fyi_takehome_project.interviews.free_windows import get_panel_free_windows
+from candidate_fyi_takehome_project.interviews.models import BusyBlock, Interviewer
+from candidate_fyi_takehome_project.interviews.sync import get_stored_free_busy
+from candidate_fyi_takehome_project.interviews.utils import compute_available_slots_from_free_lists, compute_available_slots_from_free_windows
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare the in Python and SQL free window engines on synthetic synced calendars as panel and calendar sizes grow"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--panel-sizes',
+            default='2,5,10,20',
+            help='Comma separated panel sizes',
+        )
+        parser.add_argument(
+            '--blocks',
+            default='50,500,5000',
+            help='Comma separated busy blocks per interviewer in the search window',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=14,
+            help='Search window length in days',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per case, the median is reported',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed for the synthetic calendars',
+        )
+
+    def handle(self, *args, **options):
+        panel_sizes = [int(size) for size in options['panel_sizes'].split(",")]
+        block_counts = [int(count) for count in options['blocks'].split(",")]
+        search_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        search_end = search_start + timedelta(days=options['days'])
+
+        self.stdout.write(f"{'panel':>6} {'blocks':>7} {'python ms':>10} {'sql ms':>8} {'speedup':>8} {'slots':>7}")
+        # Everything is seeded inside one transaction and rolled back, the database is left as it was
+        try:
+            with transaction.atomic():
+                for blocks in block_counts:
+                    interviewers = seed_calendars(max(panel_sizes), blocks, search_start, search_end, options['seed'])
+                    for size in panel_sizes:
+                        self.run_case(interviewers[:size], blocks, search_start, search_end, options['repeat'])
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def run_case(self, interviewers, blocks, search_start, search_end, repeat):
+        panel = [
+            SimpleNamespace(id=i.id, timezone=i.timezone, workday_start_hour=9, workday_end_hour=17, weekly_schedule=())
+            for i in interviewers
+        ]
+        ids = [p.id for p in panel]
+
+        def python_engine():
+            busy = get_stored_free_busy(ids, (search_start, search_end), columnar=True)
+            return compute_available_slots_from_free_lists(
+                search_start, search_end, 15, [i["busy"] for i in busy], panel, 30,
+            )
+
+        def sql_engine():
+            free, points = get_panel_free_windows(ids, search_start, search_end)
+            return compute_available_slots_from_free_windows(
+                search_start, search_end, 15, free, panel, 30, split_points=points,
+            )
+
+        python_ms, python_slots = time_engine(python_engine, repeat)
+        sql_ms, sql_slots = time_engine(sql_engine, repeat)
+        if python_slots != sql_slots:
+            self.stderr.write(f"Engines disagree for panel {len(panel)} with {blocks} blocks")
+        self.stdout.write(
+            f"{len(panel):>6} {blocks:>7} {python_ms:>10.1f} {sql_ms:>8.1f} {python_ms / sql_ms:>7.1f}x {len(sql_slots):>7}"
+        )
+
+
+def seed_calendars(count:int, blocks:int, search_start:datetime, search_end:datetime, seed:int):
+    '''
+    Interviewers with blocks random 15 - 120 minute busy blocks each across the window, then ANALYZE so plans are realistic
+    '''
+    rng = random.Random(seed)
+    interviewers = Interviewer.objects.bulk_create([Interviewer(timezone="UTC") for _ in range(count)])
+    span = int((search_end - search_start).total_seconds()) // 900
+    rows = []
+    for interviewer in interviewers:
+        for n in range(blocks):
+            start = search_start + timedelta(seconds=rng.randrange(span) * 900)
+            rows.append(BusyBlock(
+                interviewer=interviewer, source_id=f"bench-{n}",
+                start=start, end=start + timedelta(minutes=rng.choice((15, 30, 60, 120))),
+            ))
+    BusyBlock.objects.bulk_create(rows, batch_size=5000)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {BusyBlock._meta.db_table}")
+    return interviewers
+
+def time_engine(engine, repeat:int):
+    '''
+    Median wall time in ms and the last result
+    '''
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = engine()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[len(timings) // 2], result
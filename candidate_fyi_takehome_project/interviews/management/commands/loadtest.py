@@ -0,0 +1,207 @@
+import json
+import random
+import time
+import threading
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from candidate_fyi_takehome_project.interviews.models import InterviewTemplate
+
+
+class Command(BaseCommand):
+    help = "Drive the interview availability endpoint with concurrent requests and report throughput, latency and DB queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Total number of measured requests',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Number of concurrent clients',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=20,
+            help='Unmeasured requests sent first to warm caches',
+        )
+        parser.add_argument(
+            '--panel-sizes',
+            default='',
+            help='Comma separated panel sizes to include, e.g. 3,6,12 (default all seeded sizes)',
+        )
+        parser.add_argument(
+            '--templates-per-size',
+            type=int,
+            default=50,
+            help='Templates sampled per panel size',
+        )
+        parser.add_argument(
+            '--windows',
+            default='7',
+            help='Comma separated search window lengths in days, picked at random per request',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=30,
+            help='valid_interval query parameter',
+        )
+        parser.add_argument(
+            '--url',
+            default='',
+            help='Base url of a running server, e.g. http://localhost:8000 (default in process test client, which also counts queries)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed for template and window selection',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1")
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1")
+        rng = random.Random(options['seed'])
+        windows = [int(days) for days in options['windows'].split(",")]
+        templates_by_size = sample_templates(rng, options['panel_sizes'], options['templates_per_size'])
+        if not templates_by_size:
+            raise CommandError("No interview templates found, seed some first: manage.py seed --interviewers ... --templates ...")
+
+        # Plan every request up front so runs with the same seed send the same traffic
+        choices = [(size, template_id) for size, ids in templates_by_size.items() for template_id in ids]
+        plan = [
+            (*rng.choice(choices), rng.choice(windows))
+            for _ in range(options['warmup'] + options['requests'])
+        ]
+        warmup_plan, measured_plan = plan[:options['warmup']], plan[options['warmup']:]
+
+        base_url = options['url'].rstrip("/")
+        count_queries = not base_url
+        local = threading.local()
+
+        def send(planned):
+            panel_size, template_id, window_days = planned
+            if not hasattr(local, "client"):
+                local.client = None if base_url else Client(SERVER_NAME=get_server_name())
+            path = build_request_path(template_id, window_days, options['interval'])
+            return (panel_size, *send_request(local.client, base_url, path, count_queries))
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(send, warmup_plan))
+            started = time.perf_counter()
+            results = list(pool.map(send, measured_plan))
+            elapsed = time.perf_counter() - started
+
+        self.report(results, elapsed, options, count_queries)
+
+    def report(self, results, elapsed, options, count_queries):
+        errors = sum(1 for _, status, _, _ in results if status != 200)
+        throughput = len(results) / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(
+            f"{len(results)} requests, concurrency {options['concurrency']}, {elapsed:.2f}s, "
+            f"{throughput:.1f} req/s, {errors} errors"
+        )
+        if not results:
+            return
+        self.stdout.write(f"{'panel':>6} {'count':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'queries':>8}")
+
+        by_size = defaultdict(list)
+        for panel_size, _, latency, queries in results:
+            by_size[panel_size].append((latency, queries))
+        rows = [("all", [(latency, queries) for _, _, latency, queries in results])]
+        rows += sorted(by_size.items())
+
+        for label, samples in rows:
+            latencies = sorted(latency * 1000 for latency, _ in samples)
+            queries = f"{sum(q for _, q in samples) / len(samples):.2f}" if count_queries else "n/a"
+            self.stdout.write(
+                f"{label:>6} {len(samples):>6} {percentile(latencies, 50):>8.1f} {percentile(latencies, 90):>8.1f} "
+                f"{percentile(latencies, 99):>8.1f} {latencies[-1]:>8.1f} {queries:>8}"
+            )
+
+
+def sample_templates(rng:random.Random, panel_sizes:str, per_size:int):
+    '''
+    Group seeded template ids by panel size and sample up to per_size of each
+    '''
+    wanted = {int(size) for size in panel_sizes.split(",") if size}
+    templates = InterviewTemplate.objects.annotate(panel_size=Count("interviewers")).values_list("id", "panel_size")
+
+    by_size = defaultdict(list)
+    for template_id, panel_size in templates.order_by("id"):
+        if panel_size and (not wanted or panel_size in wanted):
+            by_size[panel_size].append(template_id)
+
+    return {size: rng.sample(ids, min(per_size, len(ids))) for size, ids in sorted(by_size.items())}
+
+def get_server_name():
+    # The in process client has to send a Host the settings accept
+    return next((host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")), "localhost")
+
+def build_request_path(template_id:int, window_days:int, interval:int):
+    # Start just past the 24h minimum notice the serializer enforces
+    search_start = datetime.now(timezone.utc) + timedelta(hours=25)
+    search_end = search_start + timedelta(days=window_days)
+    query = urlencode({
+        "search_start": search_start.isoformat(),
+        "search_end": search_end.isoformat(),
+        "valid_interval": interval,
+    })
+    return f"{reverse('interviews:interview_availabilty', kwargs={'id': template_id})}?{query}"
+
+def send_request(client, base_url:str, path:str, count_queries:bool):
+    '''
+    Send one request, returns (status, latency seconds, query count)
+    '''
+    queries = [0]
+
+    def count(execute, sql, params, many, context):
+        queries[0] += 1
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    if base_url:
+        try:
+            with urllib.request.urlopen(base_url + path, timeout=30) as response:
+                json.load(response)
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (urllib.error.URLError, TimeoutError):
+            status = 0
+    elif count_queries:
+        # Connections are per thread, so this only counts this requests queries
+        with connection.execute_wrapper(count):
+            status = client.get(path).status_code
+    else:
+        status = client.get(path).status_code
+
+    return status, time.perf_counter() - started, queries[0]
+
+def percentile(sorted_values, pct:float):
+    '''
+    Nearest rank percentile of an already sorted list
+    '''
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
@@ -1,11 +1,67 @@
-from django.core.management.base import BaseCommand
-from candidate_fyi_takehome_project.interviews.models import Interviewer, InterviewTemplate
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from candidate_fyi_takehome_project.interviews.cache import bump_metadata_version
+from candidate_fyi_takehome_project.interviews.models import Interviewer, InterviewTemplate, WorkingHours
+
+# Weighted towards where interviewers actually are, includes half hour and DST-less zones
+TIMEZONE_WEIGHTS = [
+    ("America/New_York", 22), ("America/Chicago", 12), ("America/Denver", 5), ("America/Los_Angeles", 18),
+    ("America/Sao_Paulo", 4), ("Europe/London", 10), ("Europe/Berlin", 8), ("Europe/Warsaw", 3),
+    ("Asia/Kolkata", 7), ("Asia/Singapore", 3), ("Asia/Tokyo", 3), ("Australia/Sydney", 3), ("UTC", 2),
+]
+# (start hour, end hour) weights, mostly 8 hour days
+WORKDAY_WEIGHTS = [((9, 17), 50), ((8, 16), 20), ((10, 18), 15), ((7, 15), 8), ((9, 15), 5), ((20, 4), 2)]
+DURATIONS = [15, 30, 45, 60, 90]
 
 
 class Command(BaseCommand):
-    help = "Seed the database with Interviewers and an InterviewTemplate"
-    
+    help = "Seed the database with Interviewers and an InterviewTemplate, or a large random dataset for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interviewers',
+            type=int,
+            help='Bulk mode: number of interviewers to create',
+        )
+        parser.add_argument(
+            '--templates',
+            type=int,
+            default=0,
+            help='Bulk mode: number of interview templates to create',
+        )
+        parser.add_argument(
+            '--panel-size',
+            default='3..6',
+            help='Bulk mode: interviewers per template, a number or an inclusive range like 3..12',
+        )
+        parser.add_argument(
+            '--weekly-schedule-ratio',
+            type=float,
+            default=0.25,
+            help='Bulk mode: fraction of interviewers given a weekday only WorkingHours schedule',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Bulk mode: random seed, the same seed always produces the same dataset',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Bulk mode: rows per bulk_create batch',
+        )
+
     def handle(self, *args, **options):
+        if options['interviewers'] is not None:
+            self.handle_bulk(options)
+            return
+
         # Create Interviewers with different timezones
         seed_interviewers = [
             {"timezone": "America/Chicago", "workday_start_hour": 9, "workday_end_hour": 17},
@@ -27,14 +83,115 @@ class Command(BaseCommand):
             name="Test Interview",
             defaults={"duration": 60}
         )
-        
+
         # Add all interviewers to the template
         template.interviewers.set(interviewer_objs)
         template.save()
-        
+
         if created:
             self.stdout.write(self.style.SUCCESS(f"Created InterviewTemplate: {template.name} id:{template.id}"))
         else:
             self.stdout.write(self.style.WARNING(f"InterviewTemplate already exists: {template.name} id:{template.id}"))
-            
-        self.stdout.write(self.style.SUCCESS(f"Template has {template.interviewers.count()} interviewers assigned"))
\ No newline at end of file
+
+        self.stdout.write(self.style.SUCCESS(f"Template has {template.interviewers.count()} interviewers assigned"))
+
+    def handle_bulk(self, options):
+        '''
+        Bulk load interviewers, schedules, templates and panel through rows with bulk_create
+        Deterministic for a given --seed, ids depend on the DB sequences
+        '''
+        interviewer_count = options['interviewers']
+        template_count = options['templates']
+        batch_size = options['batch_size']
+        panel_min, panel_max = parse_panel_size(options['panel_size'])
+
+        if interviewer_count < 1:
+            raise CommandError("--interviewers must be at least 1")
+        if template_count and panel_max > interviewer_count:
+            raise CommandError(f"--panel-size max {panel_max} is larger than --interviewers {interviewer_count}")
+
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            interviewers = Interviewer.objects.bulk_create(
+                build_interviewers(rng, interviewer_count), batch_size=batch_size
+            )
+            working_hours = WorkingHours.objects.bulk_create(
+                build_working_hours(rng, interviewers, options['weekly_schedule_ratio']), batch_size=batch_size
+            )
+            templates = InterviewTemplate.objects.bulk_create(
+                build_templates(rng, template_count), batch_size=batch_size
+            )
+            panel_rows = InterviewTemplate.interviewers.through.objects.bulk_create(
+                build_panel_rows(rng, templates, [i.id for i in interviewers], panel_min, panel_max), batch_size=batch_size
+            )
+            # bulk_create skips signals, invalidate cached template metadata ourselves
+            transaction.on_commit(bump_metadata_version)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(interviewers)} interviewers ({len(working_hours)} working hour rows), "
+            f"{len(templates)} templates and {len(panel_rows)} panel rows in {elapsed:.2f}s"
+        ))
+
+
+def parse_panel_size(value:str):
+    '''
+    "5" -> (5, 5), "3..12" -> (3, 12)
+    '''
+    try:
+        low, _, high = value.partition("..")
+        panel_min = int(low)
+        panel_max = int(high) if high else panel_min
+    except ValueError:
+        raise CommandError(f"Invalid --panel-size {value!r}, expected a number or a range like 3..12") from None
+    if panel_min < 1 or panel_min > panel_max:
+        raise CommandError(f"Invalid --panel-size {value!r}")
+    return panel_min, panel_max
+
+def build_interviewers(rng:random.Random, count:int):
+    timezones, timezone_weights = zip(*TIMEZONE_WEIGHTS)
+    workdays, workday_weights = zip(*WORKDAY_WEIGHTS)
+    tz_choices = rng.choices(timezones, timezone_weights, k=count)
+    workday_choices = rng.choices(workdays, workday_weights, k=count)
+
+    return [
+        Interviewer(timezone=tz, workday_start_hour=workday[0], workday_end_hour=workday[1])
+        for tz, workday in zip(tz_choices, workday_choices)
+    ]
+
+def build_working_hours(rng:random.Random, interviewers, ratio:float):
+    '''
+    Weekday only schedules for a share of interviewers, some finish early on Fridays or take a split lunch
+    '''
+    rows = []
+    for interviewer in interviewers:
+        if rng.random() >= ratio:
+            continue
+        start_minute = interviewer.workday_start_hour * 60
+        end_minute = interviewer.workday_end_hour * 60
+        short_friday = rng.random() < 0.3
+        split_lunch = rng.random() < 0.2 and start_minute < 12 * 60 < end_minute
+        for weekday in range(5):
+            day_end = start_minute + 4 * 60 if short_friday and weekday == 4 else end_minute
+            if split_lunch and day_end > 13 * 60:
+                rows.append(WorkingHours(interviewer_id=interviewer.id, weekday=weekday, start_minute=start_minute, end_minute=12 * 60))
+                rows.append(WorkingHours(interviewer_id=interviewer.id, weekday=weekday, start_minute=13 * 60, end_minute=day_end))
+            else:
+                rows.append(WorkingHours(interviewer_id=interviewer.id, weekday=weekday, start_minute=start_minute, end_minute=day_end))
+    return rows
+
+def build_templates(rng:random.Random, count:int):
+    return [
+        InterviewTemplate(name=f"Load Test Interview {n}", duration=rng.choice(DURATIONS))
+        for n in range(count)
+    ]
+
+def build_panel_rows(rng:random.Random, templates, interviewer_ids, panel_min:int, panel_max:int):
+    through = InterviewTemplate.interviewers.through
+    rows = []
+    for template in templates:
+        for interviewer_id in rng.sample(interviewer_ids, rng.randint(panel_min, panel_max)):
+            rows.append(through(interviewtemplate_id=template.id, interviewer_id=interviewer_id))
+    return rows
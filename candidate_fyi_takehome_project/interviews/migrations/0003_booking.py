@@ -0,0 +1,40 @@
+# Generated by Django 5.1.8 on 2026-10-19 12:52
+
+import candidate_fyi_takehome_project.interviews.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_workinghours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Booking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate_email', models.EmailField(max_length=254)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='interviews.interviewtemplate')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InterviewerBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interviewer_bookings', to='interviews.booking')),
+                ('interviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='interviews.interviewer')),
+            ],
+            options={
+                'constraints': [django.contrib.postgres.constraints.ExclusionConstraint(expressions=[(candidate_fyi_takehome_project.interviews.models.Int8Range(models.F('interviewer'), models.F('interviewer'), models.Value('[]')), '&&'), ('period', '&&')], name='interviews_no_double_booking')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.8 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_booking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarSync',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('sync_token', models.CharField(blank=True, max_length=255, null=True)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('interviewer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_sync', to='interviews.interviewer')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BusyBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('source_id', models.CharField(max_length=255)),
+                ('interviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='busy_blocks', to='interviews.interviewer')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['interviewer', 'start', 'end'], name='interviews_busy_block_window')],
+                'constraints': [models.UniqueConstraint(fields=('interviewer', 'source_id'), name='interviews_busy_block_source')],
+            },
+        ),
+    ]
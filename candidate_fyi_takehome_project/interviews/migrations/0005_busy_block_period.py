@@ -0,0 +1,25 @@
+# Generated by Django 5.1.8 on 2026-10-19 13:01
+
+import candidate_fyi_takehome_project.interviews.models
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_busy_block'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='busyblock',
+            name='period',
+            field=models.GeneratedField(db_persist=True, expression=candidate_fyi_takehome_project.interviews.models.TstzRange(models.F('start'), models.F('end')), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+        ),
+        migrations.AddIndex(
+            model_name='busyblock',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['period'], name='interviews_busy_block_period'),
+        ),
+    ]
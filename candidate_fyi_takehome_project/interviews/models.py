@@ -1,4 +1,9 @@
 from django.db import models
+from django.db.models import F, Func, Value
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.indexes import GistIndex
+from django.contrib.postgres.fields import BigIntegerRangeField, DateTimeRangeField, RangeOperators
 
 # Create your models here.
 class Interviewer(models.Model):
@@ -9,9 +14,118 @@ class Interviewer(models.Model):
     def __str__(self):
         return f"Interviewer {self.id}"
     
+    @property
+    def weekly_schedule(self):
+        """
+        Weekly working ranges as (weekday, start_minute, end_minute) tuples, empty when only the legacy workday hours are set
+        """
+        return tuple((wh.weekday, wh.start_minute, wh.end_minute) for wh in self.working_hours.all())
+    
+class WorkingHours(models.Model):
+    """
+    One working range on a weekday in the interviewers local time, minute resolution
+    Multiple ranges per weekday are allowed (split shifts), start_minute >= end_minute is an overnight range
+    """
+    WEEKDAYS = [
+        (0, "Monday"), (1, "Tuesday"), (2, "Wednesday"), (3, "Thursday"),
+        (4, "Friday"), (5, "Saturday"), (6, "Sunday"),
+    ]
+    interviewer = models.ForeignKey(Interviewer, on_delete=models.CASCADE, related_name="working_hours")
+    weekday = models.IntegerField(choices=WEEKDAYS) # Matches datetime.weekday()
+    start_minute = models.IntegerField(validators=[MinValueValidator(0), MaxValueValidator(1439)]) # Minutes after local midnight
+    end_minute = models.IntegerField(validators=[MinValueValidator(0), MaxValueValidator(1440)])
+    
+    class Meta:
+        ordering = ["weekday", "start_minute"]
+    
+    def __str__(self):
+        return f"Interviewer {self.interviewer_id} {self.get_weekday_display()} {self.start_minute}-{self.end_minute}"
+    
 class InterviewTemplate(models.Model):
     name = models.CharField(max_length=255)
     duration = models.IntegerField() # Duration in minutes
     interviewers = models.ManyToManyField(Interviewer, related_name="interview_template")
     
-    
\ No newline at end of file
+
+class Int8Range(Func):
+    function = "INT8RANGE"
+    output_field = BigIntegerRangeField()
+    
+class TstzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+    
+
+class Booking(models.Model):
+    """
+    A candidate booked into one slot of an interview template
+    """
+    template = models.ForeignKey(InterviewTemplate, on_delete=models.CASCADE, related_name="bookings")
+    candidate_email = models.EmailField()
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Booking {self.id} {self.template_id} {self.start:%Y-%m-%d %H:%M}"
+    
+class InterviewerBooking(models.Model):
+    """
+    One interviewers time on a booking
+    The exclusion constraint lets the database reject overlapping periods for the same interviewer, so racing bookings
+    never need a global lock - only inserts that actually overlap wait on each other
+    """
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name="interviewer_bookings")
+    interviewer = models.ForeignKey(Interviewer, on_delete=models.CASCADE, related_name="bookings")
+    period = DateTimeRangeField() # [start, end)
+    
+    class Meta:
+        constraints = [
+            ExclusionConstraint(
+                name="interviews_no_double_booking",
+                # Interviewer equality as a one value range, GiST handles range overlap without the btree_gist extension
+                expressions=[
+                    (Int8Range(F("interviewer"), F("interviewer"), Value("[]")), RangeOperators.OVERLAPS),
+                    ("period", RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
+
+
+class BusyBlock(models.Model):
+    """
+    One synced calendar event, the local copy availability reads instead of calling the provider
+    source_id is the providers event id, deltas update or delete by it
+    """
+    interviewer = models.ForeignKey(Interviewer, on_delete=models.CASCADE, related_name="busy_blocks")
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    source_id = models.CharField(max_length=255)
+    # [start, end) kept by the database, the SQL free window query merges these with range_agg
+    period = models.GeneratedField(expression=TstzRange(F("start"), F("end")), output_field=DateTimeRangeField(), db_persist=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["interviewer", "source_id"], name="interviews_busy_block_source"),
+        ]
+        indexes = [
+            # Panel + window lookups, start bounds the scan and end is checked from the index
+            models.Index(fields=["interviewer", "start", "end"], name="interviews_busy_block_window"),
+            # Window overlap for the SQL free window query, combined with the interviewer index by a bitmap AND
+            GistIndex(fields=["period"], name="interviews_busy_block_period"),
+        ]
+    
+    def __str__(self):
+        return f"Busy {self.interviewer_id} {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M}"
+    
+class CalendarSync(models.Model):
+    """
+    Where an interviewers incremental calendar sync left off
+    """
+    interviewer = models.OneToOneField(Interviewer, on_delete=models.CASCADE, related_name="calendar_sync")
+    name = models.CharField(max_length=255, blank=True) # Display name from the provider
+    sync_token = models.CharField(max_length=255, null=True, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Calendar sync {self.interviewer_id}"
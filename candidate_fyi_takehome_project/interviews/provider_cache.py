@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from services.calendar_client import CalendarProviderError
+
+logger = logging.getLogger(__name__)
+
+# columnar flag, interviewer id -> (fetched_at, provider record), kept for INTERVIEWS_CALENDAR_HARD_TTL
+FREE_BUSY_KEY = "interviews:free_busy:{}:{}"
+# Held by the one process refreshing an interviewer, a stale entry is refreshed once however many requests see it
+REFRESH_LOCK_KEY = "interviews:free_busy_refresh:{}:{}"
+
+# Background refreshes, bounded so a slow provider can't pile up threads
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="free-busy-refresh")
+
+
+# ------------------------- Stale while revalidate ------------------------
+def get_cached_free_busy(interviewer_ids, timezones, columnar:bool, fetch, refresh:bool=True, fresh:bool=False):
+    '''
+    Provider records for interviewer_ids served from the shared cache, each with "stale" set
+     once it is older than INTERVIEWS_CALENDAR_SOFT_TTL
+    Stale records are returned straight away and refreshed in the background, only interviewers with nothing cached
+     wait on the provider
+    fetch(interviewer_ids, timezones) -> records for the whole calendar, the engine trims them to each search window
+    refresh - False skips the background refresh, e.g. while the circuit is open and it would fail anyway
+    fresh - skip the cache and wait on the provider for everyone, the cache is still updated
+    Raises CalendarProviderError when an interviewer has nothing cached and the provider fails
+    '''
+    keys = [FREE_BUSY_KEY.format(int(columnar), interviewer_id) for interviewer_id in interviewer_ids]
+    cached = {} if fresh else cache.get_many(keys)
+    now = time.time()
+    records = {}
+    stale_ids = []
+    missing_ids = []
+    for interviewer_id, key in zip(interviewer_ids, keys):
+        entry = cached.get(key)
+        if entry is None:
+            missing_ids.append(interviewer_id)
+            continue
+        fetched_at, record = entry
+        stale = now - fetched_at > settings.INTERVIEWS_CALENDAR_SOFT_TTL
+        records[interviewer_id] = {**record, "stale": stale}
+        if stale:
+            stale_ids.append(interviewer_id)
+
+    if missing_ids:
+        for record in fetch_and_store(missing_ids, timezones, columnar, fetch):
+            records[record["interviewerId"]] = {**record, "stale": False}
+
+    if stale_ids and refresh:
+        schedule_refresh(stale_ids, timezones, columnar, fetch)
+
+    return [records[interviewer_id] for interviewer_id in interviewer_ids]
+
+def fetch_and_store(interviewer_ids, timezones, columnar:bool, fetch):
+    timezones = timezones or {}
+    records = fetch(interviewer_ids, {i: timezones[i] for i in interviewer_ids if i in timezones})
+    fetched_at = time.time()
+    cache.set_many(
+        {FREE_BUSY_KEY.format(int(columnar), record["interviewerId"]): (fetched_at, record) for record in records},
+        settings.INTERVIEWS_CALENDAR_HARD_TTL,
+    )
+    return records
+
+def schedule_refresh(interviewer_ids, timezones, columnar:bool, fetch):
+    '''
+    Refresh stale interviewers in the background, skipping any another request or process already refreshes
+    '''
+    lock_ttl = max(1, int(settings.INTERVIEWS_CALENDAR_TIMEOUT * 2))
+    claimed = [
+        interviewer_id for interviewer_id in interviewer_ids
+        if cache.add(REFRESH_LOCK_KEY.format(int(columnar), interviewer_id), 1, lock_ttl)
+    ]
+    if claimed:
+        return _refresh_pool.submit(run_refresh, claimed, timezones, columnar, fetch)
+
+def run_refresh(interviewer_ids, timezones, columnar:bool, fetch):
+    try:
+        fetch_and_store(interviewer_ids, timezones, columnar, fetch)
+    except CalendarProviderError:
+        # The stale records keep being served until they reach the hard TTL
+        logger.warning("Free/busy refresh failed for interviewers %s", interviewer_ids, exc_info=True)
+    finally:
+        cache.delete_many([REFRESH_LOCK_KEY.format(int(columnar), interviewer_id) for interviewer_id in interviewer_ids])
@@ -0,0 +1,167 @@
+import threading
+
+from django.conf import settings
+
+from services import mock_availability
+from services.calendar_batching import FreeBusyBatcher
+from services.calendar_changes import DEFAULT_CHANGE_LOG, SyncTokenExpired
+from services.calendar_client import CalendarProviderError, CircuitOpenError, SyncTokenExpiredError, fetch_busy_changes, fetch_free_busy  # noqa: F401
+from services.circuit_breaker import OPEN, CircuitBreaker
+from services.hedging import Hedger
+from candidate_fyi_takehome_project.interviews.ingest import make_window_filter
+from candidate_fyi_takehome_project.interviews.provider_cache import get_cached_free_busy
+
+
+# ------------------------- Calendar free/busy providers ------------------------
+def get_free_busy_data(interviewer_ids, timezones=None, columnar=False, search_window=None, fresh=False):
+    '''
+    Fetch per interviewer busy blocks from the configured provider
+    "mock" generates calendars in process, "http" calls INTERVIEWS_CALENDAR_API_URL (a real API or the local stand-in)
+    columnar - "busy" is a BusyColumns of epoch seconds instead of a list of {"start", "end"} dicts
+    search_window - (search_start, search_end), a columnar JSON response is stream parsed
+     and blocks outside the window are dropped as they arrive
+    fresh - wait on the provider even when a cached calendar would do, for re-validating a booking
+    INTERVIEWS_BUSY_SOURCE "store" reads the locally synced BusyBlock rows instead, one query and no provider call,
+     "index" hands over this processes long lived index of them, "busy" is a BusyIntervalIndex then
+    With INTERVIEWS_CALENDAR_SOFT_TTL set, http calendars come from the shared cache and records carry "stale",
+     see provider_cache
+    Raises CalendarProviderError when the http provider fails, CircuitOpenError without calling it while it keeps failing
+    '''
+    if settings.INTERVIEWS_BUSY_SOURCE == "store":
+        # Imported here, the sync module imports this one
+        from candidate_fyi_takehome_project.interviews.sync import get_stored_free_busy
+        return get_stored_free_busy(interviewer_ids, search_window, columnar=columnar)
+    if settings.INTERVIEWS_BUSY_SOURCE == "index":
+        from candidate_fyi_takehome_project.interviews.sync import get_indexed_free_busy
+        return get_indexed_free_busy(interviewer_ids)
+    if settings.INTERVIEWS_CALENDAR_PROVIDER == "http":
+        if settings.INTERVIEWS_CALENDAR_SOFT_TTL > 0:
+            # Whole calendars are cached so every search window reuses them
+            return get_cached_free_busy(
+                interviewer_ids, timezones, columnar,
+                lambda ids, tzs: load_http_free_busy(ids, tzs, columnar, None),
+                refresh=get_breaker().state != OPEN, fresh=fresh,
+            )
+        return load_http_free_busy(interviewer_ids, timezones, columnar, search_window)
+    return mock_availability.get_free_busy_data(interviewer_ids, timezones=timezones, columnar=columnar)
+
+
+def load_http_free_busy(interviewer_ids, timezones=None, columnar=False, search_window=None):
+    if settings.INTERVIEWS_CALENDAR_BATCH_MS > 0:
+        # Merged with the other requests in flight, one upstream call per batch
+        return get_batcher(columnar).load(interviewer_ids, timezones, search_window)
+    return fetch_http_free_busy(interviewer_ids, timezones, columnar, search_window)
+
+
+def fetch_http_free_busy(interviewer_ids, timezones=None, columnar=False, search_window=None):
+    '''
+    One upstream call, refused straight away while the circuit is open
+    Raises CalendarProviderError when the response leaves out a requested interviewer
+    Hedged with a second request once it runs past the observed p95, see get_hedger
+    '''
+    breaker = get_breaker()
+    if not breaker.allow():
+        raise CircuitOpenError("Calendar provider circuit is open")
+    busy_filter = None
+    if columnar:
+        busy_filter = make_window_filter(*(search_window or ()))
+
+    def fetch(cancellation):
+        return fetch_free_busy(
+            settings.INTERVIEWS_CALENDAR_API_URL, interviewer_ids, timezones,
+            timeout=settings.INTERVIEWS_CALENDAR_TIMEOUT, columnar=columnar, busy_filter=busy_filter,
+            cancellation=cancellation,
+        )
+
+    try:
+        if settings.INTERVIEWS_CALENDAR_HEDGE_RATE > 0:
+            records = get_hedger().call(fetch)
+        else:
+            records = fetch(None)
+        # Callers index the records by interviewer, a partial response fails here instead of as a KeyError downstream
+        missing = set(interviewer_ids).difference(record["interviewerId"] for record in records)
+        if missing:
+            raise CalendarProviderError(f"Calendar provider response is missing interviewers {sorted(missing)}")
+    except CalendarProviderError:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return records
+
+
+# Per process batchers, keyed on everything the upstream call depends on so a settings change gets a new one
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(columnar:bool):
+    '''
+    Batcher for this response format, batches share one window filter covering every callers search window
+    '''
+    key = (settings.INTERVIEWS_CALENDAR_API_URL, settings.INTERVIEWS_CALENDAR_TIMEOUT, settings.INTERVIEWS_CALENDAR_BATCH_MS, columnar)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(key)
+            if batcher is None:
+                batcher = _batchers[key] = FreeBusyBatcher(
+                    lambda ids, timezones, window: fetch_http_free_busy(ids, timezones, columnar, window),
+                    window=settings.INTERVIEWS_CALENDAR_BATCH_MS / 1000,
+                )
+    return batcher
+
+
+# Per process breakers, one per provider URL
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker():
+    '''
+    Opens after INTERVIEWS_CALENDAR_BREAKER_FAILURES failed calls in a row, one trial call every
+     INTERVIEWS_CALENDAR_BREAKER_RESET seconds until one succeeds
+    '''
+    key = (settings.INTERVIEWS_CALENDAR_API_URL, settings.INTERVIEWS_CALENDAR_BREAKER_FAILURES, settings.INTERVIEWS_CALENDAR_BREAKER_RESET)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(key)
+            if breaker is None:
+                breaker = _breakers[key] = CircuitBreaker(
+                    settings.INTERVIEWS_CALENDAR_BREAKER_FAILURES, settings.INTERVIEWS_CALENDAR_BREAKER_RESET,
+                )
+    return breaker
+
+# Per process hedgers, the latency they hedge at is learnt per provider URL
+_hedgers = {}
+_hedgers_lock = threading.Lock()
+
+
+def get_hedger():
+    '''
+    Hedges at most INTERVIEWS_CALENDAR_HEDGE_RATE of upstream calls
+    '''
+    key = (settings.INTERVIEWS_CALENDAR_API_URL, settings.INTERVIEWS_CALENDAR_HEDGE_RATE)
+    hedger = _hedgers.get(key)
+    if hedger is None:
+        with _hedgers_lock:
+            hedger = _hedgers.get(key)
+            if hedger is None:
+                hedger = _hedgers[key] = Hedger(max_ratio=settings.INTERVIEWS_CALENDAR_HEDGE_RATE)
+    return hedger
+
+def get_busy_changes(interviewer_id:int, timezone:str=None, sync_token:str=None):
+    '''
+    Events changed since sync_token from the configured provider, every event when sync_token is None
+    Returns {"interviewerId", "name", "events": [{"id", "start", "end", "cancelled"}], "nextSyncToken"}, epoch seconds
+    Raises SyncTokenExpiredError when a full sync is needed, CalendarProviderError when the http provider fails
+    '''
+    if settings.INTERVIEWS_CALENDAR_PROVIDER == "http":
+        return fetch_busy_changes(
+            settings.INTERVIEWS_CALENDAR_API_URL, interviewer_id, timezone, sync_token,
+            timeout=settings.INTERVIEWS_CALENDAR_TIMEOUT,
+        )
+    try:
+        return DEFAULT_CHANGE_LOG.changes(interviewer_id, timezone or "UTC", sync_token)
+    except SyncTokenExpired as e:
+        raise SyncTokenExpiredError("Sync token expired") from e
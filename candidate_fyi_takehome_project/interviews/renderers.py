@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import msgpack
+from django.http.request import MediaType
+from rest_framework.renderers import BaseRenderer
+
+from candidate_fyi_takehome_project.interviews.ingest import to_epoch
+from candidate_fyi_takehome_project.interviews.slots import SlotList
+
+
+# ------------------------- Binary renderers ------------------------
+class MessagePackRenderer(BaseRenderer):
+    '''
+    MessagePack for machine to machine clients, picked with Accept: application/msgpack (or ?format=msgpack)
+    Same payload as the JSON output, timestamps as UTC epoch second integers instead of ISO strings
+    Accept: application/msgpack; layout=columnar - slots as {"starts": [...], "ends": [...]} instead of
+     [{"start", "end"}], packed straight from the SlotList epoch array
+    '''
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        columnar = MediaType(accepted_media_type or self.media_type).params.get("layout") == "columnar"
+
+        def encode(obj):
+            if isinstance(obj, SlotList):
+                starts = obj.starts.tolist()
+                duration = obj.duration
+                if columnar:
+                    return {"starts": starts, "ends": [start + duration for start in starts]}
+                return [{"start": start, "end": start + duration} for start in starts]
+            if isinstance(obj, datetime):
+                return to_epoch(obj)
+            raise TypeError(f"Can't encode {type(obj).__name__} as MessagePack")
+
+        return msgpack.packb(data, default=encode)
@@ -1,38 +1,102 @@
 from rest_framework import serializers
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 class InterviewAvailabilitySerializerIn(serializers.Serializer):
     search_start = serializers.DateTimeField(required=False)
     search_end = serializers.DateTimeField(required=False)
     valid_interval= serializers.IntegerField(required=False, default=30)
+    interval_timezone = serializers.CharField(required=False, default="UTC")
     
     def validate(self, data):
  
+        # Defaults land on whole minutes, so everyone opening the same link in the same minute sends identical inputs
+        # and their computations coalesce
         if 'search_start' not in data:
-            data['search_start'] = datetime.now(timezone.utc) + timedelta(hours=24, seconds=5)
+            data['search_start'] = ceil_to_minute(datetime.now(timezone.utc) + timedelta(hours=24, seconds=5))
         if 'search_end' not in data:
-            data['search_end'] = datetime.now(timezone.utc) + timedelta(days=7)
+            data['search_end'] = (datetime.now(timezone.utc) + timedelta(days=7)).replace(second=0, microsecond=0)
         if 'valid_interval' not in data:
             data['valid_interval'] = 30
+        if 'interval_timezone' not in data:
+            data['interval_timezone'] = "UTC"
             
         errors = {}
         
-        allowed_intervals = [60, 30, 15, 10, 5, 1]
-        
         if data['search_start'] >= data['search_end']:
             errors['search_start'] = "Search start date must be earlier than search end date"
         
         if data['search_start'] < datetime.now(timezone.utc) + timedelta(hours=24):
             errors['search_start'] = f"Search start date must be at least 24 hours in the future"
         
-        if data['valid_interval'] not in allowed_intervals:
-            errors['valid_interval'] = f"Must be one of these values: {', '.join(map(str, allowed_intervals))}"
+        # Any whole number of minutes up to a day, the slot lattice handles intervals that do not divide the hour
+        if not 1 <= data['valid_interval'] <= 1440:
+            errors['valid_interval'] = "Must be between 1 and 1440 minutes"
+        
+        try:
+            ZoneInfo(data['interval_timezone'])
+        except (ZoneInfoNotFoundError, ValueError):
+            errors['interval_timezone'] = "Must be an IANA timezone name"
         
         if errors:
             raise serializers.ValidationError(errors)
         
         return data
     
+class HoldSerializerIn(serializers.Serializer):
+    start = serializers.DateTimeField()
+    valid_interval = serializers.IntegerField(required=False, default=30)
+    interval_timezone = serializers.CharField(required=False, default="UTC")
+
+    def validate(self, data):
+        return validate_slot_request(data)
+
+class BookingSerializerIn(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    candidate_email = serializers.EmailField()
+    hold_id = serializers.CharField(required=False)
+    valid_interval = serializers.IntegerField(required=False, default=30)
+    interval_timezone = serializers.CharField(required=False, default="UTC")
+
+    def validate(self, data):
+        # A hold already carries its start
+        if 'start' not in data and 'hold_id' not in data:
+            raise serializers.ValidationError({'start': "Start or hold_id is required"})
+        if 'start' not in data:
+            return data
+        return validate_slot_request(data)
+
+def validate_slot_request(data):
+    '''
+    Shared checks for holding or booking one slot start
+    '''
+    if 'valid_interval' not in data:
+        data['valid_interval'] = 30
+    if 'interval_timezone' not in data:
+        data['interval_timezone'] = "UTC"
+
+    errors = {}
+
+    if data['start'] < datetime.now(timezone.utc) + timedelta(hours=24):
+        errors['start'] = "Start must be at least 24 hours in the future"
+
+    if not 1 <= data['valid_interval'] <= 1440:
+        errors['valid_interval'] = "Must be between 1 and 1440 minutes"
+
+    try:
+        ZoneInfo(data['interval_timezone'])
+    except (ZoneInfoNotFoundError, ValueError):
+        errors['interval_timezone'] = "Must be an IANA timezone name"
+
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    return data
+
+def ceil_to_minute(value:datetime):
+    floored = value.replace(second=0, microsecond=0)
+    return floored if floored == value else floored + timedelta(minutes=1)
+
 class InterviewerSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     name = serializers.CharField()
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from candidate_fyi_takehome_project.interviews.cache import bump_metadata_version
+from candidate_fyi_takehome_project.interviews.bookings import invalidate_booked_busy
+from candidate_fyi_takehome_project.interviews.models import Interviewer, InterviewerBooking, InterviewTemplate, WorkingHours
+
+
+@receiver(post_save, sender=Interviewer)
+@receiver(post_delete, sender=Interviewer)
+@receiver(post_save, sender=WorkingHours)
+@receiver(post_delete, sender=WorkingHours)
+@receiver(post_save, sender=InterviewTemplate)
+@receiver(post_delete, sender=InterviewTemplate)
+@receiver(m2m_changed, sender=InterviewTemplate.interviewers.through)
+def invalidate_template_metadata(sender, **kwargs):
+    '''
+    Bump the template metadata version once the change is committed
+    Bumping before commit would let another worker re-cache the old rows under the new version
+    '''
+    transaction.on_commit(bump_metadata_version)
+
+
+@receiver(post_save, sender=InterviewerBooking)
+@receiver(post_delete, sender=InterviewerBooking)
+def invalidate_interviewer_bookings(sender, instance, **kwargs):
+    '''
+    Drop the interviewers cached bookings once a booking added outside book_slot or a cancellation commits
+    '''
+    interviewer_ids = [instance.interviewer_id]
+    transaction.on_commit(lambda: invalidate_booked_busy(interviewer_ids))
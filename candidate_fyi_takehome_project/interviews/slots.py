@@ -0,0 +1,60 @@
+from array import array
+
+from candidate_fyi_takehome_project.interviews.ingest import from_epoch
+from services.epochs import format_epoch
+
+
+# ------------------------- Compact slot output ------------------------
+class SlotList:
+    '''
+    Interview slots as one array of UTC epoch second starts plus the shared duration, 8 bytes per slot
+    Immutable sequence of (start, end) datetime pairs, datetimes are only built for the slots actually accessed
+    '''
+    __slots__ = ("starts", "duration")
+
+    def __init__(self, starts=(), duration:int=0):
+        self.starts = starts if isinstance(starts, array) else array("q", starts)
+        # Seconds
+        self.duration = duration
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SlotList(self.starts[index], self.duration)
+        start = self.starts[index]
+        return (from_epoch(start), from_epoch(start + self.duration))
+
+    def __iter__(self):
+        duration = self.duration
+        for start in self.starts:
+            yield (from_epoch(start), from_epoch(start + duration))
+
+    def __eq__(self, other):
+        if isinstance(other, SlotList):
+            return self.starts == other.starts and (self.duration == other.duration or not self.starts)
+        # Compares equal to any sequence of [start, end] datetime pairs, like the reference engine output
+        try:
+            return len(self) == len(other) and all(tuple(pair) == slot for slot, pair in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"SlotList({len(self)} slots)"
+
+    def epochs(self):
+        '''
+        (start, end) epoch second pairs without building datetimes
+        '''
+        duration = self.duration
+        return ((start, start + duration) for start in self.starts)
+
+    def tolist(self):
+        '''
+        [{"start", "end"}] with ISO strings, the shape the API returns
+        DRFs JSON encoder calls tolist(), so a SlotList can go straight into a Response
+        '''
+        duration = self.duration
+        return [{"start": format_epoch(start), "end": format_epoch(start + duration)} for start in self.starts]
+
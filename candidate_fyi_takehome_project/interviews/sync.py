@@ -0,0 +1,233 @@
+from datetime import timedelta
+import logging
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import FilteredRelation, Q
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.utils import timezone
+
+from candidate_fyi_takehome_project.interviews.coalesce import bump_busy_versions
+from candidate_fyi_takehome_project.interviews.ingest import from_epoch, to_epoch
+from candidate_fyi_takehome_project.interviews.interval_index import BusyIntervalIndex
+from candidate_fyi_takehome_project.interviews.models import BusyBlock, CalendarSync, Interviewer
+from candidate_fyi_takehome_project.interviews.providers import SyncTokenExpiredError, get_busy_changes
+from services.busy_columns import BusyColumns
+from services.epochs import format_epoch
+
+logger = logging.getLogger(__name__)
+
+# Synced blocks that ended this long ago are deleted on the next sync
+BUSY_BLOCK_RETENTION = timedelta(days=1)
+# interviewer id -> sync token of the last committed sync, tells every process whether its busy index is behind
+SYNC_TOKEN_KEY = "interviews:sync_token:{}"
+
+
+# ------------------------- Incremental calendar sync ------------------------
+def sync_interviewer(interviewer_id:int):
+    '''
+    Pull one interviewers calendar changes since the stored sync token and apply them to their BusyBlock rows
+    First sync, or a token the provider expired, replaces every row
+    The provider is called before any transaction opens, so no row lock or transaction waits on the network
+    The changes are then applied under a skip_locked row lock, only if the stored token is still the one they were
+     fetched with, a sync that ran or is running meanwhile wins and this one is skipped
+    Returns {"interviewerId", "full", "upserted", "deleted", "skipped"}
+    Raises CalendarProviderError when the provider fails, nothing is changed then
+    '''
+    interviewer = Interviewer.objects.only("id", "timezone").get(id=interviewer_id)
+    state, _ = CalendarSync.objects.get_or_create(interviewer_id=interviewer_id)
+    result = {"interviewerId": interviewer_id, "full": False, "upserted": 0, "deleted": 0, "skipped": False}
+
+    fetched_with = state.sync_token
+    full = fetched_with is None
+    try:
+        changes = get_busy_changes(interviewer_id, interviewer.timezone, fetched_with)
+    except SyncTokenExpiredError:
+        logger.info("Sync token expired for interviewer %s, running a full sync", interviewer_id)
+        full = True
+        changes = get_busy_changes(interviewer_id, interviewer.timezone)
+
+    with transaction.atomic():
+        state = CalendarSync.objects.select_for_update(skip_locked=True).filter(interviewer_id=interviewer_id).first()
+        if state is None or state.sync_token != fetched_with:
+            result["skipped"] = True
+            return result
+
+        blocks = []
+        cancelled = []
+        for event in changes["events"]:
+            # Inverted events have no range, they are never busy so drop them like a cancellation
+            if event["cancelled"] or event["end"] < event["start"]:
+                cancelled.append(event["id"])
+            else:
+                blocks.append(BusyBlock(
+                    interviewer_id=interviewer_id, source_id=event["id"],
+                    start=from_epoch(event["start"]), end=from_epoch(event["end"]),
+                ))
+
+        rows = BusyBlock.objects.filter(interviewer_id=interviewer_id)
+        if full:
+            result["deleted"] = rows.delete()[0]
+            BusyBlock.objects.bulk_create(blocks)
+        else:
+            result["deleted"] = rows.filter(
+                Q(source_id__in=cancelled) | Q(end__lt=timezone.now() - BUSY_BLOCK_RETENTION)
+            ).delete()[0]
+            BusyBlock.objects.bulk_create(
+                blocks, update_conflicts=True, unique_fields=["interviewer", "source_id"], update_fields=["start", "end"],
+            )
+
+        state.name = changes.get("name") or ""
+        state.sync_token = changes["nextSyncToken"]
+        state.synced_at = timezone.now()
+        state.save(update_fields=["name", "sync_token", "synced_at"])
+
+    retention_cutoff = to_epoch(timezone.now() - BUSY_BLOCK_RETENTION)
+    transaction.on_commit(lambda: update_busy_index(
+        interviewer_id, fetched_with, state.sync_token, state.name,
+        [(block.source_id, to_epoch(block.start), to_epoch(block.end)) for block in blocks],
+        cancelled, full, retention_cutoff,
+    ))
+    transaction.on_commit(lambda: bump_busy_versions([interviewer_id]))
+    result["full"] = full
+    result["upserted"] = len(blocks)
+    return result
+
+
+# ------------------------- Synced busy reads ------------------------
+def get_stored_free_busy(interviewer_ids, search_window=None, columnar:bool=False):
+    '''
+    Synced busy blocks for the panel in the same shape as the provider response, one query
+    Only blocks overlapping search_window (search_start, search_end) are joined, the window index bounds the scan
+    '''
+    condition = Q()
+    if search_window:
+        search_start, search_end = search_window
+        condition = Q(busy_blocks__start__lt=search_end, busy_blocks__end__gt=search_start)
+    rows = (
+        Interviewer.objects.filter(id__in=interviewer_ids)
+        .annotate(window_blocks=FilteredRelation("busy_blocks", condition=condition))
+        .values("id", "calendar_sync__name")
+        .annotate(
+            starts=ArrayAgg("window_blocks__start", filter=Q(window_blocks__id__isnull=False), ordering="window_blocks__start", default=[]),
+            ends=ArrayAgg("window_blocks__end", filter=Q(window_blocks__id__isnull=False), ordering="window_blocks__start", default=[]),
+        )
+    )
+    busy_by_id = {}
+    for row in rows:
+        starts = [to_epoch(start) for start in row["starts"]]
+        ends = [to_epoch(end, round_up=True) for end in row["ends"]]
+        busy_by_id[row["id"]] = (row["calendar_sync__name"], starts, ends)
+
+    data = []
+    for interviewer_id in interviewer_ids:
+        name, starts, ends = busy_by_id.get(interviewer_id, (None, [], []))
+        busy = BusyColumns(starts, ends) if columnar else [
+            {"start": format_epoch(start), "end": format_epoch(end)} for start, end in zip(starts, ends)
+        ]
+        data.append({"interviewerId": interviewer_id, "name": name, "busy": busy})
+    return data
+
+
+# ------------------------- Long lived busy indexes ------------------------
+class IndexedCalendar:
+    '''
+    One interviewers synced busy blocks kept in this process
+    index - BusyIntervalIndex of every block, blocks - source id -> (start, end) epoch pair so a change can remove the old block
+    sync_token - token of the sync the index reflects
+    '''
+    __slots__ = ("index", "blocks", "name", "sync_token")
+
+    def __init__(self, blocks, name, sync_token):
+        self.index = BusyIntervalIndex(blocks.values())
+        self.blocks = blocks
+        self.name = name
+        self.sync_token = sync_token
+
+
+# This processes calendars, interviewer id -> IndexedCalendar
+_indexed_calendars = {}
+_indexed_calendars_lock = threading.Lock()
+
+
+def get_indexed_free_busy(interviewer_ids):
+    '''
+    Synced busy blocks for the panel in the provider response shape, "busy" is the interviewers long lived BusyIntervalIndex
+    An interviewer this process has no index for, or whose index is behind the last committed sync (another process ran it),
+     is loaded from the BusyBlock rows, one query for all of them
+    '''
+    keys = [SYNC_TOKEN_KEY.format(interviewer_id) for interviewer_id in interviewer_ids]
+    tokens = cache.get_many(keys)
+    calendars = {}
+    behind = []
+    for interviewer_id, key in zip(interviewer_ids, keys):
+        calendar = _indexed_calendars.get(interviewer_id)
+        if calendar is None or calendar.sync_token != tokens.get(key):
+            behind.append(interviewer_id)
+        else:
+            calendars[interviewer_id] = calendar
+    if behind:
+        calendars.update(load_indexed_calendars(behind))
+
+    return [
+        {"interviewerId": interviewer_id, "name": calendars[interviewer_id].name, "busy": calendars[interviewer_id].index}
+        for interviewer_id in interviewer_ids
+    ]
+
+def load_indexed_calendars(interviewer_ids):
+    '''
+    Build the interviewers indexes from their BusyBlock rows and sync token, one query so both come from the same snapshot
+    '''
+    rows = (
+        Interviewer.objects.filter(id__in=interviewer_ids)
+        .values("id", "calendar_sync__name", "calendar_sync__sync_token")
+        .annotate(
+            source_ids=ArrayAgg("busy_blocks__source_id", filter=Q(busy_blocks__id__isnull=False), ordering="busy_blocks__id", default=[]),
+            starts=ArrayAgg("busy_blocks__start", filter=Q(busy_blocks__id__isnull=False), ordering="busy_blocks__id", default=[]),
+            ends=ArrayAgg("busy_blocks__end", filter=Q(busy_blocks__id__isnull=False), ordering="busy_blocks__id", default=[]),
+        )
+    )
+    loaded = {}
+    for row in rows:
+        blocks = {
+            source_id: (to_epoch(start), to_epoch(end, round_up=True))
+            for source_id, start, end in zip(row["source_ids"], row["starts"], row["ends"])
+        }
+        sync_token = row["calendar_sync__sync_token"]
+        loaded[row["id"]] = _indexed_calendars[row["id"]] = IndexedCalendar(blocks, row["calendar_sync__name"], sync_token)
+        if sync_token is not None:
+            # Only fills an evicted key, a newer sync committing meanwhile keeps its token
+            cache.add(SYNC_TOKEN_KEY.format(row["id"]), sync_token, timeout=None)
+    for interviewer_id in interviewer_ids:
+        # Deleted interviewer, nothing busy
+        loaded.setdefault(interviewer_id, IndexedCalendar({}, None, None))
+    return loaded
+
+def update_busy_index(interviewer_id:int, fetched_with, sync_token:str, name:str, upserted, cancelled, full:bool, retention_cutoff:int):
+    '''
+    Apply a committed syncs changes to this processes index one block at a time, then publish the new sync token
+    upserted - (source id, start, end) per changed event, cancelled - source ids
+    A full sync, or an index that missed a sync, is dropped instead and reloaded on its next read
+    '''
+    with _indexed_calendars_lock:
+        calendar = _indexed_calendars.get(interviewer_id)
+        if calendar is not None and (full or calendar.sync_token != fetched_with):
+            del _indexed_calendars[interviewer_id]
+        elif calendar is not None:
+            index = calendar.index
+            blocks = calendar.blocks
+            for source_id in cancelled:
+                if source_id in blocks:
+                    index.remove(*blocks.pop(source_id))
+            for source_id, start, end in upserted:
+                if source_id in blocks:
+                    index.remove(*blocks[source_id])
+                index.insert(start, end)
+                blocks[source_id] = (start, end)
+            # Same retention as the rows the sync deleted
+            for source_id in [source_id for source_id, (_, end) in blocks.items() if end < retention_cutoff]:
+                index.remove(*blocks.pop(source_id))
+            calendar.name = name
+            calendar.sync_token = sync_token
+    cache.set(SYNC_TOKEN_KEY.format(interviewer_id), sync_token, timeout=None)
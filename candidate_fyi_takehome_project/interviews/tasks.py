@@ -0,0 +1,67 @@
+from datetime import datetime
+import logging
+
+from celery import group, shared_task
+from django.conf import settings
+
+from candidate_fyi_takehome_project.interviews.bookings import get_panel_slots
+from candidate_fyi_takehome_project.interviews.cache import get_template_metadata
+from candidate_fyi_takehome_project.interviews.jobs import clear_inflight_job, encode_job_result
+from candidate_fyi_takehome_project.interviews.models import Interviewer
+from candidate_fyi_takehome_project.interviews.providers import CalendarProviderError
+from candidate_fyi_takehome_project.interviews.sync import sync_interviewer
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task()
+def sync_interviewer_calendars(interviewer_ids):
+    """
+    Sync each interviewer in turn, one provider failure doesn't stop the rest
+    """
+    results = []
+    for interviewer_id in interviewer_ids:
+        try:
+            results.append(sync_interviewer(interviewer_id))
+        except CalendarProviderError:
+            logger.warning("Calendar sync failed for interviewer %s", interviewer_id, exc_info=True)
+        except Interviewer.DoesNotExist:
+            pass
+    return results
+
+
+def build_sync_jobs(interviewer_ids, concurrency=None):
+    """
+    Split the interviewers into at most concurrency sequential batches, so no more syncs than that run at once
+    however many workers pick them up
+    """
+    concurrency = concurrency or settings.INTERVIEWS_SYNC_CONCURRENCY
+    interviewer_ids = list(interviewer_ids)
+    return group(
+        sync_interviewer_calendars.s(interviewer_ids[n::concurrency])
+        for n in range(min(concurrency, len(interviewer_ids)))
+    )
+
+
+@shared_task()
+def sync_calendars():
+    """
+    Periodic entry point (celery beat), fans out one batch per concurrency slot
+    """
+    build_sync_jobs(Interviewer.objects.order_by("id").values_list("id", flat=True)).apply_async()
+
+
+@shared_task(track_started=True)
+def compute_availability(template_id, search_start, search_end, valid_interval, interval_timezone, inflight_digest):
+    """
+    Availability job queued by the availability jobs endpoint, returns the compressed payload (see jobs.encode_job_result)
+    Raises CalendarProviderError like the synchronous view, the job then reports "failed"
+    """
+    try:
+        template = get_template_metadata(template_id)
+        panel = get_panel_slots(
+            template, datetime.fromisoformat(search_start), datetime.fromisoformat(search_end), valid_interval, interval_timezone,
+        )
+        return encode_job_result(template, panel)
+    finally:
+        clear_inflight_job(inflight_digest)
@@ -1,8 +1,46 @@
-from django.test import SimpleTestCase
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from io import StringIO
 from types import SimpleNamespace
+from unittest import mock
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.utils.encoders import JSONEncoder
+import msgpack
 
 from candidate_fyi_takehome_project.interviews.utils import *
+from candidate_fyi_takehome_project.interviews import provider_cache, providers
+from candidate_fyi_takehome_project.interviews.alignment import SlotLattice
+from candidate_fyi_takehome_project.interviews.bookings import get_booked_busy
+from candidate_fyi_takehome_project.interviews.cache import get_template_metadata
+from candidate_fyi_takehome_project.interviews.coalesce import COALESCE_LOCK_KEY, COALESCE_RESULT_KEY, SingleFlight, coalesce_shared
+from candidate_fyi_takehome_project.interviews.free_windows import get_panel_free_windows
+from candidate_fyi_takehome_project.interviews.holds import HOLD_LOCK_KEY, HoldConflictError, get_held_busy, get_hold, place_hold, release_hold
+from candidate_fyi_takehome_project.interviews.ingest import to_epoch, parse_busy_epochs, trim_busy_epochs_to_search_window, make_window_filter
+from candidate_fyi_takehome_project.interviews.interval_index import BusyIntervalIndex
+from candidate_fyi_takehome_project.interviews.intervals import IntervalSet
+from candidate_fyi_takehome_project.interviews.jobs import pack_starts, unpack_starts
+from candidate_fyi_takehome_project.interviews.management.commands.loadtest import Command as LoadTestCommand
+from candidate_fyi_takehome_project.interviews.models import Booking, BusyBlock, CalendarSync, Interviewer, InterviewerBooking, InterviewTemplate
+from candidate_fyi_takehome_project.interviews.providers import CalendarProviderError, CircuitOpenError, get_breaker, get_free_busy_data
+from candidate_fyi_takehome_project.interviews.serlializers import InterviewAvailabilitySerializerIn
+from candidate_fyi_takehome_project.interviews.slots import SlotList
+from candidate_fyi_takehome_project.interviews.sync import SYNC_TOKEN_KEY, get_indexed_free_busy, get_stored_free_busy, sync_interviewer
+from candidate_fyi_takehome_project.interviews.tasks import build_sync_jobs, compute_availability
+from services.busy_columns import BusyColumns
+from services.calendar_changes import DEFAULT_CHANGE_LOG
+from services.calendar_server import CalendarServer, StandInConfig
+from services.mock_availability import get_free_busy_data as mock_availability_get_free_busy_data
 
 # ------------------- InterviewAvailability util function tests ---------------------------
 class computeAvailableSlotsTests(SimpleTestCase):
@@ -74,13 +112,157 @@ class computeAvailableSlotsTests(SimpleTestCase):
         expected = [
             [utc_dt(2025, 10, day=6, hour=9), utc_dt(2025, 10, day=6, hour=9, minute=30)],
             [utc_dt(2025, 10, day=6, hour=9, minute=30), utc_dt(2025, 10, day=6, hour=10)],
+            # Starts right as the busy block ends
+            [utc_dt(2025, 10, day=6, hour=10, minute=30), utc_dt(2025, 10, day=6, hour=11)],
             [utc_dt(2025, 10, day=6, hour=11), utc_dt(2025, 10, day=6, hour=11, minute=30)],
             [utc_dt(2025, 10, day=6, hour=11, minute=30), utc_dt(2025, 10, day=6, hour=12)],
         ]
         actual = compute_available_slots(search_start, search_end, valid_interval, busy_data, self.interviewers, duration)
         self.assertEqual(actual,expected)
+    
+    # Test columnar busy blocks give the same slots as dicts
+    def test_columnar_busy_data(self):
+        search_start = utc_dt(2025, 10, day=6, hour=9)
+        search_end = utc_dt(2025, 10, day=6, hour=17)
+        busy_data = [
+            {"start": "2025-10-06T09:00:00Z", "end": "2025-10-06T10:00:00Z"},
+            {"start": "2025-10-06T12:30:00Z", "end": "2025-10-06T13:00:00Z"},
+            {"start": "2025-10-05T22:00:00Z", "end": "2025-10-06T09:30:00Z"},
+        ]
+        columns = BusyColumns(*parse_busy_epochs(busy_data))
+        
+        expected = compute_available_slots(search_start, search_end, self.valid_interval, busy_data, self.interviewers, self.duration)
+        actual = compute_available_slots(search_start, search_end, self.valid_interval, columns, self.interviewers, self.duration)
+        self.assertEqual(actual,expected)
+
+
+class computeAvailableSlotsFromFreeListsTests(SimpleTestCase):
+    def setUp(self):
+        self.interviewers = [
+            SimpleNamespace(workday_start_hour=9, workday_end_hour=17, timezone="America/New_York"),
+            SimpleNamespace(workday_start_hour=9, workday_end_hour=17, timezone="America/Los_Angeles"),
+        ]
+        self.search_start = utc_dt(2025, 10, 6, 12)
+        self.search_end = utc_dt(2025, 10, 7, 2)
+        
+    # Test per interviewer busy lists give the same slots as the combined reference engine
+    def test_matches_reference(self):
+        busy = [
+            [{"start": "2025-10-06T14:00:00Z", "end": "2025-10-06T15:00:00Z"}],
+            [{"start": "2025-10-06T17:10:00Z", "end": "2025-10-06T17:10:00Z"}, {"start": "2025-10-06T19:00:00Z", "end": "2025-10-06T19:45:00Z"}],
+        ]
+        expected = compute_available_slots(self.search_start, self.search_end, 15, busy[0] + busy[1], self.interviewers, 60)
+        actual = compute_available_slots_from_free_lists(self.search_start, self.search_end, 15, busy, self.interviewers, 60)
+        self.assertEqual(actual, expected)
+        # Zero length block at 17:10 splits the window like it does in the reference engine
+        self.assertNotIn([utc_dt(2025, 10, 6, 17), utc_dt(2025, 10, 6, 18)], actual)
+        
+    # Test a fully booked interviewer short circuits to no slots
+    def test_fully_booked(self):
+        busy = [[], [{"start": "2025-10-06T00:00:00Z", "end": "2025-10-08T00:00:00Z"}]]
+        actual = compute_available_slots_from_free_lists(self.search_start, self.search_end, 15, busy, self.interviewers, 30)
+        self.assertEqual(actual, [])
 
+    # Test a panel without interviewers has no slots in every engine
+    def test_empty_panel(self):
+        window = IntervalSet([to_epoch(self.search_start)], [to_epoch(self.search_end)])
+        self.assertEqual(compute_available_slots(self.search_start, self.search_end, 60, [], [], 60), [])
+        self.assertEqual(compute_available_slots_from_free_lists(self.search_start, self.search_end, 60, [], [], 60), [])
+        self.assertEqual(compute_available_slots_from_free_windows(self.search_start, self.search_end, 60, window, [], 60), [])
 
+    # Test random calendars against the reference engine
+    def test_random_calendars_match_reference(self):
+        rng = random.Random(5)
+        base = int(utc_dt(2025, 10, 30, 0).timestamp())
+        timezones = ["UTC", "America/New_York", "Asia/Kolkata", "Australia/Lord_Howe", "Europe/London"]
+        for _ in range(200):
+            interviewers = [
+                SimpleNamespace(workday_start_hour=rng.randrange(0, 12), workday_end_hour=rng.randrange(8, 24), timezone=rng.choice(timezones))
+                for _ in range(rng.randrange(1, 4))
+            ]
+            calendars = [
+                BusyColumns.from_pairs([
+                    (start, start + rng.choice([0, 300, 900, 3600, 7200]))
+                    for start in (base + rng.randrange(-86400, 86400 * 4) // 300 * 300 for _ in range(rng.randrange(0, 20)))
+                ])
+                for _ in interviewers
+            ]
+            search_start = from_epoch(base + rng.randrange(0, 86400 * 2))
+            search_end = search_start + timedelta(seconds=rng.randrange(600, 86400 * 3))
+            valid_interval = rng.choice([5, 15, 30, 60])
+            duration = rng.choice([15, 30, 60, 90])
+            
+            expected = compute_available_slots(search_start, search_end, valid_interval, BusyColumns.concat(calendars), interviewers, duration)
+            actual = compute_available_slots_from_free_lists(search_start, search_end, valid_interval, calendars, interviewers, duration)
+            self.assertEqual(actual, expected)
+        
+        
+class slotListTests(SimpleTestCase):
+    def setUp(self):
+        self.start = int(utc_dt(2025, 10, 6, 9).timestamp())
+        self.slots = SlotList([self.start, self.start + 900, self.start + 1800], 3600)
+        
+    # Test sequence access builds datetime pairs lazily
+    def test_sequence(self):
+        self.assertEqual(len(self.slots), 3)
+        self.assertEqual(self.slots[1], (utc_dt(2025, 10, 6, 9, 15), utc_dt(2025, 10, 6, 10, 15)))
+        self.assertEqual(self.slots[-1][0], utc_dt(2025, 10, 6, 9, 30))
+        self.assertEqual(self.slots[1:], SlotList([self.start + 900, self.start + 1800], 3600))
+        self.assertEqual(list(self.slots.epochs())[0], (self.start, self.start + 3600))
+        
+    # Test equality with the reference engine nested list output
+    def test_equals_nested_lists(self):
+        expected = [[start, end] for start, end in self.slots]
+        self.assertEqual(self.slots, expected)
+        self.assertNotEqual(self.slots, expected[:2])
+        
+    # Test encoding matches what DRF gives for the datetimes
+    def test_json_encoding(self):
+        expected = [{"start": start, "end": end} for start, end in self.slots]
+        self.assertEqual(json.dumps(self.slots, cls=JSONEncoder), json.dumps(expected, cls=JSONEncoder))
+        
+        
+class slotLatticeTests(SimpleTestCase):
+    def setUp(self):
+        self.search_start = utc_dt(2025, 10, 6, 0)
+        self.search_end = utc_dt(2025, 10, 8, 0)
+        
+    def epoch(self, *args):
+        return int(utc_dt(*args).timestamp())
+    
+    # Test UTC anchoring rounds like ceil_slot_to_interval
+    def test_utc_matches_ceil_slot_to_interval(self):
+        for step in [1, 5, 10, 15, 30, 60]:
+            lattice = SlotLattice(step * 60, self.search_start, self.search_end)
+            for minute in range(0, 24 * 60, 7):
+                date = self.search_start + timedelta(minutes=minute, seconds=minute % 3)
+                self.assertEqual(lattice.ceil(int(date.timestamp())), int(ceil_slot_to_interval(date, step).timestamp()))
+                
+    # Test half hour offset timezones keep starts on their local hour
+    def test_local_anchor(self):
+        lattice = SlotLattice(3600, self.search_start, self.search_end, "Asia/Kolkata")
+        # 10:05 UTC = 15:35 Kolkata -> 16:00 Kolkata = 10:30 UTC
+        self.assertEqual(lattice.ceil(self.epoch(2025, 10, 6, 10, 5)), self.epoch(2025, 10, 6, 10, 30))
+        
+    # Test intervals that do not divide the hour restart at midnight
+    def test_arbitrary_interval(self):
+        lattice = SlotLattice(45 * 60, self.search_start, self.search_end)
+        self.assertEqual(lattice.ceil(self.epoch(2025, 10, 6, 1, 0)), self.epoch(2025, 10, 6, 1, 30))
+        self.assertEqual(lattice.ceil(self.epoch(2025, 10, 6, 23, 50)), self.epoch(2025, 10, 7, 0))
+        # 23:15 fits a 30 minute slot, the next day starts over at 00:00
+        starts = [s for r in lattice.slot_starts(self.epoch(2025, 10, 6, 23, 0), self.epoch(2025, 10, 7, 1, 0), 1800) for s in r]
+        self.assertEqual(starts, [self.epoch(2025, 10, 6, 23, 15), self.epoch(2025, 10, 7, 0)])
+        
+    # Test the serializer accepts arbitrary intervals and validates the timezone
+    def test_serializer(self):
+        params = {"search_start": (datetime.now(timezone.utc) + timedelta(days=2)).isoformat(), "valid_interval": 45, "interval_timezone": "Asia/Kolkata"}
+        serializer = InterviewAvailabilitySerializerIn(data=params)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer = InterviewAvailabilitySerializerIn(data={**params, "valid_interval": 0, "interval_timezone": "Mars/Base"})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(set(serializer.errors), {"valid_interval", "interval_timezone"})
+        
+        
 class trimBusySlotsToWindowTests(SimpleTestCase):
     def setUp(self):
         self.search_start = utc_dt(2025, 10, 7, 3)
@@ -136,6 +318,181 @@ class trimBusySlotsToWindowTests(SimpleTestCase):
         self.assertEqual(actual, expected)
         
         
+class busyEpochIngestTests(SimpleTestCase):
+    def setUp(self):
+        self.epoch = int(utc_dt(2025, 10, 7, 3).timestamp())
+        
+    # Test Z strings, offset strings and datetimes parse to the same epoch
+    def test_to_epoch_formats(self):
+        self.assertEqual(to_epoch("2025-10-07T03:00:00Z"), self.epoch)
+        self.assertEqual(to_epoch("2025-10-06T23:00:00-04:00"), self.epoch)
+        self.assertEqual(to_epoch(utc_dt(2025, 10, 7, 3)), self.epoch)
+        
+    # Test a null or non string timestamp is a TypeError
+    def test_to_epoch_unsupported(self):
+        for value in (None, 1759806000, {"dateTime": "2025-10-07T03:00:00Z"}):
+            with self.assertRaises(TypeError):
+                to_epoch(value)
+
+    # Test sub second values round outwards
+    def test_to_epoch_rounding(self):
+        date = utc_dt(2025, 10, 7, 3, second=0, millisecond=500)
+        self.assertEqual(to_epoch(date), self.epoch)
+        self.assertEqual(to_epoch(date, round_up=True), self.epoch + 1)
+        self.assertEqual(to_epoch("2025-10-07T03:00:00.5Z", round_up=True), self.epoch + 1)
+        
+    # Test bulk parse of mixed inputs
+    def test_parse_busy_epochs(self):
+        slots = [
+            {"start": "2025-10-07T03:00:00Z", "end": "2025-10-07T04:00:00Z"},
+            {"start": utc_dt(2025, 10, 7, 5), "end": utc_dt(2025, 10, 7, 6)},
+        ]
+        expected = ([self.epoch, self.epoch + 7200], [self.epoch + 3600, self.epoch + 10800])
+        self.assertEqual(parse_busy_epochs(slots), expected)
+        
+    # Test out of window blocks are dropped as epochs
+    def test_trim_epochs(self):
+        search_start = utc_dt(2025, 10, 7, 3)
+        search_end = utc_dt(2025, 10, 7, 9)
+        slots = [
+            {"start": "2025-10-06T01:00:00Z", "end": "2025-10-06T06:00:00Z"},
+            {"start": "2025-10-07T02:00:00Z", "end": "2025-10-07T04:00:00Z"},
+        ]
+        expected = [
+            [self.epoch - 3600, self.epoch],
+            [self.epoch, self.epoch + 3600],
+            [self.epoch + 6 * 3600, self.epoch + 7 * 3600],
+        ]
+        self.assertEqual(trim_busy_epochs_to_search_window(search_start, search_end, slots), expected)
+        
+    # Test the streaming filter keeps and trims the same blocks as the bulk trim
+    def test_window_filter_matches_trim(self):
+        search_start = utc_dt(2025, 10, 7, 3)
+        search_end = utc_dt(2025, 10, 7, 9)
+        slots = [
+            {"start": "2025-10-06T01:00:00Z", "end": "2025-10-06T06:00:00Z"},
+            {"start": "2025-10-07T02:00:00Z", "end": "2025-10-07T04:00:00Z"},
+            {"start": "2025-10-07T05:00:00Z", "end": "2025-10-07T05:30:00Z"},
+            {"start": "2025-10-07T08:00:00Z", "end": "2025-10-07T10:00:00Z"},
+        ]
+        keep_in_window = make_window_filter(search_start, search_end)
+        kept = [list(block) for slot in slots if (block := keep_in_window(slot["start"], slot["end"]))]
+        
+        self.assertEqual(kept, trim_busy_epochs_to_search_window(search_start, search_end, slots)[1:-1])
+        self.assertEqual(make_window_filter()(*slots[0].values()), (self.epoch - 26 * 3600, self.epoch - 21 * 3600))
+        
+        
+class busyIntervalIndexTests(SimpleTestCase):
+    # Test inserts merge touching blocks the same way build_busy_windows does
+    def test_insert_merges(self):
+        index = BusyIntervalIndex([(10, 20), (40, 50)])
+        index.insert(20, 30)
+        index.insert(60, 60)
+        self.assertEqual(index.busy_between(0, 100), [(10, 30), (40, 50), (60, 60)])
+        index.insert(25, 45)
+        self.assertEqual(index.busy_between(0, 100), [(10, 50), (60, 60)])
+        
+    # Test removing a block only splits the window it was part of
+    def test_remove_splits(self):
+        index = BusyIntervalIndex([(10, 20), (15, 40), (30, 50), (70, 80)])
+        index.remove(15, 40)
+        self.assertEqual(index.busy_between(0, 100), [(10, 20), (30, 50), (70, 80)])
+        with self.assertRaises(KeyError):
+            index.remove(15, 40)
+            
+    # Test free intervals between two times
+    def test_free_between(self):
+        index = BusyIntervalIndex([(10, 20), (30, 50), (70, 80)])
+        self.assertEqual(index.free_between(15, 75), [(20, 30), (50, 70)])
+        self.assertEqual(index.free_between(0, 100), [(0, 10), (20, 30), (50, 70), (80, 100)])
+        self.assertEqual(index.free_between(55, 60), [(55, 60)])
+        
+    # Test random insert / remove sequences match a rebuild from scratch
+    def test_matches_rebuild(self):
+        rng = random.Random(7)
+        index = BusyIntervalIndex()
+        blocks = []
+        for _ in range(2000):
+            if blocks and rng.random() < 0.4:
+                block = blocks.pop(rng.randrange(len(blocks)))
+                index.remove(*block)
+            else:
+                start = rng.randrange(0, 1000)
+                block = (start, start + rng.choice([0, 5, 20, 60]))
+                blocks.append(block)
+                index.insert(*block)
+            expected = [tuple(w) for w in build_busy_windows([list(b) for b in blocks])]
+            self.assertEqual(index.busy_between(-1, 2000), expected)
+            
+    # Test the engine gives the same slots from per interviewer indexes as from raw blocks
+    def test_compute_available_slots_from_indexes(self):
+        rng = random.Random(3)
+        base = int(utc_dt(2025, 10, 6, 0).timestamp())
+        interviewers = [
+            SimpleNamespace(workday_start_hour=9, workday_end_hour=17, timezone="America/New_York"),
+            SimpleNamespace(workday_start_hour=8, workday_end_hour=18, timezone="UTC"),
+        ]
+        for _ in range(50):
+            calendars = [
+                BusyColumns.from_pairs([
+                    (start, start + rng.choice([0, 900, 1800, 3600, 7200]))
+                    for start in (base + rng.randrange(0, 7 * 96) * 900 for _ in range(rng.randrange(0, 40)))
+                ])
+                for _ in interviewers
+            ]
+            search_start = from_epoch(base + rng.randrange(0, 86400 * 2))
+            search_end = search_start + timedelta(seconds=rng.randrange(3600, 86400 * 5))
+            
+            expected = compute_available_slots(search_start, search_end, 15, BusyColumns.concat(calendars), interviewers, 45)
+            indexes = [BusyIntervalIndex(columns) for columns in calendars]
+            actual = compute_available_slots(search_start, search_end, 15, indexes, interviewers, 45)
+            self.assertEqual(actual, expected)
+        
+        
+class intervalSetTests(SimpleTestCase):
+    # Brute force an interval set as the set of covered integer points
+    def points(self, interval_set):
+        return {t for start, end in interval_set for t in range(start, end)}
+    
+    def random_set(self, rng):
+        pairs = []
+        for _ in range(rng.randrange(0, 8)):
+            start = rng.randrange(0, 100)
+            pairs.append((start, start + rng.randrange(0, 20)))
+        return IntervalSet.from_pairs(pairs)
+    
+    # Test building normalizes overlapping, touching and empty pairs
+    def test_from_pairs(self):
+        interval_set = IntervalSet.from_pairs([(30, 40), (5, 10), (10, 15), (12, 13), (50, 50)])
+        self.assertEqual(list(interval_set), [(5, 15), (30, 40)])
+        self.assertEqual(interval_set.total(), 20)
+        
+    # Test dilation merges buffered intervals and erosion drops short ones
+    def test_dilate(self):
+        interval_set = IntervalSet.from_pairs([(10, 20), (25, 30), (50, 52)])
+        self.assertEqual(list(interval_set.dilate(3)), [(7, 33), (47, 55)])
+        self.assertEqual(list(interval_set.dilate(0, 5)), [(10, 35), (50, 57)])
+        self.assertEqual(list(interval_set.dilate(-2)), [(12, 18), (27, 28)])
+        
+    # Test every operation against brute force point sets
+    def test_operations_match_point_sets(self):
+        rng = random.Random(11)
+        for _ in range(500):
+            a, b = self.random_set(rng), self.random_set(rng)
+            lo = rng.randrange(0, 60)
+            hi = lo + rng.randrange(0, 60)
+            window = set(range(lo, hi))
+            
+            self.assertEqual(self.points(a.union(b)), self.points(a) | self.points(b))
+            self.assertEqual(self.points(a.intersection(b)), self.points(a) & self.points(b))
+            self.assertEqual(self.points(a.difference(b)), self.points(a) - self.points(b))
+            self.assertEqual(self.points(a.complement(lo, hi)), window - self.points(a))
+            self.assertEqual(self.points(a.clip(lo, hi)), window & self.points(a))
+            # Results stay normalized
+            for result in (a.union(b), a.intersection(b), a.difference(b), a.complement(lo, hi), a.clip(lo, hi)):
+                self.assertEqual(result, IntervalSet.from_pairs(list(result)))
+        
+        
 class buildBusyWindowsTests(SimpleTestCase):
     def setUp(self):
         self.slot_one = [utc_dt(2025, 10, 6, 12), utc_dt(2025, 10, 6, 19)]
@@ -416,6 +773,58 @@ class buildAvailableInterviewSlotsTests(SimpleTestCase):
         actual = build_available_interview_slots(available_windows, interval, duration)
         self.assertEqual(actual, expected)
            
+class buildWorkdayMaskTests(SimpleTestCase):
+    def setUp(self):
+        # Mon-Thu 9-17, Friday 9-12, weekends off
+        weekdays = tuple((weekday, 9 * 60, 17 * 60) for weekday in range(4))
+        self.weekly_interviewer = SimpleNamespace(
+            workday_start_hour=9, workday_end_hour=17, timezone="UTC",
+            weekly_schedule=weekdays + ((4, 9 * 60, 12 * 60),),
+        )
+        
+    # Test legacy hours produce the same ranges as the per window workday slot
+    def test_legacy_hours_match_workday_slot(self):
+        interviewers = [
+            SimpleNamespace(workday_start_hour=9, workday_end_hour=17, timezone="America/New_York"),
+            SimpleNamespace(workday_start_hour=9, workday_end_hour=17, timezone="America/Los_Angeles"),
+        ]
+        expected = [
+            build_available_workday_slot(utc_dt(2025, 10, day=9, hour=13), interviewers),
+            build_available_workday_slot(utc_dt(2025, 10, day=10, hour=13), interviewers),
+        ]
+        actual = build_workday_mask(utc_dt(2025, 10, day=9, hour=0), utc_dt(2025, 10, day=11, hour=0), interviewers)
+        self.assertEqual(actual, expected)
+        
+    # Test friday hours and weekends off
+    def test_weekly_schedule(self):
+        expected = [
+            [utc_dt(2025, 10, day=9, hour=9), utc_dt(2025, 10, day=9, hour=17)],
+            [utc_dt(2025, 10, day=10, hour=9), utc_dt(2025, 10, day=10, hour=12)],
+        ]
+        actual = build_workday_mask(utc_dt(2025, 10, day=9, hour=0), utc_dt(2025, 10, day=13, hour=0), [self.weekly_interviewer])
+        self.assertEqual(actual, expected)
+        
+    # Test split shift with minute resolution
+    def test_split_shift(self):
+        interviewer = SimpleNamespace(
+            workday_start_hour=9, workday_end_hour=17, timezone="UTC",
+            weekly_schedule=((0, 8 * 60 + 30, 11 * 60 + 45), (0, 13 * 60, 16 * 60 + 15)),
+        )
+        expected = [
+            [utc_dt(2025, 10, day=6, hour=8, minute=30), utc_dt(2025, 10, day=6, hour=11, minute=45)],
+            [utc_dt(2025, 10, day=6, hour=13), utc_dt(2025, 10, day=6, hour=16, minute=15)],
+        ]
+        actual = build_workday_mask(utc_dt(2025, 10, day=6, hour=0), utc_dt(2025, 10, day=7, hour=0), [interviewer])
+        self.assertEqual(actual, expected)
+        
+    # Test no slots are offered on a weekend
+    def test_no_weekend_slots(self):
+        search_start = utc_dt(2025, 10, day=11, hour=0)
+        search_end = utc_dt(2025, 10, day=13, hour=0)
+        actual = compute_available_slots(search_start, search_end, 60, [], [self.weekly_interviewer], 60)
+        self.assertEqual(actual, [])
+        
+        
 # ------------------------ Test util helpers -----------------------------
 
 class ceilSlotToInterval(SimpleTestCase):
@@ -477,25 +886,1021 @@ class ceilSlotToInterval(SimpleTestCase):
         actual = ceil_slot_to_interval(date, 1)
         self.assertEqual(actual, expected)
         
+    # Test a time already on an interval is kept, not only the hour
+    def test_on_interval_kept(self):
+        # 13:30:00 -> 13:30:00 (10, 30)
+        date = utc_dt(2025, 10, day=9, hour=13, minute=30)
+        self.assertEqual(ceil_slot_to_interval(date, 10), date)
+        self.assertEqual(ceil_slot_to_interval(date, 30), date)
+        self.assertEqual(ceil_slot_to_interval(utc_dt(2025, 10, day=9, hour=13), 10), utc_dt(2025, 10, day=9, hour=13))
+
+    # Test a busy block ending on the lattice keeps the slot right after it, whatever the anchor timezone
+    def test_slot_after_busy_end_kept(self):
+        day = utc_dt(2025, 10, day=9, hour=0)
+        busy = [{"start": "2025-10-09T09:00:00Z", "end": "2025-10-09T13:30:00Z"}]
+        interviewer = SimpleNamespace(workday_start_hour=0, workday_end_hour=0, timezone="UTC")
+        for tz in ("UTC", "Asia/Kolkata"):
+            slots = compute_available_slots_from_free_lists(day, day + timedelta(days=1), 30, [busy], [interviewer], 30, interval_timezone=tz)
+            first_after = next(start for start, _ in slots if start >= utc_dt(2025, 10, day=9, hour=13, minute=30))
+            self.assertEqual(first_after, utc_dt(2025, 10, day=9, hour=13, minute=30), tz)
+
+        lattice = SlotLattice(1800, day, day + timedelta(days=1))
+        on_lattice = to_epoch(utc_dt(2025, 10, day=9, hour=13, minute=30))
+        self.assertEqual(lattice.ceil(on_lattice), on_lattice)
+        self.assertEqual(lattice.ceil(on_lattice + 1), on_lattice + 1800)
+
+
+# ------------------------ Engine differential tests -----------------------------
+# Timezones with DST, half hour offsets and a half hour DST shift (Lord Howe)
+FUZZ_TIMEZONES = ["UTC", "America/New_York", "America/Los_Angeles", "Europe/London", "Asia/Kolkata", "Australia/Lord_Howe", "Pacific/Auckland", "America/St_Johns"]
+# Days around DST transitions in the fuzz timezones
+FUZZ_BASE_DAYS = [utc_dt(2025, 3, 8, 0), utc_dt(2025, 3, 29, 0), utc_dt(2025, 4, 5, 0), utc_dt(2025, 9, 27, 0), utc_dt(2025, 10, 25, 0), utc_dt(2025, 11, 1, 0), utc_dt(2025, 7, 14, 0)]
+FUZZ_CASES = int(os.environ.get("ENGINE_FUZZ_CASES", 2000))
+
+
+def build_fuzz_case(seed):
+    '''
+    Random panel, calendars and request for one seed, so a failing case can be replayed on its own
+    '''
+    rng = random.Random(seed)
+    base = rng.choice(FUZZ_BASE_DAYS)
+    interviewers = []
+    # Empty panels included, every engine must agree they have no slots
+    for _ in range(rng.randrange(0, 5)):
+        # Overnight and 24h workdays (start >= end) included
+        interviewer = SimpleNamespace(
+            workday_start_hour=rng.randrange(0, 24), workday_end_hour=rng.randrange(0, 24), timezone=rng.choice(FUZZ_TIMEZONES)
+        )
+        if rng.random() < 0.3:
+            interviewer.weekly_schedule = tuple(
+                (weekday, start_minute, start_minute + rng.choice([30, 120, 480, 600]))
+                for weekday in rng.sample(range(7), rng.randrange(1, 8))
+                for start_minute in [rng.randrange(0, 1440 - 30, 15)]
+            )
+        interviewers.append(interviewer)
         
-        
-        
+    search_start = base + timedelta(minutes=rng.randrange(0, 2 * 1440, 5), microseconds=rng.choice([0, 0, 0, 250000]))
+    search_end = search_start + timedelta(minutes=rng.randrange(30, 4 * 1440, 5), microseconds=rng.choice([0, 0, 0, 750000]))
     
+    calendars = []
+    for _ in interviewers:
+        busy = []
+        for _ in range(rng.randrange(0, 25)):
+            # Blocks start up to a day either side of the window so some straddle it
+            start = search_start + timedelta(minutes=rng.randrange(-1440, int((search_end - search_start).total_seconds() // 60) + 1440, 5))
+            start = start.replace(microsecond=0)
+            end = start + timedelta(minutes=rng.choice([0, 5, 15, 30, 60, 90, 240, 1440]))
+            # Mixed inputs - Z strings, offset strings, sub second strings and datetimes
+            kind = rng.randrange(4)
+            if kind == 0:
+                busy.append({"start": start.strftime("%Y-%m-%dT%H:%M:%SZ"), "end": end.strftime("%Y-%m-%dT%H:%M:%SZ")})
+            elif kind == 1:
+                offset = timezone(timedelta(hours=rng.choice([-5, 0, 5.5])))
+                busy.append({"start": start.astimezone(offset).isoformat(), "end": end.astimezone(offset).isoformat()})
+            elif kind == 2:
+                busy.append({"start": start.isoformat(), "end": (end + timedelta(milliseconds=500)).isoformat()})
+            else:
+                busy.append({"start": start, "end": end})
+        calendars.append(busy)
         
-    
-            
-    
+    return SimpleNamespace(
+        interviewers=interviewers, calendars=calendars, search_start=search_start, search_end=search_end,
+        valid_interval=rng.choice([1, 5, 10, 15, 30, 60]), duration=rng.choice([15, 30, 45, 60, 90, 120]),
+    )
+
+
+def as_columns(busy):
+    return BusyColumns(*parse_busy_epochs(busy))
+
+
+def free_windows_engine(case):
+    '''
+    Free window engine on the panels merged free windows and zero length blocks, what get_panel_free_windows reads from the rows
+    '''
+    busy = [
+        pair for calendar in case.calendars
+        for pair in trim_busy_epochs_to_search_window(case.search_start, case.search_end, calendar)[1:-1]
+    ]
+    window = IntervalSet([to_epoch(case.search_start, round_up=True)], [to_epoch(case.search_end)])
+    return compute_available_slots_from_free_windows(
+        case.search_start, case.search_end, case.valid_interval, window.difference(IntervalSet.from_pairs(busy)),
+        case.interviewers, case.duration, split_points=sorted(start for start, end in busy if start == end),
+    )
+
 
+# Every engine / input format pair under test, each gets the case and returns slots
+FUZZ_ENGINES = {
+    "reference_columns": lambda case: compute_available_slots(
+        case.search_start, case.search_end, case.valid_interval, BusyColumns.concat(as_columns(busy) for busy in case.calendars), case.interviewers, case.duration
+    ),
+    "reference_indexes": lambda case: compute_available_slots(
+        case.search_start, case.search_end, case.valid_interval, [BusyIntervalIndex(as_columns(busy)) for busy in case.calendars], case.interviewers, case.duration
+    ),
+    "free_lists_dicts": lambda case: compute_available_slots_from_free_lists(
+        case.search_start, case.search_end, case.valid_interval, case.calendars, case.interviewers, case.duration
+    ),
+    "free_lists_columns": lambda case: compute_available_slots_from_free_lists(
+        case.search_start, case.search_end, case.valid_interval, [as_columns(busy) for busy in case.calendars], case.interviewers, case.duration
+    ),
+    "free_lists_indexes": lambda case: compute_available_slots_from_free_lists(
+        case.search_start, case.search_end, case.valid_interval, [BusyIntervalIndex(as_columns(busy)) for busy in case.calendars], case.interviewers, case.duration
+    ),
+    "free_windows": lambda case: free_windows_engine(case),
+}
+
+
+class engineDifferentialTests(SimpleTestCase):
+    # Test every engine returns exactly the reference engines slots on random cases
+    # Replay a failure with build_fuzz_case(seed), run more cases with ENGINE_FUZZ_CASES
+    def test_engines_match_reference(self):
+        for seed in range(FUZZ_CASES):
+            case = build_fuzz_case(seed)
+            expected = compute_available_slots(
+                case.search_start, case.search_end, case.valid_interval,
+                [block for busy in case.calendars for block in busy], case.interviewers, case.duration,
+            )
+            for name, engine in FUZZ_ENGINES.items():
+                actual = engine(case)
+                if actual != expected:
+                    self.fail(f"{name} differs from the reference engine for build_fuzz_case({seed})")
         
+    # Test the cases actually cover the edge cases they are meant to
+    def test_cases_cover_edge_cases(self):
+        cases = [build_fuzz_case(seed) for seed in range(200)]
+        interviewers = [i for case in cases for i in case.interviewers]
+        self.assertTrue(any(i.workday_start_hour >= i.workday_end_hour for i in interviewers))
+        self.assertTrue(any(getattr(i, "weekly_schedule", None) for i in interviewers))
+        self.assertTrue(any(not case.interviewers for case in cases))
+        self.assertTrue(any(
+            isinstance(block["start"], datetime) for case in cases for busy in case.calendars for block in busy
+        ))
+        # Some requests return slots, the comparison is not just empty lists
+        with_slots = sum(
+            bool(compute_available_slots_from_free_lists(c.search_start, c.search_end, c.valid_interval, c.calendars, c.interviewers, c.duration))
+            for c in cases
+        )
+        self.assertGreater(with_slots, 20)
         
-    
         
-    
-    
+# ------------------------ Template metadata cache tests -----------------------------
+class templateMetadataCacheTests(TestCase):
+    def setUp(self):
+        self.interviewer = Interviewer.objects.create(timezone="America/New_York", workday_start_hour=8, workday_end_hour=16)
+        self.template = InterviewTemplate.objects.create(name="Cache Interview", duration=45)
+        self.template.interviewers.add(self.interviewer)
+
+    # Test warm lookup never hits the DB
+    def test_warm_lookup_zero_queries(self):
+        get_template_metadata(self.template.id)
+        with self.assertNumQueries(0):
+            metadata = get_template_metadata(self.template.id)
+
+        self.assertEqual(metadata.name, "Cache Interview")
+        self.assertEqual(metadata.duration, 45)
+        self.assertEqual(metadata.interviewers[0].timezone, "America/New_York")
+
+    # Test interviewer save invalidates after commit
+    def test_interviewer_save_invalidates(self):
+        get_template_metadata(self.template.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.interviewer.workday_end_hour = 18
+            self.interviewer.save()
+
+        metadata = get_template_metadata(self.template.id)
+        self.assertEqual(metadata.interviewers[0].workday_end_hour, 18)
+
+    # Test m2m change invalidates after commit
+    def test_m2m_change_invalidates(self):
+        get_template_metadata(self.template.id)
+        other = Interviewer.objects.create(timezone="UTC")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.template.interviewers.add(other)
+
+        metadata = get_template_metadata(self.template.id)
+        self.assertEqual([i.id for i in metadata.interviewers], [self.interviewer.id, other.id])
+
+    # Test missing template raises like .get()
+    def test_missing_template(self):
+        with self.assertRaises(InterviewTemplate.DoesNotExist):
+            get_template_metadata(self.template.id + 1000)
+
+    # Test warm availability request does zero queries
+    def test_warm_view_zero_queries(self):
+        url = reverse("interviews:interview_availabilty", kwargs={"id": self.template.id})
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+
+# ------------------------ InterviewAvailability view tests -----------------------------
+class interviewAvailabilityViewTests(TestCase):
+    def setUp(self):
+        interviewer = Interviewer.objects.create(timezone="UTC")
+        self.template = InterviewTemplate.objects.create(name="View Interview", duration=30)
+        self.template.interviewers.add(interviewer)
+        self.url = reverse("interviews:interview_availabilty", kwargs={"id": self.template.id})
         
+    # Test mock provider response shape
+    def test_mock_provider(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["interviewId"], self.template.id)
+        self.assertTrue(response.json()["availableSlots"])
         
+    # Test unreachable http provider returns 503
+    @override_settings(INTERVIEWS_CALENDAR_PROVIDER="http", INTERVIEWS_CALENDAR_API_URL="http://127.0.0.1:9", INTERVIEWS_CALENDAR_TIMEOUT=0.5)
+    def test_provider_unavailable(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        
+        
+class messagePackRendererTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        interviewer = Interviewer.objects.create(timezone="UTC")
+        self.template = InterviewTemplate.objects.create(name="Binary Interview", duration=30)
+        self.template.interviewers.add(interviewer)
+        self.url = reverse("interviews:interview_availabilty", kwargs={"id": self.template.id})
+
+    # Test MessagePack carries the JSON payload with epoch second timestamps
+    def test_msgpack_matches_json(self):
+        expected = self.client.get(self.url).json()
+        response = self.client.get(self.url, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(data["interviewers"], expected["interviewers"])
+        self.assertEqual(
+            data["availableSlots"],
+            [{"start": to_epoch(slot["start"]), "end": to_epoch(slot["end"])} for slot in expected["availableSlots"]],
+        )
+
+    # Test the columnar layout and the format query parameter
+    def test_columnar_layout(self):
+        rows = msgpack.unpackb(self.client.get(self.url, {"format": "msgpack"}).content)["availableSlots"]
+        response = self.client.get(self.url, HTTP_ACCEPT="application/msgpack; layout=columnar")
+        columns = msgpack.unpackb(response.content)["availableSlots"]
+        self.assertEqual(columns["starts"], [slot["start"] for slot in rows])
+        self.assertEqual(columns["ends"], [slot["end"] for slot in rows])
+
+    # Test JSON stays the default and errors render in MessagePack too
+    def test_json_default_and_errors(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIsInstance(response.json()["availableSlots"][0]["start"], str)
+        response = self.client.get(self.url, {"valid_interval": 0}, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("valid_interval", msgpack.unpackb(response.content))
+
+
+# ------------------------ Booking view tests -----------------------------
+class bookingViewTests(TransactionTestCase):
+    def setUp(self):
+        self.interviewer = Interviewer.objects.create(timezone="UTC")
+        self.template = InterviewTemplate.objects.create(name="Booking Interview", duration=60)
+        self.template.interviewers.add(self.interviewer)
+        self.url = reverse("interviews:interview_bookings", kwargs={"id": self.template.id})
+        self.availability_url = reverse("interviews:interview_availabilty", kwargs={"id": self.template.id})
+
+    def first_slot(self):
+        return self.client.get(self.availability_url).json()["availableSlots"][0]
+
+    def book(self, client, start, email="candidate@example.com"):
+        return client.post(self.url, {"start": start, "candidate_email": email}, content_type="application/json")
+
+    # Test a listed slot books and drops out of the listing
+    def test_book_listed_slot(self):
+        slot = self.first_slot()
+        response = self.book(self.client, slot["start"])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["interviewers"], [self.interviewer.id])
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertNotIn(slot, self.client.get(self.availability_url).json()["availableSlots"])
+
+    # Test a start off the listed interval is rejected
+    def test_unlisted_start(self):
+        start = datetime.fromisoformat(self.first_slot()["start"]) + timedelta(minutes=7)
+        response = self.book(self.client, start.isoformat())
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Booking.objects.count(), 0)
+
+    # Test an overlapping booking through another template sharing the interviewer
+    def test_overlap_other_template(self):
+        other = InterviewTemplate.objects.create(name="Other Interview", duration=30)
+        other.interviewers.add(self.interviewer)
+        slot = self.first_slot()
+        self.assertEqual(self.book(self.client, slot["start"]).status_code, 201)
+        other_url = reverse("interviews:interview_bookings", kwargs={"id": other.id})
+        start = datetime.fromisoformat(slot["start"]) + timedelta(minutes=30)
+        response = self.client.post(other_url, {"start": start.isoformat(), "candidate_email": "b@example.com"}, content_type="application/json")
+        self.assertEqual(response.status_code, 409)
+
+    # Test the exclusion constraint rejects overlapping rows the availability check did not see
+    def test_constraint_rejects_overlap(self):
+        slot = self.first_slot()
+        self.assertEqual(self.book(self.client, slot["start"]).status_code, 201)
+        booking = Booking.objects.get()
+        with self.assertRaises(IntegrityError):
+            InterviewerBooking.objects.create(
+                booking=booking, interviewer=self.interviewer,
+                period=(booking.start + timedelta(minutes=59), booking.end + timedelta(minutes=59)),
+            )
+
+    # Test many candidates racing for one slot, exactly one booking wins
+    def test_concurrent_same_slot(self):
+        start = self.first_slot()["start"]
+        statuses = []
+        barrier = threading.Barrier(16)
+
+        def race(n):
+            try:
+                client = Client()
+                barrier.wait()
+                statuses.append(self.book(client, start, email=f"candidate{n}@example.com").status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=race, args=(n,)) for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses), [201] + [409] * 15)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    # Test a cache fill that read the rows before a booking committed is never served
+    def test_fill_racing_booking(self):
+        start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=2)
+        end = start + timedelta(hours=1)
+        real_set_many = cache.set_many
+
+        def booking_commits_first(data, timeout):
+            booking = Booking.objects.create(template=self.template, candidate_email="b@example.com", start=start, end=end)
+            InterviewerBooking.objects.create(booking=booking, interviewer=self.interviewer, period=(start, end))
+            real_set_many(data, timeout)
+
+        with mock.patch.object(cache, "set_many", booking_commits_first):
+            self.assertEqual(get_booked_busy([self.interviewer.id], start, end), {})
+        self.assertEqual(get_booked_busy([self.interviewer.id], start, end), {self.interviewer.id: [(to_epoch(start), to_epoch(end))]})
+
+    # Test bad input
+    def test_invalid_input(self):
+        response = self.client.post(self.url, {"start": "2020-01-01T00:00:00Z", "candidate_email": "nope"}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("candidate_email", response.json())
+
+
+# ------------------------ Request coalescing tests -----------------------------
+class singleFlightTests(SimpleTestCase):
+    def run_concurrently(self, count, fn):
+        results = []
+        errors = []
+        def call():
+            try:
+                results.append(fn())
+            except ValueError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    # Test concurrent callers share one run and its result
+    def test_shares_result(self):
+        flights = SingleFlight()
+        calls = []
+        release = threading.Event()
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "slots"
+        threading.Timer(0.2, release.set).start()
+        results, _ = self.run_concurrently(10, lambda: flights.do("key", compute))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["slots"] * 10)
+        # Nothing is kept afterwards
+        self.assertEqual(flights.do("key", lambda: "again"), "again")
+
+    # Test waiters get the leaders exception
+    def test_shares_error(self):
+        flights = SingleFlight()
+        def compute():
+            time.sleep(0.2)
+            raise ValueError("provider down")
+        results, errors = self.run_concurrently(5, lambda: flights.do("key", compute))
+        self.assertEqual((results, len(errors)), ([], 5))
+
+
+class coalesceSharedTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        digest = hashlib.sha1(b"key").hexdigest()
+        self.result_key = COALESCE_RESULT_KEY.format(digest)
+        self.lock_key = COALESCE_LOCK_KEY.format(digest)
+
+    # Test a result published by the lock holder in another process is used
+    def test_waits_for_other_process(self):
+        cache.add(self.lock_key, 1)
+        threading.Timer(0.1, lambda: cache.set(self.result_key, "published")).start()
+        self.assertEqual(coalesce_shared("key", lambda: "computed"), "published")
+
+    # Test the lock holder failing lets the waiter compute
+    def test_holder_failed(self):
+        cache.add(self.lock_key, 1)
+        threading.Timer(0.1, lambda: cache.delete(self.lock_key)).start()
+        self.assertEqual(coalesce_shared("key", lambda: "computed"), "computed")
+
+    # Test the result is published for identical calls right after
+    def test_publishes(self):
+        self.assertEqual(coalesce_shared("key", lambda: "first"), "first")
+        self.assertEqual(coalesce_shared("key", lambda: "second"), "first")
+        self.assertIsNone(cache.get(self.lock_key))
+
+
+class coalescedViewTests(TransactionTestCase):
+    # Test a burst of identical requests makes one provider call
+    def test_burst_one_provider_call(self):
+        cache.clear()
+        interviewer = Interviewer.objects.create(timezone="UTC")
+        template = InterviewTemplate.objects.create(name="Shared Link", duration=30)
+        template.interviewers.add(interviewer)
+        url = reverse("interviews:interview_availabilty", kwargs={"id": template.id})
+        real_provider = mock_availability_get_free_busy_data
+        calls = []
+        def slow_provider(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.3)
+            return real_provider(*args, **kwargs)
+
+        responses = []
+        barrier = threading.Barrier(12)
+        def request():
+            try:
+                client = Client()
+                barrier.wait()
+                responses.append(client.get(url).json()["availableSlots"])
+            finally:
+                connection.close()
+
+        with mock.patch("candidate_fyi_takehome_project.interviews.providers.mock_availability.get_free_busy_data", slow_provider):
+            threads = [threading.Thread(target=request) for _ in range(12)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(responses), 12)
+        self.assertTrue(all(slots == responses[0] for slots in responses))
+
+
+# ------------------------ Stale while revalidate tests -----------------------------
+class staleWhileRevalidateTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = CalendarServer(("127.0.0.1", 0), StandInConfig())
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.live_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        providers._breakers.clear()
+        self.server.request_count = 0
+        self.server.sample_latency = lambda rng: 0
+        interviewer = Interviewer.objects.create(timezone="UTC")
+        self.template = InterviewTemplate.objects.create(name="Stale Interview", duration=30)
+        self.template.interviewers.add(interviewer)
+        self.url = reverse("interviews:interview_availabilty", kwargs={"id": self.template.id})
+        # Each request computes its own result instead of reading the one published by the last
+        settings = override_settings(
+            INTERVIEWS_CALENDAR_PROVIDER="http", INTERVIEWS_CALENDAR_API_URL=self.live_url, INTERVIEWS_CALENDAR_TIMEOUT=2.0,
+            INTERVIEWS_CALENDAR_BATCH_MS=0, INTERVIEWS_CALENDAR_SOFT_TTL=30, INTERVIEWS_COALESCE_TTL=0,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Refreshes run on a pool the test can wait for
+        self.refresh_pool = ThreadPoolExecutor(max_workers=1)
+        pool_patch = mock.patch.object(provider_cache, "_refresh_pool", self.refresh_pool)
+        pool_patch.start()
+        self.addCleanup(pool_patch.stop)
+
+    def later(self, seconds):
+        # Only the cache ages, the cache backends own expiry keeps real time
+        now = time.time()
+        return mock.patch.object(provider_cache, "time", SimpleNamespace(time=lambda: now + seconds))
+
+    def wait_for_refreshes(self):
+        self.refresh_pool.shutdown(wait=True)
+        self.refresh_pool = ThreadPoolExecutor(max_workers=1)
+        provider_cache._refresh_pool = self.refresh_pool
+
+    # Test calendars within the soft TTL come from the cache
+    def test_fresh_from_cache(self):
+        first = self.client.get(self.url).json()
+        second = self.client.get(self.url).json()
+        self.assertEqual(self.server.request_count, 1)
+        self.assertFalse(first["stale"])
+        self.assertFalse(second["stale"])
+        self.assertEqual(first["availableSlots"], second["availableSlots"])
+
+    # Test a stale calendar is served without waiting on a slow provider, then refreshed once in the background
+    def test_stale_served_while_refreshing(self):
+        fresh = self.client.get(self.url).json()
+        self.server.sample_latency = lambda rng: 0.5
+        with self.later(60):
+            started = time.monotonic()
+            stale = self.client.get(self.url).json()
+            elapsed = time.monotonic() - started
+            self.client.get(self.url)
+            self.wait_for_refreshes()
+        self.assertTrue(stale["stale"])
+        self.assertEqual(stale["availableSlots"], fresh["availableSlots"])
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(self.server.request_count, 2)
+        self.assertFalse(self.client.get(self.url).json()["stale"])
+
+    # Test failing refreshes open the circuit, stale calendars are still served and nothing new waits on the provider
+    def test_open_circuit_serves_stale(self):
+        self.client.get(self.url)
+        with override_settings(INTERVIEWS_CALENDAR_API_URL="http://127.0.0.1:9", INTERVIEWS_CALENDAR_BREAKER_FAILURES=2), self.later(60):
+            for _ in range(3):
+                response = self.client.get(self.url)
+                self.wait_for_refreshes()
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.json()["stale"])
+            self.assertEqual(get_breaker().state, "open")
+
+            other = Interviewer.objects.create(timezone="UTC")
+            with mock.patch("candidate_fyi_takehome_project.interviews.providers.fetch_free_busy") as upstream:
+                with self.assertRaises(CircuitOpenError):
+                    get_free_busy_data([other.id], columnar=True)
+            upstream.assert_not_called()
+
+    # Test a response leaving out an interviewer is a provider error, a 503 rather than a 500
+    def test_partial_response(self):
+        with mock.patch("candidate_fyi_takehome_project.interviews.providers.fetch_free_busy", return_value=[]):
+            with self.assertRaises(CalendarProviderError):
+                get_free_busy_data([1, 2], columnar=True)
+            self.assertEqual(self.client.get(self.url).status_code, 503)
+
+    # Test a streamed block with a null timestamp is a provider error and counts against the circuit
+    def test_null_timestamp(self):
+        payload = [{"interviewerId": 1, "name": "A", "busy": [{"start": None, "end": "2025-10-07T03:00:00Z"}]}]
+        # A JSON only provider, the blocks are stream parsed
+        json_only = mock.patch.object(self.server.config, "columnar", False)
+        with json_only, mock.patch("services.calendar_server.get_free_busy_data", return_value=payload):
+            with self.assertRaises(CalendarProviderError):
+                providers.fetch_free_busy(self.live_url, [1], busy_filter=make_window_filter())
+            with override_settings(INTERVIEWS_CALENDAR_SOFT_TTL=0), self.assertRaises(CalendarProviderError):
+                get_free_busy_data([1], columnar=True, search_window=(utc_dt(2025, 10, 6, 0), utc_dt(2025, 10, 8, 0)))
+        self.assertEqual(get_breaker().failures, 1)
+
+    # Test fresh bypasses the cache, booking re-validation never trusts a cached calendar
+    def test_fresh_skips_cache(self):
+        get_free_busy_data([1], columnar=True)
+        with override_settings(INTERVIEWS_CALENDAR_API_URL="http://127.0.0.1:9", INTERVIEWS_CALENDAR_TIMEOUT=0.5):
+            self.assertEqual(len(get_free_busy_data([1], columnar=True)), 1)
+            with self.assertRaises(CalendarProviderError):
+                get_free_busy_data([1], columnar=True, fresh=True)
+
+
+# ------------------------ Slot hold tests -----------------------------
+class slotHoldTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    # Test overlapping holds on a shared interviewer conflict, neighbours don't
+    def test_overlap_conflicts(self):
+        place_hold(1, 3600, 7200, [1, 2], ttl=60)
+        with self.assertRaises(HoldConflictError):
+            place_hold(2, 5400, 9000, [2, 3], ttl=60)
+        place_hold(2, 7200, 9000, [2, 3], ttl=60)
+        place_hold(3, 3600, 7200, [4], ttl=60)
+        self.assertEqual(get_held_busy([1, 2, 3], 0, 86400), {1: [(3600, 7200)], 2: [(3600, 7200), (7200, 9000)], 3: [(7200, 9000)]})
+
+    # Test window filter and own hold exclusion
+    def test_held_busy_filters(self):
+        hold = place_hold(1, 3600, 7200, [1], ttl=60)
+        self.assertEqual(get_held_busy([1], 7200, 9000), {})
+        self.assertEqual(get_held_busy([1], 0, 86400, exclude_hold=hold.id), {})
+
+    # Test expired holds are ignored and free the time
+    def test_expiry(self):
+        hold = place_hold(1, 3600, 7200, [1], ttl=60)
+        with mock.patch("candidate_fyi_takehome_project.interviews.holds.time.time", return_value=hold.expires_at + 1):
+            self.assertEqual(get_held_busy([1], 0, 86400), {})
+            self.assertIsNone(get_hold(hold.id))
+            place_hold(1, 3600, 7200, [1], ttl=60)
+
+    # Test release frees the time
+    def test_release(self):
+        hold = place_hold(1, 3600, 7200, [1, 2], ttl=60)
+        release_hold(hold)
+        self.assertIsNone(get_hold(hold.id))
+        self.assertEqual(get_held_busy([1, 2], 0, 86400), {})
+        place_hold(1, 3600, 7200, [1, 2], ttl=60)
+
+
+class holdViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        interviewer = Interviewer.objects.create(timezone="UTC")
+        self.template = InterviewTemplate.objects.create(name="Hold Interview", duration=60)
+        self.template.interviewers.add(interviewer)
+        self.url = reverse("interviews:interview_holds", kwargs={"id": self.template.id})
+        self.booking_url = reverse("interviews:interview_bookings", kwargs={"id": self.template.id})
+        self.availability_url = reverse("interviews:interview_availabilty", kwargs={"id": self.template.id})
+        self.slot = self.client.get(self.availability_url).json()["availableSlots"][0]
+
+    def hold(self):
+        return self.client.post(self.url, {"start": self.slot["start"]}, content_type="application/json")
+
+    # Test a held slot leaves the listing and can't be held or booked by anyone else
+    def test_hold_blocks_others(self):
+        response = self.hold()
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(self.slot, self.client.get(self.availability_url).json()["availableSlots"])
+        self.assertEqual(self.hold().status_code, 409)
+        response = self.client.post(self.booking_url, {"start": self.slot["start"], "candidate_email": "b@example.com"}, content_type="application/json")
+        self.assertEqual(response.status_code, 409)
+
+    # Test confirming converts the hold to a booking without a provider call
+    def test_confirm_hold(self):
+        hold_id = self.hold().json()["holdId"]
+        provider_patch = mock.patch("candidate_fyi_takehome_project.interviews.bookings.get_free_busy_data")
+        with provider_patch as provider, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.booking_url, {"hold_id": hold_id, "candidate_email": "a@example.com"}, content_type="application/json")
+        provider.assert_not_called()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["start"], self.slot["start"])
+        self.assertIsNone(get_hold(hold_id))
+        self.assertNotIn(self.slot, self.client.get(self.availability_url).json()["availableSlots"])
+
+    # Test a booking that committed still succeeds when the hold index stays locked
+    def test_confirm_with_index_locked(self):
+        hold_id = self.hold().json()["holdId"]
+        cache.add(HOLD_LOCK_KEY.format(self.template.interviewers.get().id), 1, 60)
+        with mock.patch("candidate_fyi_takehome_project.interviews.holds.HOLD_LOCK_WAIT", 0.01), self.assertLogs(
+            "candidate_fyi_takehome_project.interviews.bookings", "WARNING"
+        ):
+            response = self.client.post(self.booking_url, {"hold_id": hold_id, "candidate_email": "a@example.com"}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(get_hold(hold_id))
+        self.assertEqual(Booking.objects.count(), 1)
+
+    # Test an unknown or expired hold
+    def test_expired_hold(self):
+        response = self.client.post(self.booking_url, {"hold_id": "missing", "candidate_email": "a@example.com"}, content_type="application/json")
+        self.assertEqual(response.status_code, 409)
+
+
+# ------------------------ Calendar sync tests -----------------------------
+class calendarSyncTests(TestCase):
+    def setUp(self):
+        self.interviewer = Interviewer.objects.create(timezone="America/New_York")
+        DEFAULT_CHANGE_LOG.calendars.pop(self.interviewer.id, None)
+
+    def stored_blocks(self):
+        return sorted(BusyBlock.objects.filter(interviewer=self.interviewer).values_list("source_id", "start", "end"))
+
+    # Test first sync copies every event, later syncs only apply changes
+    def test_incremental_sync(self):
+        result = sync_interviewer(self.interviewer.id)
+        self.assertTrue(result["full"])
+        events = DEFAULT_CHANGE_LOG.calendars[self.interviewer.id].events
+        self.assertEqual(BusyBlock.objects.filter(interviewer=self.interviewer).count(), len(events))
+
+        start = to_epoch(datetime.now(timezone.utc)) + 86400
+        added = DEFAULT_CHANGE_LOG.add_event(self.interviewer.id, start, start + 1800)
+        cancelled = next(iter(events))
+        DEFAULT_CHANGE_LOG.cancel_event(self.interviewer.id, cancelled)
+        result = sync_interviewer(self.interviewer.id)
+        self.assertFalse(result["full"])
+        self.assertEqual((result["upserted"], result["deleted"]), (1, 1))
+
+        expected = sorted((event_id, from_epoch(s), from_epoch(e)) for event_id, (s, e) in events.items())
+        self.assertEqual(self.stored_blocks(), expected)
+        self.assertIn(added, [block[0] for block in expected])
+        self.assertIsNotNone(CalendarSync.objects.get(interviewer=self.interviewer).name)
+
+    # Test changes fetched while another sync moved the token are dropped, the other sync wins
+    def test_token_moved_during_fetch(self):
+        real_changes = DEFAULT_CHANGE_LOG.changes
+        def concurrent_sync(interviewer_id, tz, token):
+            changes = real_changes(interviewer_id, tz, token)
+            CalendarSync.objects.filter(interviewer=self.interviewer).update(sync_token="other")
+            return changes
+
+        with mock.patch.object(DEFAULT_CHANGE_LOG, "changes", concurrent_sync):
+            result = sync_interviewer(self.interviewer.id)
+        self.assertTrue(result["skipped"])
+        self.assertEqual(self.stored_blocks(), [])
+        self.assertEqual(CalendarSync.objects.get(interviewer=self.interviewer).sync_token, "other")
+
+    # Test an expired token falls back to a full sync
+    def test_expired_token(self):
+        sync_interviewer(self.interviewer.id)
+        CalendarSync.objects.filter(interviewer=self.interviewer).update(sync_token="garbage")
+        self.assertTrue(sync_interviewer(self.interviewer.id)["full"])
+        self.assertEqual(len(self.stored_blocks()), len(DEFAULT_CHANGE_LOG.calendars[self.interviewer.id].events))
+
+    # Test stored reads match the provider in the search window, in one query
+    def test_stored_matches_provider(self):
+        sync_interviewer(self.interviewer.id)
+        other = Interviewer.objects.create()
+        search_start = datetime.now(timezone.utc) + timedelta(days=1)
+        search_end = search_start + timedelta(days=3)
+        with self.assertNumQueries(1):
+            stored = get_stored_free_busy([self.interviewer.id, other.id], (search_start, search_end), columnar=True)
+        provider = get_free_busy_data([self.interviewer.id], timezones={self.interviewer.id: "America/New_York"}, columnar=True)
+        lo, hi = to_epoch(search_start), to_epoch(search_end)
+        expected = sorted((s, e) for s, e in zip(provider[0]["busy"].starts, provider[0]["busy"].ends) if s < hi and e > lo)
+        self.assertEqual(list(zip(stored[0]["busy"].starts, stored[0]["busy"].ends)), expected)
+        self.assertEqual(stored[1], {"interviewerId": other.id, "name": None, "busy": BusyColumns()})
+
+    # Test the view reads the store without calling the provider
+    @override_settings(INTERVIEWS_BUSY_SOURCE="store")
+    def test_view_reads_store(self):
+        template = InterviewTemplate.objects.create(name="Synced Interview", duration=30)
+        template.interviewers.add(self.interviewer)
+        url = reverse("interviews:interview_availabilty", kwargs={"id": template.id})
+        sync_interviewer(self.interviewer.id)
+        with mock.patch("candidate_fyi_takehome_project.interviews.providers.mock_availability.get_free_busy_data") as provider:
+            stored = self.client.get(url).json()["availableSlots"]
+        provider.assert_not_called()
+        with override_settings(INTERVIEWS_BUSY_SOURCE="provider"):
+            self.assertEqual(stored, self.client.get(url).json()["availableSlots"])
+
+    # Test a synced change is applied to the long lived index in place and shows up in the next listing
+    @override_settings(INTERVIEWS_BUSY_SOURCE="index")
+    def test_view_reads_index(self):
+        template = InterviewTemplate.objects.create(name="Indexed Interview", duration=30)
+        template.interviewers.add(self.interviewer)
+        url = reverse("interviews:interview_availabilty", kwargs={"id": template.id})
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_interviewer(self.interviewer.id)
+        with mock.patch("candidate_fyi_takehome_project.interviews.providers.mock_availability.get_free_busy_data") as provider:
+            before = self.client.get(url).json()["availableSlots"]
+        provider.assert_not_called()
+        index = get_indexed_free_busy([self.interviewer.id])[0]["busy"]
+
+        slot = before[len(before) // 2]
+        added = DEFAULT_CHANGE_LOG.add_event(self.interviewer.id, to_epoch(slot["start"]), to_epoch(slot["end"]))
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_interviewer(self.interviewer.id)
+        with self.assertNumQueries(0):
+            after = get_indexed_free_busy([self.interviewer.id])[0]["busy"]
+        self.assertIs(after, index)
+        self.assertNotIn(slot, self.client.get(url).json()["availableSlots"])
+
+        DEFAULT_CHANGE_LOG.cancel_event(self.interviewer.id, added)
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_interviewer(self.interviewer.id)
+        self.assertEqual(self.client.get(url).json()["availableSlots"], before)
+        with override_settings(INTERVIEWS_BUSY_SOURCE="store"):
+            self.assertEqual(self.client.get(url).json()["availableSlots"], before)
+
+    # Test an index another process synced past is reloaded from the rows
+    def test_index_behind_reloaded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_interviewer(self.interviewer.id)
+        index = get_indexed_free_busy([self.interviewer.id])[0]["busy"]
+        start = to_epoch(datetime.now(timezone.utc)) + 86400
+        BusyBlock.objects.create(interviewer=self.interviewer, source_id="elsewhere", start=from_epoch(start), end=from_epoch(start + 1800))
+        cache.set(SYNC_TOKEN_KEY.format(self.interviewer.id), "elsewhere", timeout=None)
+        reloaded = get_indexed_free_busy([self.interviewer.id])[0]["busy"]
+        self.assertIsNot(reloaded, index)
+        self.assertEqual(len(reloaded), len(index) + 1)
+
+    # Test the fan out never runs more batches than the concurrency limit
+    def test_bounded_jobs(self):
+        jobs = build_sync_jobs(range(10), concurrency=3)
+        self.assertEqual(len(jobs.tasks), 3)
+        self.assertEqual(sorted(i for job in jobs.tasks for i in job.args[0]), list(range(10)))
+        results = build_sync_jobs([self.interviewer.id], concurrency=3).apply().get()
+        self.assertEqual(results[0][0]["interviewerId"], self.interviewer.id)
+
+
+# ------------------------ SQL free window tests -----------------------------
+class sqlFreeWindowTests(TestCase):
+    def setUp(self):
+        self.interviewers = [Interviewer.objects.create(timezone=tz) for tz in ("UTC", "America/New_York", "Asia/Kolkata")]
+        self.search_start = utc_dt(2025, 10, day=6, hour=3, minute=7, second=30)
+        self.search_end = utc_dt(2025, 10, day=10, hour=20)
+
+    def seed_blocks(self, rng, count):
+        rows = []
+        for interviewer in self.interviewers:
+            for n in range(count):
+                # Blocks overlap, touch, cross both window edges, and some are zero length
+                start = self.search_start + timedelta(minutes=rng.randrange(-600, 6600, 5), microseconds=rng.choice((0, 0, 250_000)))
+                rows.append(BusyBlock(
+                    interviewer=interviewer, source_id=str(n),
+                    start=start, end=start + timedelta(minutes=rng.choice((0, 15, 30, 60, 90, 240))),
+                ))
+        BusyBlock.objects.bulk_create(rows)
+
+    def engines(self, ids, panel, interval):
+        stored = get_stored_free_busy(ids, (self.search_start, self.search_end), columnar=True)
+        expected = compute_available_slots_from_free_lists(
+            self.search_start, self.search_end, interval, [i["busy"] for i in stored], panel, 30,
+        )
+        free, points = get_panel_free_windows(ids, self.search_start, self.search_end)
+        actual = compute_available_slots_from_free_windows(
+            self.search_start, self.search_end, interval, free, panel, 30, split_points=points,
+        )
+        return expected, actual
+
+    # Test the SQL free windows give the same slots as the free list engine on the same rows
+    def test_matches_free_list_engine(self):
+        rng = random.Random(7)
+        for case in range(6):
+            BusyBlock.objects.all().delete()
+            self.seed_blocks(rng, count=rng.choice((0, 5, 40)))
+            size = rng.randint(1, 3)
+            ids = [i.id for i in self.interviewers[:size]]
+            panel = [panel_member(i) for i in self.interviewers[:size]]
+            expected, actual = self.engines(ids, panel, rng.choice((15, 30, 60)))
+            self.assertEqual(actual, expected, f"case {case}")
+
+    # Test bookings are merged in the same query
+    def test_bookings_are_busy(self):
+        interviewer = self.interviewers[0]
+        template = InterviewTemplate.objects.create(name="SQL Interview", duration=60)
+        booking = Booking.objects.create(template=template, candidate_email="a@example.com",
+                                         start=utc_dt(2025, 10, day=7, hour=10), end=utc_dt(2025, 10, day=7, hour=11))
+        InterviewerBooking.objects.create(booking=booking, interviewer=interviewer, period=(booking.start, booking.end))
+        with self.assertNumQueries(1):
+            free, points = get_panel_free_windows([interviewer.id], self.search_start, self.search_end)
+        self.assertEqual(free.clip(to_epoch(utc_dt(2025, 10, day=7, hour=0)), to_epoch(utc_dt(2025, 10, day=8, hour=0))), IntervalSet(
+            [to_epoch(utc_dt(2025, 10, day=7, hour=0)), to_epoch(booking.end)],
+            [to_epoch(booking.start), to_epoch(utc_dt(2025, 10, day=8, hour=0))],
+        ))
+        self.assertEqual(points, [])
+
+    # Test the view in sql mode lists the same slots as the provider path after a sync
+    def test_view_sql_mode(self):
+        interviewer = self.interviewers[1]
+        DEFAULT_CHANGE_LOG.calendars.pop(interviewer.id, None)
+        sync_interviewer(interviewer.id)
+        template = InterviewTemplate.objects.create(name="SQL Interview", duration=30)
+        template.interviewers.add(interviewer)
+        url = reverse("interviews:interview_availabilty", kwargs={"id": template.id})
+        with override_settings(INTERVIEWS_BUSY_SOURCE="sql"):
+            sql_response = self.client.get(url).json()
+        self.assertEqual(sql_response["availableSlots"], self.client.get(url).json()["availableSlots"])
+        self.assertEqual(sql_response["interviewers"][0]["id"], interviewer.id)
+
+
+def panel_member(interviewer):
+    return SimpleNamespace(id=interviewer.id, timezone=interviewer.timezone, workday_start_hour=9, workday_end_hour=17, weekly_schedule=())
+
+
+# ------------------------ Availability job tests -----------------------------
+class availabilityJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.template = InterviewTemplate.objects.create(name="Long Horizon", duration=45)
+        for tz in ("UTC", "America/New_York", "Europe/London"):
+            self.template.interviewers.add(Interviewer.objects.create(timezone=tz))
+        self.jobs_url = reverse("interviews:interview_availability_jobs", kwargs={"id": self.template.id})
+        start = (datetime.now(timezone.utc) + timedelta(days=2)).replace(second=0, microsecond=0)
+        self.params = {"search_start": start.isoformat(), "search_end": (start + timedelta(days=90)).isoformat(), "valid_interval": 1}
+
+    def poll(self, job_id):
+        return self.client.get(reverse("interviews:availability_job", kwargs={"job_id": job_id}))
+
+    # Test a 90 day job returns what the synchronous endpoint returns
+    def test_job_matches_synchronous_result(self):
+        response = self.client.post(self.jobs_url, self.params, content_type="application/json")
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["jobId"]
+        self.assertEqual(response.json()["statusUrl"], reverse("interviews:availability_job", kwargs={"job_id": job_id}))
+
+        job = self.poll(job_id).json()
+        expected = self.client.get(reverse("interviews:interview_availabilty", kwargs={"id": self.template.id}), self.params).json()
+        self.assertEqual(job["status"], "done")
+        self.assertGreater(len(job["availableSlots"]), 1000)
+        self.assertEqual(job["availableSlots"], expected["availableSlots"])
+        self.assertEqual(job["interviewers"], expected["interviewers"])
+        self.assertEqual(job["interviewId"], self.template.id)
+
+    # Test an identical search still running is not queued again
+    def test_identical_inflight_job_reused(self):
+        with mock.patch.object(compute_availability, "apply_async") as apply_async:
+            first = self.client.post(self.jobs_url, self.params, content_type="application/json").json()["jobId"]
+            second = self.client.post(self.jobs_url, self.params, content_type="application/json").json()["jobId"]
+            other = self.client.post(self.jobs_url, {**self.params, "valid_interval": 15}, content_type="application/json").json()["jobId"]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(apply_async.call_count, 2)
+        self.assertEqual(self.poll(first).json(), {"jobId": first, "status": "pending"})
+
+    # Test a finished job frees its search, the next identical request gets a new job
+    def test_finished_job_not_reused(self):
+        first = self.client.post(self.jobs_url, self.params, content_type="application/json").json()["jobId"]
+        second = self.client.post(self.jobs_url, self.params, content_type="application/json").json()["jobId"]
+        self.assertNotEqual(first, second)
+
+    # Test an unreachable cache (add and get both empty, as with IGNORE_EXCEPTIONS) gives a 503 instead of spinning
+    def test_cache_unavailable(self):
+        with mock.patch("candidate_fyi_takehome_project.interviews.jobs.cache") as job_cache, \
+                mock.patch.object(compute_availability, "apply_async") as apply_async:
+            job_cache.add.return_value = False
+            job_cache.get.return_value = None
+            response = self.client.post(self.jobs_url, self.params, content_type="application/json")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(job_cache.add.call_count, 2)
+        apply_async.assert_not_called()
+
+    # Test a provider failure marks the job failed
+    @override_settings(INTERVIEWS_CALENDAR_PROVIDER="http", INTERVIEWS_CALENDAR_API_URL="http://127.0.0.1:9", INTERVIEWS_CALENDAR_TIMEOUT=0.5)
+    def test_provider_failure(self):
+        job_id = self.client.post(self.jobs_url, self.params, content_type="application/json").json()["jobId"]
+        job = self.poll(job_id).json()
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("error", job)
+
+    # Test unknown job ids and templates
+    def test_not_found(self):
+        self.assertEqual(self.poll("missing").status_code, 404)
+        url = reverse("interviews:interview_availability_jobs", kwargs={"id": 999999})
+        self.assertEqual(self.client.post(url, self.params, content_type="application/json").status_code, 404)
+
+    # Test delta packing round trips and stays small
+    def test_pack_starts(self):
+        starts = [1_800_000_000 + n * 60 for n in range(100_000)]
+        packed = pack_starts(starts)
+        self.assertEqual(list(unpack_starts(packed)), starts)
+        self.assertLess(len(packed), 5_000)
+        self.assertEqual(list(unpack_starts(pack_starts([]))), [])
+
+
+# ------------------------ Management command tests -----------------------------
+class bulkSeedTests(TestCase):
+    def seed_snapshot(self, seed):
+        call_command("seed", interviewers=60, templates=20, panel_size="3..5", seed=seed, stdout=StringIO())
+        interviewers = list(Interviewer.objects.order_by("id").values_list("timezone", "workday_start_hour", "workday_end_hour"))
+        panel_sizes = [t.interviewers.count() for t in InterviewTemplate.objects.order_by("id")]
+        return interviewers, panel_sizes
     
-    
+    # Test counts and panel size range
+    def test_bulk_counts(self):
+        interviewers, panel_sizes = self.seed_snapshot(seed=1)
+        self.assertEqual(len(interviewers), 60)
+        self.assertEqual(len(panel_sizes), 20)
+        self.assertTrue(all(3 <= size <= 5 for size in panel_sizes))
+        
+    # Test same seed produces the same dataset
+    def test_deterministic(self):
+        first = self.seed_snapshot(seed=3)
+        InterviewTemplate.objects.all().delete()
+        Interviewer.objects.all().delete()
+        second = self.seed_snapshot(seed=3)
+        self.assertEqual(first, second)
+
 
+class benchFreeWindowsCommandTests(TestCase):
+    # Test a tiny benchmark runs, agrees and leaves nothing behind
+    def test_small_run(self):
+        out = StringIO()
+        err = StringIO()
+        call_command("benchfreewindows", panel_sizes="1,2", blocks="10", days=2, repeat=1, stdout=out, stderr=err)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+        self.assertEqual(err.getvalue(), "")
+        self.assertFalse(BusyBlock.objects.exists())
+
+
+class loadTestCommandTests(TransactionTestCase):
+    # Test a small in process run reports every panel size without errors
+    def test_small_run(self):
+        call_command("seed", interviewers=20, templates=6, panel_size="2..3", seed=5, stdout=StringIO())
+        out = StringIO()
+        call_command("loadtest", requests=6, concurrency=2, warmup=0, windows="2", stdout=out)
         
+        output = out.getvalue()
+        self.assertIn("6 requests, concurrency 2", output)
+        self.assertIn("0 errors", output)
+        self.assertIn("   all      6", output)
+
+    # Test a run with nothing to measure is rejected up front
+    def test_no_requests(self):
+        with self.assertRaises(CommandError):
+            call_command("loadtest", requests=0, stdout=StringIO())
 
+    # Test a report without results skips the latency table instead of failing
+    def test_empty_report(self):
+        out = StringIO()
+        LoadTestCommand(stdout=out).report([], 0.0, {"concurrency": 2}, count_queries=True)
+        self.assertEqual(out.getvalue(), "0 requests, concurrency 2, 0.00s, 0.0 req/s, 0 errors\n")
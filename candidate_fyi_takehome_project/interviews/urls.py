@@ -1,8 +1,12 @@
 from django.urls import path
-from .views import InterviewAvailabilityView
+from .views import AvailabilityJobStatusView, AvailabilityJobView, BookingView, HoldView, InterviewAvailabilityView
 
 app_name = "interviews"
 
 urlpatterns = [
     path("<int:id>/availability/", InterviewAvailabilityView.as_view(), name="interview_availabilty"),
+    path("<int:id>/availability/jobs/", AvailabilityJobView.as_view(), name="interview_availability_jobs"),
+    path("availability/jobs/<str:job_id>/", AvailabilityJobStatusView.as_view(), name="availability_job"),
+    path("<int:id>/bookings/", BookingView.as_view(), name="interview_bookings"),
+    path("<int:id>/holds/", HoldView.as_view(), name="interview_holds"),
 ]
\ No newline at end of file
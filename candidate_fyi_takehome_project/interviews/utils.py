@@ -1,67 +1,166 @@
 from typing import List
-from datetime import datetime, timezone, timedelta
+from array import array
+from datetime import date, datetime, timezone, timedelta
+from functools import lru_cache
+from types import SimpleNamespace
 from zoneinfo import ZoneInfo
 import logging
 
 logger = logging.getLogger(__name__)
 
 from candidate_fyi_takehome_project.interviews.models import Interviewer
+from candidate_fyi_takehome_project.interviews.ingest import from_epoch, to_epoch, trim_busy_epochs_to_search_window
+from candidate_fyi_takehome_project.interviews.interval_index import BusyIntervalIndex
+from candidate_fyi_takehome_project.interviews.intervals import IntervalSet
+from candidate_fyi_takehome_project.interviews.slots import SlotList
+from candidate_fyi_takehome_project.interviews.alignment import SlotLattice
 
 
 # ------------------------- InterviewAvailability util functions ------------------------
 def compute_available_slots(search_start: datetime, search_end:datetime, valid_interval:int, busy_data:object, interviewers: List[Interviewer], duration:int):
     '''
     Orchestrator - Builds available interview slots
-    1). Trim busy array to within search window O(n) (do this before sort)
-    2). Build non overlapping Busy windows - combine intervals (Requires sort) O(nlogn)
-    3). Build available windows, applying interviewers workday contraints per day and interval rounding up O(n)
-    4). Build Interview Slots from available windows O(n)
+    busy_data - list of {"start", "end"} ISO string dicts, a BusyColumns of epoch seconds or a list of BusyIntervalIndex
+    1). Parse and trim busy array to within search window as epoch seconds O(n) (do this before sort)
+    2). Build non overlapping Busy windows - combine intervals (Requires sort) O(nlogn), only merged windows become datetimes
+    3). Build the shared workday mask for the whole search window once O(days * interviewers)
+    4). Build available windows, clipping to the workday mask and interval rounding up O(n)
+    5). Build Interview Slots from available windows O(n)
+    A panel without interviewers has no slots, same as the free list and free window engines
     '''
-    search_window_constrained_busy_slots = trim_busy_slots_to_search_window(search_start, search_end, busy_data)
-    busy_windows = build_busy_windows(search_window_constrained_busy_slots)
-    available_windows = build_available_windows(busy_windows, interviewers, valid_interval)
+    if not interviewers:
+        return []
+    search_window_constrained_busy_slots = trim_busy_epochs_to_search_window(search_start, search_end, busy_data)
+    busy_windows = [[from_epoch(start), from_epoch(end)] for start, end in build_busy_windows(search_window_constrained_busy_slots)]
+    workday_mask = build_workday_mask(search_start, search_end, interviewers)
+    available_windows = build_available_windows(busy_windows, interviewers, valid_interval, workday_mask)
     available_interview_slots = build_available_interview_slots(available_windows, valid_interval, duration)
     
     return available_interview_slots
     
 
+def compute_available_slots_from_free_lists(search_start: datetime, search_end:datetime, valid_interval:int, busy_by_interviewer:list, interviewers: List[Interviewer], duration:int, interval_timezone:str="UTC"):
+    '''
+    Free list engine - same slots as compute_available_slots without unioning every busy block and inverting
+    busy_by_interviewer - one busy input per interviewer in any format compute_available_slots takes, same order as interviewers
+    interval_timezone - slot starts fall on valid_interval multiples of this timezones local hours (see SlotLattice)
+    1). Build each interviewers free intervals within their own working windows O(n log n) per interviewer, no global sort
+        A BusyIntervalIndex hands over its free intervals in the window directly, nothing is sorted
+    2). Intersect the free lists smallest first with two pointer merges, stops as soon as nothing is left
+    3). Split at zero length busy blocks, they split gaps in the reference engine too O(n)
+    4). Round window starts up to the slot lattice and build Interview Slots as a compact SlotList O(n)
+    '''
+    window_start = to_epoch(search_start, round_up=True)
+    window_end = to_epoch(search_end)
+    free_lists = []
+    split_points = set()
+    
+    for interviewer, busy in zip(interviewers, busy_by_interviewer):
+        working = get_working_intervals(
+            interviewer.timezone, get_weekly_schedule(interviewer),
+            search_start.astimezone(timezone.utc).date(), search_end.astimezone(timezone.utc).date(),
+        ).clip(window_start, window_end)
+        if isinstance(busy, BusyIntervalIndex):
+            # Already merged, only its gaps inside the window are read O(log n + k)
+            free = working.intersection(IntervalSet.from_sorted(busy.free_between(window_start, window_end)))
+            busy_windows = busy.busy_between(window_start, window_end)
+        else:
+            # Drop the boundary blocks, the working windows are already clipped to the search window
+            busy_windows = trim_busy_epochs_to_search_window(search_start, search_end, busy)[1:-1]
+            free = working.difference(IntervalSet.from_pairs(busy_windows))
+        # Fully booked interviewer, nothing else matters
+        if not free:
+            return SlotList()
+        free_lists.append(free)
+        split_points.update(start for start, end in busy_windows if start == end)
+    
+    if not free_lists:
+        return SlotList()
+    free_lists.sort(key=len)
+    common_free = free_lists[0]
+    for free in free_lists[1:]:
+        common_free = common_free.intersection(free)
+        if not common_free:
+            return SlotList()
+    
+    lattice = SlotLattice(valid_interval * 60, search_start, search_end, interval_timezone)
+    return build_slot_list(split_at_points(common_free, sorted(split_points)), lattice, duration)
+
+def compute_available_slots_from_free_windows(search_start: datetime, search_end:datetime, valid_interval:int, free_windows:IntervalSet, interviewers: List[Interviewer], duration:int, interval_timezone:str="UTC", split_points=()):
+    '''
+    Slots from the panels already merged free windows (get_panel_free_windows), busy blocks never reach Python
+    1). Intersect the free windows with each interviewers working intervals, smallest result first stops early
+    2). Split at zero length busy blocks and build Interview Slots as in the free list engine
+    '''
+    window_start = to_epoch(search_start, round_up=True)
+    window_end = to_epoch(search_end)
+    common_free = free_windows.clip(window_start, window_end)
+    
+    for interviewer in interviewers:
+        if not common_free:
+            return SlotList()
+        common_free = common_free.intersection(get_working_intervals(
+            interviewer.timezone, get_weekly_schedule(interviewer),
+            search_start.astimezone(timezone.utc).date(), search_end.astimezone(timezone.utc).date(),
+        ))
+    
+    if not interviewers or not common_free:
+        return SlotList()
+    lattice = SlotLattice(valid_interval * 60, search_start, search_end, interval_timezone)
+    return build_slot_list(split_at_points(common_free, sorted(split_points)), lattice, duration)
+
+def build_slot_list(windows, lattice:SlotLattice, duration:int):
+    '''
+    Epoch version of build_available_interview_slots, window starts are rounded up to the lattice in O(1)
+    Slot starts are ranges on the lattice, nothing is built per slot
+    '''
+    length = duration * 60
+    starts = array("q")
+    for window_start, window_end in windows:
+        for slot_starts in lattice.slot_starts(window_start, window_end, length):
+            starts.extend(slot_starts)
+    return SlotList(starts, length)
+
+@lru_cache(maxsize=4096)
+def get_working_intervals(tz_name:str, weekly_schedule:tuple, first_day:date, last_day:date):
+    '''
+    UTC working intervals for a timezone and weekly schedule covering the UTC days first_day to last_day, as epoch seconds
+    Panels share timezones and schedules, so the per day walk in build_interviewer_working_windows runs once per combination
+    '''
+    interviewer = SimpleNamespace(timezone=tz_name, weekly_schedule=weekly_schedule)
+    day_start = datetime(first_day.year, first_day.month, first_day.day, tzinfo=timezone.utc)
+    day_end = datetime(last_day.year, last_day.month, last_day.day, tzinfo=timezone.utc) + timedelta(days=1)
+    return IntervalSet.from_sorted(
+        (to_epoch(start), to_epoch(end)) for start, end in build_interviewer_working_windows(day_start, day_end, interviewer)
+    )
+
+def split_at_points(intervals:IntervalSet, points:List[int]):
+    '''
+    Split sorted intervals at sorted points falling strictly inside them, two pointer walk O(n + m)
+    '''
+    pieces = []
+    j = 0
+    for start, end in intervals:
+        while j < len(points) and points[j] <= start:
+            j += 1
+        while j < len(points) and points[j] < end:
+            pieces.append((start, points[j]))
+            start = points[j]
+            j += 1
+        pieces.append((start, end))
+    return pieces
+
 def trim_busy_slots_to_search_window(search_start:datetime, search_end:datetime, busy_slots):
     """ 
     Trim busy blocks to be in search window, throw out blocks outside of window
     Adds boundary search start and search end busy slots
     Avoids expensive sorting of unneeded busy blocks later
+    Datetime view of trim_busy_epochs_to_search_window, the engine uses the epoch version directly
     """
-    
-    trimmed_slots = []
-    # Add start boundary slot, start of search window
-    trimmed_slots.append([search_start - timedelta(hours=1), search_start])
-    
-    for slot in busy_slots:
-        # Convert to iso format
-        if isinstance(slot["start"], str):
-            slot_start = datetime.fromisoformat(slot["start"].replace('Z', '+00:00'))
-        else:
-            slot_start = slot["start"].astimezone(timezone.utc)   
-        if isinstance(slot["end"], str):
-            slot_end = datetime.fromisoformat(slot["end"].replace('Z', '+00:00'))
-        else:
-            slot_end = slot["end"].astimezone(timezone.utc)
-        
-        # Trim up start - Search window: 5:00-9:00 - Busy 3:00-7:00 -> 5:00-7:00
-        if slot_start < search_start and slot_end > search_start:
-            slot_start = search_start
-        # Trim back end - Search window: 5:00-9:00 - Busy 8:00-12:00 -> 8:00 ->9:00
-        if slot_end > search_end and slot_start < slot_end:
-            slot_end = search_end
-        # Fully within search window, add slot as is
-        if slot_start>= search_start and slot_end <= search_end:
-            trimmed_slots.append([slot_start, slot_end])
-        # Slots completely outside of search window get ignored
-            
-    # Add end boundary slot, end of search window
-    trimmed_slots.append([search_end, search_end + timedelta(hours=1)])
-            
-    return trimmed_slots
+    return [
+        [from_epoch(slot_start), from_epoch(slot_end)]
+        for slot_start, slot_end in trim_busy_epochs_to_search_window(search_start, search_end, busy_slots)
+    ]
  
  
 def build_busy_windows(busy_slots):
@@ -72,7 +171,7 @@ def build_busy_windows(busy_slots):
     if not busy_slots:
         return []
     
-    # Sort by start time
+    # Sort by start time, close to linear when the input is already sorted (interval indexes)
     busy_slots.sort(key = lambda x: x[0])
     
     # Initialize previous slot to start of array
@@ -92,16 +191,20 @@ def build_busy_windows(busy_slots):
     
     return busy_windows
 
-def build_available_windows(busy_windows, interviewers, valid_interval):
+def build_available_windows(busy_windows, interviewers, valid_interval, workday_mask=None):
     '''
     Build array of available windows off of the busy windows
-    Available windows get trimmed to be within each days workday contraints
+    Available windows get clipped to the shared workday mask (built over the busy windows span if not provided)
     Start times get rounded up to the provided valid interval for later processing
     '''
     available_windows=[]
     
     if not busy_windows:
         return available_windows
+    if workday_mask is None:
+        workday_mask = build_workday_mask(busy_windows[0][1], busy_windows[-1][0], interviewers)
+    # Gaps and mask are both sorted, so the mask pointer only ever moves forward
+    mask_index = 0
     # Keep track of first busy window
     prev = busy_windows[0]
     # Loop over busy_windows starting at 2nd window, creating available windows
@@ -114,24 +217,104 @@ def build_available_windows(busy_windows, interviewers, valid_interval):
             continue
         
         # prev_end -> slot_start = available window
-        # Trim the available window down to slots in workday (can be multiple if window spans multiple days)
-        valid_slots = trim_slot_to_available_workdays(prev_end, current_slot_start, interviewers)
+        # Skip mask ranges that end before this window
+        while mask_index < len(workday_mask) and workday_mask[mask_index][1] <= prev_end:
+            mask_index += 1
         
-        # Loop over valid slots, adding available windows
-        if valid_slots:
-            for valid_slot in valid_slots:
-                # Round start values up to a valid interval multiple for later 
-                valid_slot_start = ceil_slot_to_interval(valid_slot[0], valid_interval)
-                valid_slot_end = valid_slot[1]
-                available_windows.append([valid_slot_start, valid_slot_end])
+        # Clip the available window to every workday range it overlaps (can be multiple if window spans multiple days)
+        i = mask_index
+        while i < len(workday_mask) and workday_mask[i][0] < current_slot_start:
+            valid_slot_start = max(prev_end, workday_mask[i][0])
+            valid_slot_end = min(current_slot_start, workday_mask[i][1])
+            # Round start values up to a valid interval multiple for later 
+            available_windows.append([ceil_slot_to_interval(valid_slot_start, valid_interval), valid_slot_end])
+            i += 1
         prev = current_slot
                 
     return available_windows
 
+def build_workday_mask(search_start:datetime, search_end:datetime, interviewers:List[Interviewer]):
+    '''
+    Build the UTC ranges where every interviewer is inside their weekly working hours, clipped to the search window
+    Computed once per request, each interviewers local days are walked once so DST is handled per day
+    Returns sorted non overlapping [start, end] ranges
+    '''
+    mask = [[search_start, search_end]]
+    
+    for interviewer in interviewers:
+        mask = intersect_windows(mask, build_interviewer_working_windows(search_start, search_end, interviewer))
+        # Nobody overlaps, no need to look at the rest of the panel
+        if not mask:
+            break
+        
+    return mask
+
+def build_interviewer_working_windows(search_start:datetime, search_end:datetime, interviewer:Interviewer):
+    '''
+    Build an interviewers UTC working ranges covering the search window from their weekly schedule
+    Starts a day early so overnight ranges from the previous local day are included
+    '''
+    interviewer_tz = ZoneInfo(interviewer.timezone)
+    ranges_by_weekday = [[] for _ in range(7)]
+    for weekday, start_minute, end_minute in get_weekly_schedule(interviewer):
+        ranges_by_weekday[weekday].append((start_minute, end_minute))
+    
+    local_day = search_start.astimezone(interviewer_tz).date() - timedelta(days=1)
+    last_day = search_end.astimezone(interviewer_tz).date()
+    windows = []
+    
+    while local_day <= last_day:
+        # Midnight wall time, adding timedeltas to an aware datetime keeps wall time so DST days work out
+        local_midnight = datetime(local_day.year, local_day.month, local_day.day, tzinfo=interviewer_tz)
+        for start_minute, end_minute in ranges_by_weekday[local_day.weekday()]:
+            workday_start = local_midnight + timedelta(minutes=start_minute)
+            workday_end = local_midnight + timedelta(minutes=end_minute)
+            # Overnight shift case
+            if workday_start >= workday_end:
+                workday_end += timedelta(days=1)
+            windows.append([workday_start.astimezone(timezone.utc), workday_end.astimezone(timezone.utc)])
+        local_day += timedelta(days=1)
+    
+    # Overnight and split ranges can overlap each other
+    windows.sort(key = lambda x: x[0])
+    return build_busy_windows(windows)
+
+def intersect_windows(windows_a, windows_b):
+    '''
+    Intersect two sorted non overlapping window lists with a two pointer walk O(n + m)
+    '''
+    intersection = []
+    i = j = 0
+    
+    while i < len(windows_a) and j < len(windows_b):
+        start = max(windows_a[i][0], windows_b[j][0])
+        end = min(windows_a[i][1], windows_b[j][1])
+        if start < end:
+            intersection.append([start, end])
+        # Move past whichever window ends first
+        if windows_a[i][1] < windows_b[j][1]:
+            i += 1
+        else:
+            j += 1
+            
+    return intersection
+
+def get_weekly_schedule(interviewer:Interviewer):
+    '''
+    Interviewers weekly (weekday, start_minute, end_minute) ranges
+    Falls back to the legacy workday hours on every day of the week when no schedule is set
+    '''
+    schedule = getattr(interviewer, "weekly_schedule", None)
+    if schedule:
+        return schedule
+    start_minute = interviewer.workday_start_hour * 60
+    end_minute = interviewer.workday_end_hour * 60
+    return tuple((weekday, start_minute, end_minute) for weekday in range(7))
+
 def trim_slot_to_available_workdays(slot_start:datetime, slot_end:datetime, interviewers:List[Interviewer]):
     '''
     Trims an available window to slot(s) within interviewers workdays
-    
+    Per window version of the workday mask, only uses the legacy workday hours
     '''
     # Initialize window_end to floor value for comparison later
     valid_workday_window = [0, datetime(1,1,1,tzinfo=timezone.utc)]
@@ -235,17 +418,14 @@ def ceil_slot_to_interval(date:datetime, valid_interval:int):
         x:30:22 -> x:00:00 (30)
         x:37:42 -> x:45:00 (15)
     '''
-    if (date.minute == date.second == date.microsecond == 0):
-        return date
-    
-    # find next valid interval, subtract date.min,s,ms from it then add that value to date to reach interval
+    # find next valid interval multiple past date.min,s,ms arithmetically, then add the difference to date to reach it
     trimmed_date = timedelta(minutes=date.minute, seconds=date.second, microseconds=date.microsecond)
-    i = valid_interval
-    while trimmed_date >= timedelta(minutes=i):
-        i+=valid_interval
-    next_valid_interval = timedelta(minutes=i)
-    dif = next_valid_interval - trimmed_date
-    date += dif
+    interval = timedelta(minutes=valid_interval)
+    # Already on an interval (the hour included), keep it
+    if trimmed_date % interval == timedelta(0):
+        return date
+    next_valid_interval = (trimmed_date // interval + 1) * interval
+    date += next_valid_interval - trimmed_date
     
     return date
 
@@ -1,21 +1,39 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from kombu.exceptions import OperationalError
 
-from services.mock_availability import get_free_busy_data
-from candidate_fyi_takehome_project.interviews.serlializers import InterviewAvailabilitySerializerIn
-from candidate_fyi_takehome_project.interviews.models import InterviewTemplate, Interviewer
-from candidate_fyi_takehome_project.interviews.utils import compute_available_slots
+from candidate_fyi_takehome_project.interviews.serlializers import BookingSerializerIn, HoldSerializerIn, InterviewAvailabilitySerializerIn
+from candidate_fyi_takehome_project.interviews.models import InterviewTemplate
+from candidate_fyi_takehome_project.interviews.cache import get_template_metadata
+from candidate_fyi_takehome_project.interviews.coalesce import availability_key, coalesce
+from candidate_fyi_takehome_project.interviews.providers import CalendarProviderError
+from candidate_fyi_takehome_project.interviews.ingest import from_epoch
+from candidate_fyi_takehome_project.interviews.bookings import SlotUnavailableError, book_slot, get_panel_slots, hold_slot
+from candidate_fyi_takehome_project.interviews.jobs import JobStoreUnavailableError, get_availability_job, start_availability_job
+from candidate_fyi_takehome_project.interviews.renderers import MessagePackRenderer
 
 
+# Read only endpoint, skip the ATOMIC_REQUESTS transaction so a warm request never touches the DB
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class InterviewAvailabilityView(APIView):
     """
     -search_start (Optional) - datetime start of search window (default now + 24h)
     -search_end (Optional) - datetime end of search window (default now + 7d)
-    -valid_interval_end (Optional) - integer (60, 30, 15, 10, 5, 1)
+    -valid_interval_end (Optional) - integer minutes 1 - 1440
      determines what ending time interval the interview can be created (default 30)
         ex: 15 = xx:00, xx:15, xx:30, xx:45
+    -interval_timezone (Optional) - timezone whose local hours the intervals line up with (default UTC)
+        ex: 60 with Asia/Kolkata = xx:30 UTC
+    JSON by default, Accept: application/msgpack for MessagePack with epoch timestamps (see MessagePackRenderer)
     """
+    # JSON stays first, clients that don't ask for MessagePack get exactly what they got before
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+
     def get(self, request, id):
         
         serializer = InterviewAvailabilitySerializerIn(data=request.query_params)
@@ -27,33 +45,182 @@ class InterviewAvailabilityView(APIView):
         search_start = validated_data.get("search_start")
         search_end = validated_data.get("search_end")
         valid_interval = validated_data.get("valid_interval")
+        interval_timezone = validated_data.get("interval_timezone")
         
         try:
-            template = InterviewTemplate.objects.get(id=id)
+            template = get_template_metadata(id)
         except InterviewTemplate.DoesNotExist:
             return Response({"error": "Interview Template not found"}, status.HTTP_404_NOT_FOUND)
         
-        interviewers = template.interviewers.all()
-        interviewer_ids = [p.id for p in interviewers]
-        busy_data = get_free_busy_data(interviewer_ids)
-        
-        # Combine interviewer busy blocks into a single list
-        all_busy_blocks = []
-        for interviewer_data in busy_data:
-            all_busy_blocks.extend(interviewer_data["busy"])
-
-        available_interview_slots = compute_available_slots(search_start, search_end, valid_interval, all_busy_blocks, interviewers, template.duration)
+        try:
+            # Booked interviews and holds are subtracted alongside the providers busy blocks
+            # Identical concurrent requests (a shared scheduling link) share one computation and provider call
+            key = availability_key(template, search_start, search_end, valid_interval, interval_timezone)
+            panel = coalesce(key, lambda: get_panel_slots(
+                template, search_start, search_end, valid_interval, interval_timezone,
+            ))
+        except CalendarProviderError:
+            return Response({"error": "Calendar provider unavailable"}, status.HTTP_503_SERVICE_UNAVAILABLE)
         
         payload = {
             "interviewId": template.id,
             "name": template.name,
             "duration": template.duration,
-            "interviewers": [
-                {"id": i["interviewerId"], "name": i["name"]} for i in busy_data
-            ],
-            "availableSlots": [
-                {"start": slot[0], "end": slot[1]} for slot in available_interview_slots
-            ]
+            "interviewers": panel.interviewers,
+            # SlotList, encoded straight from its epoch array by the renderer
+            "availableSlots": panel.slots,
+            # Some calendar was served from a cached copy while the provider is slow or down, a refresh is under way
+            "stale": panel.stale,
+        }
+
+        return Response(payload, status=status.HTTP_200_OK)
+
+
+# Only queues the job, no transaction needed
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class AvailabilityJobView(APIView):
+    """
+    Same parameters as the availability endpoint, for searches too long to answer within a request (e.g. 90 days)
+    Queues the computation on a Celery worker and returns its jobId straight away, poll the statusUrl for the result
+    An identical search still running returns that jobs id instead of queueing another
+    """
+    def post(self, request, id):
+
+        serializer = InterviewAvailabilitySerializerIn(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+
+        try:
+            template = get_template_metadata(id)
+        except InterviewTemplate.DoesNotExist:
+            return Response({"error": "Interview Template not found"}, status.HTTP_404_NOT_FOUND)
+
+        try:
+            job_id = start_availability_job(
+                template, validated_data["search_start"], validated_data["search_end"],
+                validated_data["valid_interval"], validated_data["interval_timezone"],
+            )
+        except (OperationalError, JobStoreUnavailableError):
+            return Response({"error": "Job queue unavailable"}, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        payload = {
+            "jobId": job_id,
+            "statusUrl": reverse("interviews:availability_job", kwargs={"job_id": job_id}),
         }
 
+        return Response(payload, status=status.HTTP_202_ACCEPTED)
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class AvailabilityJobStatusView(APIView):
+    """
+    -status - pending, running, done or failed
+    Once done the response also carries the availability payload, the same shape the availability endpoint returns
+    """
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+
+    def get(self, request, job_id):
+
+        job = get_availability_job(job_id)
+        if job is None:
+            return Response({"error": "Job not found"}, status.HTTP_404_NOT_FOUND)
+
+        job_status, result = job
+        payload = {"jobId": job_id, "status": job_status}
+        if result is not None:
+            payload.update(result)
+        if job_status == "failed":
+            payload["error"] = "Availability computation failed"
+
         return Response(payload, status=status.HTTP_200_OK)
+
+
+# Manages its own transaction so the provider call never holds one open
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class BookingView(APIView):
+    """
+    -start - datetime start of the slot to book, at least 24h in the future
+    -candidate_email - email of the candidate being booked
+    -hold_id (Optional) - confirm a hold from the holds endpoint instead of passing start
+    -valid_interval (Optional) - integer minutes 1 - 1440, the interval the slot was listed with (default 30)
+    -interval_timezone (Optional) - timezone the slot was listed with (default UTC)
+    The slot is checked against fresh availability, 409 when it is no longer free
+    """
+    def post(self, request, id):
+
+        serializer = BookingSerializerIn(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+
+        try:
+            template = get_template_metadata(id)
+        except InterviewTemplate.DoesNotExist:
+            return Response({"error": "Interview Template not found"}, status.HTTP_404_NOT_FOUND)
+
+        try:
+            booking = book_slot(
+                template, validated_data.get("start"), validated_data["candidate_email"],
+                validated_data["valid_interval"], validated_data["interval_timezone"],
+                hold_id=validated_data.get("hold_id"),
+            )
+        except CalendarProviderError:
+            return Response({"error": "Calendar provider unavailable"}, status.HTTP_503_SERVICE_UNAVAILABLE)
+        except SlotUnavailableError:
+            return Response({"error": "Slot is not available"}, status.HTTP_409_CONFLICT)
+
+        payload = {
+            "bookingId": booking.id,
+            "interviewId": template.id,
+            "start": booking.start,
+            "end": booking.end,
+            "interviewers": [p.id for p in template.interviewers],
+        }
+
+        return Response(payload, status=status.HTTP_201_CREATED)
+
+
+# Holds live in the cache only, no transaction needed
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class HoldView(APIView):
+    """
+    -start - datetime start of the slot to hold, at least 24h in the future
+    -valid_interval (Optional) - integer minutes 1 - 1440, the interval the slot was listed with (default 30)
+    -interval_timezone (Optional) - timezone the slot was listed with (default UTC)
+    The slot leaves every other listing until the hold expires, confirm it with hold_id on the bookings endpoint
+    """
+    def post(self, request, id):
+
+        serializer = HoldSerializerIn(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+
+        try:
+            template = get_template_metadata(id)
+        except InterviewTemplate.DoesNotExist:
+            return Response({"error": "Interview Template not found"}, status.HTTP_404_NOT_FOUND)
+
+        try:
+            hold = hold_slot(template, validated_data["start"], validated_data["valid_interval"], validated_data["interval_timezone"])
+        except CalendarProviderError:
+            return Response({"error": "Calendar provider unavailable"}, status.HTTP_503_SERVICE_UNAVAILABLE)
+        except SlotUnavailableError:
+            return Response({"error": "Slot is not available"}, status.HTTP_409_CONFLICT)
+
+        payload = {
+            "holdId": hold.id,
+            "interviewId": template.id,
+            "start": from_epoch(hold.start),
+            "end": from_epoch(hold.end),
+            "expiresAt": from_epoch(int(hold.expires_at)),
+        }
+
+        return Response(payload, status=status.HTTP_201_CREATED)
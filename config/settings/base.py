@@ -350,3 +350,31 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Interviews calendar provider - "mock" generates calendars in process, "http" calls INTERVIEWS_CALENDAR_API_URL
+# (start the local stand-in with: python -m services.calendar_server)
+INTERVIEWS_CALENDAR_PROVIDER = env("INTERVIEWS_CALENDAR_PROVIDER", default="mock")
+INTERVIEWS_CALENDAR_API_URL = env("INTERVIEWS_CALENDAR_API_URL", default="http://localhost:8765")
+# Seconds before a provider request is abandoned
+INTERVIEWS_CALENDAR_TIMEOUT = env.float("INTERVIEWS_CALENDAR_TIMEOUT", default=5.0)
+# Seconds a cached http provider calendar is served as fresh, after that it is served with "stale" and refreshed
+# in the background until INTERVIEWS_CALENDAR_HARD_TTL, 0 calls the provider on every request
+INTERVIEWS_CALENDAR_SOFT_TTL = env.int("INTERVIEWS_CALENDAR_SOFT_TTL", default=30)
+INTERVIEWS_CALENDAR_HARD_TTL = env.int("INTERVIEWS_CALENDAR_HARD_TTL", default=600)
+# Failed provider calls in a row that open the circuit, and seconds it stays open before a trial call
+INTERVIEWS_CALENDAR_BREAKER_FAILURES = env.int("INTERVIEWS_CALENDAR_BREAKER_FAILURES", default=5)
+INTERVIEWS_CALENDAR_BREAKER_RESET = env.float("INTERVIEWS_CALENDAR_BREAKER_RESET", default=30.0)
+# Share of http provider calls that may get a second, hedged request once they run past the observed p95 latency,
+# the first answer wins and the other request is cancelled, 0 turns hedging off
+INTERVIEWS_CALENDAR_HEDGE_RATE = env.float("INTERVIEWS_CALENDAR_HEDGE_RATE", default=0.05)
+# Milliseconds concurrent http provider calls wait to be merged into one upstream request, 0 turns batching off
+INTERVIEWS_CALENDAR_BATCH_MS = env.float("INTERVIEWS_CALENDAR_BATCH_MS", default=3.0)
+# Where availability reads busy blocks - "provider" calls it per request, "store" reads the BusyBlock rows kept
+# up to date by the sync_calendars Celery task, "index" keeps those rows in a per process interval index updated
+# by each sync, "sql" merges those rows into free windows inside PostgreSQL
+INTERVIEWS_BUSY_SOURCE = env("INTERVIEWS_BUSY_SOURCE", default="provider")
+# Calendar syncs running at once across the workers
+INTERVIEWS_SYNC_CONCURRENCY = env.int("INTERVIEWS_SYNC_CONCURRENCY", default=8)
+# Seconds an availability result is shared with identical requests from any process, 0 only coalesces in flight
+INTERVIEWS_COALESCE_TTL = env.int("INTERVIEWS_COALESCE_TTL", default=2)
+# Seconds a held slot stays out of other candidates listings before it must be confirmed
+INTERVIEWS_HOLD_TTL = env.int("INTERVIEWS_HOLD_TTL", default=300)
@@ -0,0 +1,110 @@
+"""
+Compact columnar busy blocks - parallel array('q') of UTC epoch second starts and ends
+Skips JSON decoding, a dict per block and timestamp string parsing, and doubles as the binary cache / wire format
+"""
+import struct
+import sys
+from array import array
+
+# Binary free/busy response content type served by services/calendar_server.py
+CONTENT_TYPE = "application/vnd.busy-columns"
+
+_COUNT = struct.Struct("<I")
+_RECORD_HEADER = struct.Struct("<qH")  # interviewer id, name length
+
+
+class BusyColumns:
+    """
+    Busy blocks of one or more interviewers, starts[i] -> ends[i]
+    """
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts=(), ends=()):
+        self.starts = starts if isinstance(starts, array) else array("q", starts)
+        self.ends = ends if isinstance(ends, array) else array("q", ends)
+        if len(self.starts) != len(self.ends):
+            raise ValueError("starts and ends must be the same length")
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __eq__(self, other):
+        return isinstance(other, BusyColumns) and self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return f"BusyColumns({len(self)} blocks)"
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        return cls([start for start, _ in pairs], [end for _, end in pairs])
+
+    @classmethod
+    def concat(cls, columns):
+        combined = cls()
+        for column in columns:
+            combined.starts.extend(column.starts)
+            combined.ends.extend(column.ends)
+        return combined
+
+    def to_bytes(self) -> bytes:
+        """
+        count (uint32) + starts + ends, little endian int64
+        """
+        starts, ends = self.starts, self.ends
+        if sys.byteorder == "big":
+            starts, ends = array("q", starts), array("q", ends)
+            starts.byteswap()
+            ends.byteswap()
+        return _COUNT.pack(len(starts)) + starts.tobytes() + ends.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, offset: int = 0):
+        columns, _ = cls.read(memoryview(data), offset)
+        return columns
+
+    @classmethod
+    def read(cls, view: memoryview, offset: int):
+        """
+        Read one encoded column set, returns (columns, offset after it)
+        """
+        (count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        size = count * 8
+        starts, ends = array("q"), array("q")
+        starts.frombytes(view[offset:offset + size])
+        ends.frombytes(view[offset + size:offset + 2 * size])
+        if sys.byteorder == "big":
+            starts.byteswap()
+            ends.byteswap()
+        return cls(starts, ends), offset + 2 * size
+
+
+def encode_free_busy(data: list[dict]) -> bytes:
+    """
+    Binary free/busy response: per interviewer id, name and BusyColumns
+    """
+    parts = [_COUNT.pack(len(data))]
+    for interviewer in data:
+        name = interviewer["name"].encode()
+        parts.append(_RECORD_HEADER.pack(interviewer["interviewerId"], len(name)))
+        parts.append(name)
+        parts.append(interviewer["busy"].to_bytes())
+    return b"".join(parts)
+
+
+def decode_free_busy(payload: bytes) -> list[dict]:
+    view = memoryview(payload)
+    (count,) = _COUNT.unpack_from(view, 0)
+    offset = _COUNT.size
+    data = []
+    for _ in range(count):
+        interviewer_id, name_length = _RECORD_HEADER.unpack_from(view, offset)
+        offset += _RECORD_HEADER.size
+        name = bytes(view[offset:offset + name_length]).decode()
+        offset += name_length
+        busy, offset = BusyColumns.read(view, offset)
+        data.append({"interviewerId": interviewer_id, "name": name, "busy": busy})
+    return data
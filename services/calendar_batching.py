@@ -0,0 +1,90 @@
+"""
+DataLoader style micro-batching for free/busy fetches
+
+Calls arriving within window seconds of each other are merged into one upstream request for the union of their
+interviewer ids (each id once), and every caller gets back just the records it asked for
+"""
+import threading
+
+from services.calendar_client import CalendarProviderError
+
+
+class Batch:
+    __slots__ = ("timezones", "windows", "done", "full", "records", "error")
+
+    def __init__(self):
+        self.timezones = {}  # interviewer id -> timezone, insertion ordered so the upstream call is deterministic
+        self.windows = []
+        self.done = threading.Event()
+        self.full = threading.Event()
+        self.records = None
+        self.error = None
+
+
+class FreeBusyBatcher:
+    """
+    fetch(interviewer_ids, timezones, search_window) -> [{"interviewerId", ...}], called once per batch
+    search_window is the span covering every callers window, None when any caller wants everything
+    window - seconds the first caller waits for others to join, max_batch - ids that dispatch a batch early
+    """
+    def __init__(self, fetch, window: float = 0.003, max_batch: int = 200):
+        self.fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self.lock = threading.Lock()
+        self.pending = None
+        self.upstream_calls = 0
+
+    def load(self, interviewer_ids, timezones: dict | None = None, search_window=None) -> list[dict]:
+        """
+        Records for interviewer_ids in the same order, raises whatever fetch raised for the batch
+        """
+        timezones = timezones or {}
+        with self.lock:
+            batch = self.pending
+            leader = batch is None
+            if leader:
+                batch = self.pending = Batch()
+            for interviewer_id in interviewer_ids:
+                batch.timezones.setdefault(interviewer_id, timezones.get(interviewer_id))
+            batch.windows.append(search_window)
+            if len(batch.timezones) >= self.max_batch:
+                # Closed now, later callers start a new batch
+                self.pending = None
+                batch.full.set()
+
+        if leader:
+            self.dispatch(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        try:
+            return [batch.records[interviewer_id] for interviewer_id in interviewer_ids]
+        except KeyError as e:
+            raise CalendarProviderError(f"Calendar provider response is missing interviewer {e}") from None
+
+    def dispatch(self, batch: Batch):
+        batch.full.wait(self.window)
+        with self.lock:
+            if self.pending is batch:
+                self.pending = None
+        try:
+            self.upstream_calls += 1
+            timezones = {k: v for k, v in batch.timezones.items() if v is not None}
+            records = self.fetch(list(batch.timezones), timezones, covering_window(batch.windows))
+            batch.records = {record["interviewerId"]: record for record in records}
+        except Exception as e:
+            batch.error = e
+        finally:
+            batch.done.set()
+
+
+def covering_window(windows):
+    """
+    (earliest start, latest end) of the windows, None when any is None
+    """
+    if not windows or any(window is None for window in windows):
+        return None
+    return min(start for start, _ in windows), max(end for _, end in windows)
@@ -0,0 +1,139 @@
+"""
+Incremental sync for the mock calendars, shaped like provider sync APIs (Google events.list syncToken, Graph delta)
+
+First call without a token -> every event plus nextSyncToken
+Later calls with the token -> only events changed since, cancelled ones flagged, plus a new token
+Tokens that fell out of the retained history raise SyncTokenExpired, the client then does a full sync again
+"""
+import random
+import threading
+from datetime import date, datetime, timezone
+
+from services.mock_availability import DEFAULT_CONFIG, MockCalendarConfig, generate_busy_epochs, get_name_pool, NAME_POOL_SIZE
+
+
+class SyncTokenExpired(Exception):
+    """
+    The sync token is unknown or older than the retained history
+    """
+
+
+class MockCalendar:
+    """
+    One interviewers events and change history
+    log - (sequence, event id) for every change, the current events dict says what the change left behind
+    """
+    __slots__ = ("events", "log", "sequence", "next_event")
+
+    def __init__(self, blocks):
+        self.events = {f"evt-{n}": block for n, block in enumerate(blocks)}
+        self.log = []
+        self.sequence = 0
+        self.next_event = len(blocks)
+
+
+class CalendarChangeLog:
+    """
+    Mock calendars that change over time and answer incremental sync requests
+    churn - random edits (half new events, half cancellations) applied to a calendar before each sync read
+    max_log - changes kept per calendar, older tokens expire
+    """
+    def __init__(self, config: MockCalendarConfig = DEFAULT_CONFIG, churn: int = 0, max_log: int = 10_000,
+                 start_date: date | None = None, seed: int = 0):
+        self.config = config
+        self.churn = churn
+        self.max_log = max_log
+        self.start_date = start_date
+        self.rng = random.Random(seed)
+        self.calendars = {}
+        self.lock = threading.Lock()
+
+    def get_calendar(self, interviewer_id: int, tz_name: str = "UTC"):
+        calendar = self.calendars.get(interviewer_id)
+        if calendar is None:
+            start_date = self.start_date or datetime.now(timezone.utc).date()
+            calendar = self.calendars[interviewer_id] = MockCalendar(
+                generate_busy_epochs(interviewer_id, start_date, self.config, tz_name)
+            )
+        return calendar
+
+    def add_event(self, interviewer_id: int, start: int, end: int, tz_name: str = "UTC"):
+        with self.lock:
+            calendar = self.get_calendar(interviewer_id, tz_name)
+            event_id = f"evt-{calendar.next_event}"
+            calendar.next_event += 1
+            calendar.events[event_id] = (start, end)
+            self.record(calendar, event_id)
+        return event_id
+
+    def cancel_event(self, interviewer_id: int, event_id: str):
+        with self.lock:
+            calendar = self.get_calendar(interviewer_id)
+            del calendar.events[event_id]
+            self.record(calendar, event_id)
+
+    def record(self, calendar: MockCalendar, event_id: str):
+        calendar.sequence += 1
+        calendar.log.append((calendar.sequence, event_id))
+        if len(calendar.log) > self.max_log:
+            del calendar.log[:len(calendar.log) - self.max_log]
+
+    def apply_churn(self, interviewer_id: int, calendar: MockCalendar):
+        rng = self.rng
+        slot = self.config.slot_minutes * 60
+        start_date = self.start_date or datetime.now(timezone.utc).date()
+        first = int(datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc).timestamp())
+        slots = self.config.horizon_days * 86400 // slot
+        for _ in range(self.churn):
+            if calendar.events and rng.random() < 0.5:
+                event_id = rng.choice(list(calendar.events))
+                del calendar.events[event_id]
+            else:
+                start = first + rng.randrange(slots) * slot
+                event_id = f"evt-{calendar.next_event}"
+                calendar.next_event += 1
+                calendar.events[event_id] = (start, start + rng.choice((30, 60)) * 60)
+            self.record(calendar, event_id)
+
+    def changes(self, interviewer_id: int, tz_name: str = "UTC", sync_token: str | None = None) -> dict:
+        """
+        {"interviewerId", "name", "events": [{"id", "start", "end", "cancelled"}], "nextSyncToken"}
+        start / end are UTC epoch seconds, cancelled events only carry their id
+        """
+        with self.lock:
+            calendar = self.get_calendar(interviewer_id, tz_name)
+            if sync_token is None:
+                self.apply_churn(interviewer_id, calendar)
+                changed = calendar.events.keys()
+            else:
+                try:
+                    since = int(sync_token)
+                except ValueError:
+                    raise SyncTokenExpired(sync_token) from None
+                oldest = calendar.log[0][0] - 1 if calendar.log else calendar.sequence
+                if not oldest <= since <= calendar.sequence:
+                    raise SyncTokenExpired(sync_token)
+                self.apply_churn(interviewer_id, calendar)
+                # Log is in sequence order, walk back to the first change after the token
+                changed = {}
+                for sequence, event_id in reversed(calendar.log):
+                    if sequence <= since:
+                        break
+                    changed[event_id] = None
+            events = []
+            for event_id in changed:
+                block = calendar.events.get(event_id)
+                if block is None:
+                    events.append({"id": event_id, "cancelled": True})
+                else:
+                    events.append({"id": event_id, "start": block[0], "end": block[1], "cancelled": False})
+            return {
+                "interviewerId": interviewer_id,
+                "name": get_name_pool()[interviewer_id % NAME_POOL_SIZE],
+                "events": events,
+                "nextSyncToken": str(calendar.sequence),
+            }
+
+
+# In process calendars used by the "mock" provider
+DEFAULT_CHANGE_LOG = CalendarChangeLog()
@@ -0,0 +1,189 @@
+"""
+HTTP client for a calendar free/busy API (the services/calendar_server.py stand-in speaks the same protocol)
+"""
+import http.client
+import json
+import socket
+import struct
+import threading
+from urllib.parse import urlsplit
+
+from services import busy_columns
+from services.json_stream import parse_free_busy_stream
+
+# Read size when stream parsing a JSON response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class CalendarProviderError(Exception):
+    """
+    The calendar provider failed, timed out or returned something unusable
+    """
+
+
+class CircuitOpenError(CalendarProviderError):
+    """
+    Recent calls kept failing, the provider is not called until the circuit breaker lets a trial through
+    """
+
+
+class SyncTokenExpiredError(CalendarProviderError):
+    """
+    The provider no longer knows the sync token, a full sync is needed
+    """
+
+
+class Cancellation:
+    """
+    Lets another thread abort a fetch_free_busy call while it waits on the network, e.g. the losing hedged request
+    The call then raises CalendarProviderError and its connection is dropped
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cancelled = False
+        self.conn = None
+
+    def bind(self, conn):
+        with self.lock:
+            self.conn = conn
+            if self.cancelled:
+                shutdown_connection(conn)
+
+    def release(self) -> bool:
+        """
+        Unbind once the call is over, True when it was cancelled and the connection may have been shut down
+        """
+        with self.lock:
+            self.conn = None
+            return self.cancelled
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            if self.conn is not None:
+                shutdown_connection(self.conn)
+
+
+def shutdown_connection(conn):
+    # Unblocks a read in another thread, closing alone would leave it waiting
+    if conn.sock is not None:
+        try:
+            conn.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+# One keep-alive connection per thread per host
+_connections = threading.local()
+
+
+def get_connection(base_url: str, timeout: float):
+    pool = getattr(_connections, "pool", None)
+    if pool is None:
+        pool = _connections.pool = {}
+    conn = pool.get(base_url)
+    if conn is None:
+        parts = urlsplit(base_url)
+        conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = pool[base_url] = conn_class(parts.hostname, parts.port, timeout=timeout)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def drop_connection(base_url: str):
+    conn = getattr(_connections, "pool", {}).pop(base_url, None)
+    if conn is not None:
+        conn.close()
+
+
+def post(base_url: str, path: str, body: str, headers: dict, timeout: float, cancellation: Cancellation | None = None):
+    """
+    POST on this threads keep-alive connection and return the response once its status line is in
+    A reused connection the server closed while it sat idle fails before any response bytes arrive,
+     the request is then sent once more on a fresh connection, both endpoints are reads so a resend is safe
+    """
+    conn = get_connection(base_url, timeout)
+    reused = conn.sock is not None
+    try:
+        conn.request("POST", path, body=body, headers=headers)
+        if cancellation is not None:
+            cancellation.bind(conn)
+        return conn.getresponse()
+    except (BrokenPipeError, ConnectionResetError):
+        # RemoteDisconnected is a ConnectionResetError, a cancelled call shuts its socket down and must not resend
+        if not reused or (cancellation is not None and cancellation.cancelled):
+            raise
+        drop_connection(base_url)
+    conn = get_connection(base_url, timeout)
+    conn.request("POST", path, body=body, headers=headers)
+    if cancellation is not None:
+        cancellation.bind(conn)
+    return conn.getresponse()
+
+
+def fetch_free_busy(base_url: str, interviewer_ids: list[int], timezones: dict | None = None, timeout: float = 5.0,
+                    columnar: bool = False, busy_filter=None, cancellation: Cancellation | None = None) -> list[dict]:
+    """
+    POST /freebusy and return the per interviewer busy lists
+    columnar - ask for the binary format, "busy" is then a BusyColumns
+    busy_filter - (start, end) -> epoch (start, end) or None, a JSON response is then parsed as it streams in
+     and "busy" is a BusyColumns of the kept blocks, so providers without the binary format still give columns
+    cancellation - cancel() from another thread aborts the call
+    Raises CalendarProviderError on connection errors, timeouts, non 200 responses and bad payloads
+    """
+    body = json.dumps({
+        "interviewerIds": list(interviewer_ids),
+        "timezones": {str(k): v for k, v in (timezones or {}).items()},
+    })
+    try:
+        headers = {"Content-Type": "application/json"}
+        if columnar:
+            headers["Accept"] = busy_columns.CONTENT_TYPE
+        response = post(base_url, "/freebusy", body, headers, timeout, cancellation)
+        if response.status != 200:
+            response.read()
+            raise CalendarProviderError(f"Calendar provider returned {response.status}")
+        binary = response.getheader("Content-Type") == busy_columns.CONTENT_TYPE
+        if busy_filter is not None and not binary:
+            return parse_free_busy_stream(iter(lambda: response.read(STREAM_CHUNK_SIZE), b""), busy_filter)
+        payload = response.read()
+        if binary:
+            return busy_columns.decode_free_busy(payload)
+        return json.loads(payload)
+    except (OSError, http.client.HTTPException) as e:
+        # Timed out or broken connection, never reuse it
+        drop_connection(base_url)
+        raise CalendarProviderError(f"Calendar provider request failed: {e!r}") from e
+    except (ValueError, KeyError, TypeError, struct.error) as e:
+        # The rest of a bad response may still be unread, never reuse the connection
+        drop_connection(base_url)
+        raise CalendarProviderError("Calendar provider returned an invalid payload") from e
+    finally:
+        if cancellation is not None and cancellation.release():
+            # Cancelled after the response was read, the socket may be shut down, never reuse it
+            drop_connection(base_url)
+
+
+def fetch_busy_changes(base_url: str, interviewer_id: int, timezone: str | None = None, sync_token: str | None = None,
+                       timeout: float = 5.0) -> dict:
+    """
+    POST /sync, events changed since sync_token (every event without one) plus the next token
+    Raises SyncTokenExpiredError on 410, CalendarProviderError like fetch_free_busy otherwise
+    """
+    body = json.dumps({"interviewerId": interviewer_id, "timezone": timezone, "syncToken": sync_token})
+    try:
+        response = post(base_url, "/sync", body, {"Content-Type": "application/json"}, timeout)
+        payload = response.read()
+        if response.status == 410:
+            raise SyncTokenExpiredError("Sync token expired")
+        if response.status != 200:
+            raise CalendarProviderError(f"Calendar provider returned {response.status}")
+        return json.loads(payload)
+    except (OSError, http.client.HTTPException) as e:
+        drop_connection(base_url)
+        raise CalendarProviderError(f"Calendar provider request failed: {e!r}") from e
+    except ValueError as e:
+        drop_connection(base_url)
+        raise CalendarProviderError("Calendar provider returned an invalid payload") from e
@@ -0,0 +1,189 @@
+"""
+Local stand-in calendar free/busy service, serves the mock calendars over HTTP with injected latency and failures
+
+    python -m services.calendar_server --port 8765 --latency lognormal:80:2000 --error-rate 0.02 --density 0.3
+
+POST /freebusy {"interviewerIds": [1, 2], "timezones": {"1": "America/New_York"}}
+-> [{"interviewerId": 1, "name": "...", "busy": [{"start": "...Z", "end": "...Z"}]}, ...]
+Send Accept: application/vnd.busy-columns to get the binary columnar format instead (services/busy_columns.py)
+
+POST /sync {"interviewerId": 1, "timezone": "UTC", "syncToken": null}
+-> {"interviewerId": 1, "name": "...", "events": [{"id", "start", "end", "cancelled"}], "nextSyncToken": "..."}
+Incremental sync (services/calendar_changes.py), 410 when the token expired, --churn edits calendars between syncs
+"""
+import argparse
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services import busy_columns
+from services.calendar_changes import CalendarChangeLog, SyncTokenExpired
+from services.mock_availability import MockCalendarConfig
+from services.mock_availability import get_free_busy_data
+
+
+def parse_latency(spec: str):
+    """
+    Build a latency sampler (seconds) from a spec, values in milliseconds
+    fixed:80 | uniform:20:200 | lognormal:80:2000 (median, p99)
+    """
+    kind, *params = spec.split(":")
+    try:
+        values = [float(p) / 1000 for p in params]
+        if kind == "fixed" and len(values) == 1:
+            return lambda rng: values[0]
+        if kind == "uniform" and len(values) == 2:
+            return lambda rng: rng.uniform(values[0], values[1])
+        if kind == "lognormal" and len(values) == 2:
+            median, p99 = values
+            # 2.326 = z score of the 99th percentile
+            sigma = math.log(p99 / median) / 2.326
+            return lambda rng: median * math.exp(sigma * rng.gauss(0, 1))
+    except (ValueError, ZeroDivisionError):
+        pass
+    raise ValueError(f"Invalid latency spec {spec!r}, expected fixed:MS, uniform:MIN:MAX or lognormal:MEDIAN:P99")
+
+
+@dataclass
+class StandInConfig:
+    latency: str = "fixed:0"
+    error_rate: float = 0.0  # share of requests answered with a 503
+    hang_rate: float = 0.0  # share of requests that stall for hang_seconds before answering
+    hang_seconds: float = 30.0
+    columnar: bool = True  # serve the binary format to clients that ask for it, off to act like a JSON only API
+    churn: int = 0  # calendar edits applied before each /sync read
+    calendar: MockCalendarConfig = field(default_factory=MockCalendarConfig)
+    seed: int = 0
+
+
+class CalendarServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: StandInConfig, verbose=False):
+        super().__init__(address, FreeBusyHandler)
+        self.config = config
+        self.verbose = verbose
+        self.rng = random.Random(config.seed)
+        self.sample_latency = parse_latency(config.latency)
+        self.request_count = 0
+        self.changes = CalendarChangeLog(config.calendar, churn=config.churn, seed=config.seed)
+
+
+class FreeBusyHandler(BaseHTTPRequestHandler):
+    # Keep-alive so clients can reuse connections like they would against a real API
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path == "/sync":
+            self.handle_sync()
+            return
+        if self.path != "/freebusy":
+            self.send_json(404, {"error": "Not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            interviewer_ids = [int(i) for i in body["interviewerIds"]]
+            timezones = {int(k): v for k, v in body.get("timezones", {}).items()}
+        except (ValueError, KeyError, TypeError):
+            self.send_json(400, {"error": "Expected {\"interviewerIds\": [...]}"})
+            return
+
+        if not self.inject_faults():
+            return
+
+        config = self.server.config
+        if config.columnar and self.headers.get("Accept") == busy_columns.CONTENT_TYPE:
+            data = get_free_busy_data(interviewer_ids, config.calendar, timezones, columnar=True)
+            self.send_body(200, busy_columns.encode_free_busy(data), busy_columns.CONTENT_TYPE)
+            return
+        self.send_json(200, get_free_busy_data(interviewer_ids, config.calendar, timezones))
+
+    def handle_sync(self):
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            interviewer_id = int(body["interviewerId"])
+            tz_name = body.get("timezone") or "UTC"
+            sync_token = body.get("syncToken")
+        except (ValueError, KeyError, TypeError):
+            self.send_json(400, {"error": "Expected {\"interviewerId\": ...}"})
+            return
+
+        if not self.inject_faults():
+            return
+        try:
+            self.send_json(200, self.server.changes.changes(interviewer_id, tz_name, sync_token))
+        except SyncTokenExpired:
+            self.send_json(410, {"error": "Sync token expired, full sync required"})
+
+    def inject_faults(self):
+        """
+        Latency, injected failures and hangs, False when a failure was already sent
+        """
+        server = self.server
+        server.request_count += 1
+        config = server.config
+        time.sleep(max(0.0, server.sample_latency(server.rng)))
+        roll = server.rng.random()
+        if roll < config.error_rate:
+            self.send_json(503, {"error": "Injected failure"})
+            return False
+        if roll < config.error_rate + config.hang_rate:
+            time.sleep(config.hang_seconds)
+        return True
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload).encode(), "application/json")
+
+    def send_body(self, status, encoded, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:MS, uniform:MIN:MAX or lognormal:MEDIAN:P99")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--json-only", action="store_true", help="Ignore requests for the binary format")
+    parser.add_argument("--churn", type=int, default=0, help="Calendar edits applied before each /sync read")
+    parser.add_argument("--density", type=float, default=MockCalendarConfig.density)
+    parser.add_argument("--horizon-days", type=int, default=MockCalendarConfig.horizon_days)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        columnar=not args.json_only,
+        churn=args.churn,
+        calendar=MockCalendarConfig(density=args.density, horizon_days=args.horizon_days, seed=args.seed),
+        seed=args.seed,
+    )
+    server = CalendarServer((args.host, args.port), config, verbose=args.verbose)
+    print(f"Calendar stand-in listening on http://{args.host}:{server.server_port}")  # noqa: T201
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
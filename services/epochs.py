@@ -0,0 +1,20 @@
+"""
+Epoch second timestamp formatting shared by the mock provider and the API output
+"""
+import time
+
+# Blocks and slots sit on shared grids so the same timestamps repeat across interviewers and requests, memoize their strings
+_formatted_epochs = {}
+MAX_FORMATTED_EPOCHS = 1_000_000
+
+
+def format_epoch(ts: int) -> str:
+    """
+    ISO string for an epoch, same output as the DRF encoder gives for a UTC datetime
+    """
+    formatted = _formatted_epochs.get(ts)
+    if formatted is None:
+        if len(_formatted_epochs) >= MAX_FORMATTED_EPOCHS:
+            _formatted_epochs.clear()
+        formatted = _formatted_epochs[ts] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+    return formatted
@@ -0,0 +1,114 @@
+"""
+Hedged requests for upstream calls with a long latency tail
+
+A call still running after the observed quantile latency (p95 by default) gets a second identical request,
+whichever answers first wins and the other is cancelled. A token bucket caps hedges at max_ratio of calls,
+so a slow upstream sees at most that much extra load.
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import math
+import threading
+import time
+
+from services.calendar_client import Cancellation
+
+
+class LatencyTracker:
+    """
+    Latencies of the last size calls, quantile is None until min_samples are in
+    """
+    def __init__(self, size: int = 1000, min_samples: int = 20):
+        self.samples = deque(maxlen=size)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class HedgeBudget:
+    """
+    Every call earns ratio of a token, a hedge spends a whole one, so hedges never pass ratio of calls
+    burst - most tokens saved up while the upstream is fast
+    """
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = 0.0
+        self.lock = threading.Lock()
+
+    def earn(self):
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def spend(self) -> bool:
+        with self.lock:
+            # Tolerance for the float sum, ten 0.1s fall just short of 1
+            if self.tokens < 1 - 1e-9:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class Hedger:
+    """
+    call(fn) runs fn(cancellation) and hedges it with a second fn(cancellation) once it runs past the quantile latency
+    fn must abort with an exception once its Cancellation is cancelled (see calendar_client.fetch_free_busy)
+    max_ratio - hedges as a share of calls, quantile - latency the first request must outlive before a hedge
+    """
+    def __init__(self, max_ratio: float = 0.05, quantile: float = 0.95, max_workers: int = 64, tracker: LatencyTracker | None = None):
+        self.quantile = quantile
+        self.tracker = tracker or LatencyTracker()
+        self.budget = HedgeBudget(max_ratio)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedged-call")
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def call(self, fn):
+        """
+        Result of whichever request answers first, raises the error when every request failed
+        The first requests latency is recorded, when it lost it counts until then so the slow tail
+         still weighs on the quantile instead of vanishing from it
+        """
+        self.calls += 1
+        self.budget.earn()
+        started = time.monotonic()
+        primary = Cancellation()
+        primary_future = self.pool.submit(fn, primary)
+
+        delay = self.tracker.quantile(self.quantile)
+        if delay is not None:
+            wait([primary_future], timeout=delay)
+        if delay is None or primary_future.done() or not self.budget.spend():
+            result = primary_future.result()
+            self.tracker.record(time.monotonic() - started)
+            return result
+
+        self.hedges += 1
+        hedge = Cancellation()
+        hedge_future = self.pool.submit(fn, hedge)
+        cancellations = {primary_future: primary, hedge_future: hedge}
+        pending = set(cancellations)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        cancellations[other].cancel()
+                    if future is hedge_future:
+                        self.hedge_wins += 1
+                    self.tracker.record(time.monotonic() - started)
+                    return future.result()
+                error = future.exception()
+        raise error
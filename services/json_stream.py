@@ -0,0 +1,163 @@
+"""
+Incremental parser for JSON free/busy responses, busy blocks are handled one at a time as bytes arrive
+Peak memory is the current chunk plus the blocks kept, not the whole payload
+
+    [{"interviewerId": 1, "name": "...", "busy": [{"start": "...Z", "end": "...Z"}, ...]}, ...]
+"""
+import codecs
+import json
+import re
+
+from services.busy_columns import BusyColumns
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Fast path for the usual block shape (with any leading separator), anything else goes through the JSON decoder
+_BLOCK = re.compile(r'[ \t\n\r]*,?\s*\{\s*"start"\s*:\s*"([^"\\]*)"\s*,\s*"end"\s*:\s*"([^"\\]*)"\s*\}')
+
+# Parser states
+_TOP, _INTERVIEWERS, _KEY, _COLON, _VALUE, _BUSY_OPEN, _BUSY, _DONE = range(8)
+
+
+class FreeBusyStreamParser:
+    """
+    feed() raw response chunks, get back the interviewer records completed so far
+    "busy" is a BusyColumns of whatever busy_filter(start, end) returns, blocks it returns None for are dropped
+    busy_filter receives the raw start / end values and must return epoch seconds (start, end) or None
+    """
+
+    def __init__(self, busy_filter):
+        self.busy_filter = busy_filter
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.state = _TOP
+        self.record = None
+        self.key = None
+
+    def feed(self, chunk: bytes) -> list[dict]:
+        self.buffer += self.decoder.decode(chunk)
+        return self.parse(final=False)
+
+    def close(self) -> list[dict]:
+        self.buffer += self.decoder.decode(b"", final=True)
+        records = self.parse(final=True)
+        if self.state != _DONE or self.buffer.strip():
+            raise ValueError("Truncated or invalid free/busy payload")
+        return records
+
+    def parse(self, final: bool) -> list[dict]:
+        buffer = self.buffer
+        pos = 0
+        records = []
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            # Anything after the closing bracket is left in the buffer and rejected by close()
+            if pos == len(buffer) or self.state == _DONE:
+                break
+            char = buffer[pos]
+            state = self.state
+
+            if state == _BUSY:
+                if char == ",":
+                    pos += 1
+                    continue
+                if char == "]":
+                    self.state = _KEY
+                    pos += 1
+                    continue
+                busy = self.record["busy"]
+                busy_filter = self.busy_filter
+                # Tight loop over a run of plain blocks, the common case
+                match = _BLOCK.match(buffer, pos)
+                if match:
+                    while match:
+                        kept = busy_filter(*match.groups())
+                        if kept is not None:
+                            busy.starts.append(kept[0])
+                            busy.ends.append(kept[1])
+                        pos = match.end()
+                        match = _BLOCK.match(buffer, pos)
+                    continue
+                block, end_pos = self.decode_value(buffer, pos, final)
+                if end_pos is None:
+                    break
+                pos = end_pos
+                kept = busy_filter(block["start"], block["end"])
+                if kept is not None:
+                    busy.starts.append(kept[0])
+                    busy.ends.append(kept[1])
+
+            elif state == _VALUE:
+                if self.key == "busy":
+                    self.record["busy"] = BusyColumns()
+                    self.state = _BUSY_OPEN
+                    continue
+                value, end_pos = self.decode_value(buffer, pos, final)
+                if end_pos is None:
+                    break
+                self.record[self.key] = value
+                self.state = _KEY
+                pos = end_pos
+
+            elif state == _KEY:
+                if char == ",":
+                    pos += 1
+                elif char == "}":
+                    self.record.setdefault("busy", BusyColumns())
+                    records.append(self.record)
+                    self.record = None
+                    self.state = _INTERVIEWERS
+                    pos += 1
+                else:
+                    key, end_pos = self.decode_value(buffer, pos, final)
+                    if end_pos is None:
+                        break
+                    if not isinstance(key, str):
+                        raise ValueError(f"Expected an object key at offset {pos}")
+                    self.key = key
+                    self.state = _COLON
+                    pos = end_pos
+
+            else:
+                expected = {_TOP: "[", _INTERVIEWERS: "{,]", _COLON: ":", _BUSY_OPEN: "["}[state]
+                if char not in expected:
+                    raise ValueError(f"Unexpected {char!r} in free/busy payload")
+                pos += 1
+                if state == _TOP:
+                    self.state = _INTERVIEWERS
+                elif state == _INTERVIEWERS and char == "{":
+                    self.record = {}
+                    self.state = _KEY
+                elif state == _INTERVIEWERS and char == "]":
+                    self.state = _DONE
+                elif state == _COLON:
+                    self.state = _VALUE
+                elif state == _BUSY_OPEN:
+                    self.state = _BUSY
+
+        self.buffer = buffer[pos:]
+        return records
+
+    def decode_value(self, buffer, pos, final):
+        """
+        Decode one JSON value at pos, returns (value, end) or (None, None) when it may not have fully arrived yet
+        A value is only trusted once something follows it, so a number split across chunks is never cut short
+        """
+        try:
+            value, end = self.json.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, None
+        if end == len(buffer) and not final:
+            return None, None
+        return value, end
+
+
+def parse_free_busy_stream(chunks, busy_filter) -> list[dict]:
+    parser = FreeBusyStreamParser(busy_filter)
+    records = []
+    for chunk in chunks:
+        records.extend(parser.feed(chunk))
+    records.extend(parser.close())
+    return records
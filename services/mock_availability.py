@@ -1,46 +1,127 @@
 import random
-from datetime import datetime, timedelta, time
+from bisect import bisect
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate
+from zoneinfo import ZoneInfo
+
 from faker import Faker
 
-fake = Faker()
-Faker.seed(0)
+from services.busy_columns import BusyColumns
+from services.epochs import format_epoch
+
+NAME_POOL_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class MockCalendarConfig:
+    """
+    Shape of the generated calendars
+    density - share of each workday that gets booked (before overlaps), 0.0 - 1.0
+    block_minutes - (length in minutes, weight) pairs blocks are drawn from
+    horizon_days - number of days generated from the start date
+    work_hours - (start hour, end hour) blocks fall in, in the interviewers own timezone
+    """
+    density: float = 0.1
+    block_minutes: tuple = ((30, 3), (60, 4), (90, 1), (120, 2))
+    horizon_days: int = 7
+    work_hours: tuple = (9, 17)
+    include_weekends: bool = True
+    slot_minutes: int = 15  # blocks start on this grid
+    seed: int = 0
+
+
+DEFAULT_CONFIG = MockCalendarConfig()
+
+
+@lru_cache(maxsize=1)
+def get_name_pool():
+    # Faker is slow per call, build the names once and index into them by interviewer id
+    fake = Faker()
+    fake.seed_instance(0)
+    return tuple(fake.name() for _ in range(NAME_POOL_SIZE))
+
+
+@lru_cache(maxsize=1024)
+def get_workday_bounds(tz_name, start_date, horizon_days, work_hours, include_weekends):
+    """
+    UTC epoch (start, end) of every workday in the horizon, shared by every interviewer in the timezone
+    Built per local day so DST shifts land on the right day
+    """
+    tz = ZoneInfo(tz_name)
+    bounds = []
+    for day_offset in range(horizon_days):
+        day = start_date + timedelta(days=day_offset)
+        if not include_weekends and day.weekday() >= 5:
+            continue
+        work_start = datetime(day.year, day.month, day.day, work_hours[0], tzinfo=tz)
+        work_end = datetime(day.year, day.month, day.day, work_hours[1], tzinfo=tz)
+        # Overnight shift case
+        if work_start >= work_end:
+            work_end += timedelta(days=1)
+        bounds.append((int(work_start.timestamp()), int(work_end.timestamp())))
+    return tuple(bounds)
 
 
-def generate_busy_blocks(start_date, days=7):
-    busy_blocks = []
-    work_hours = (9, 17)  # Work hours from 9 AM to 5 PM
-    
-    # Generate 3-6 busy blocks
-    for _ in range(random.randint(3, 6)):
-        day_offset = random.randint(0, days - 1)
-        date = start_date + timedelta(days=day_offset)
+def generate_busy_epochs(interviewer_id, start_date, config=DEFAULT_CONFIG, tz_name="UTC"):
+    """
+    Busy blocks as (start, end) UTC epoch seconds, seeded by interviewer id so the same interviewer always gets the same calendar
+    """
+    rng = random.Random((config.seed << 32) ^ interviewer_id)
+    lengths = [minutes * 60 for minutes, _ in config.block_minutes]
+    cumulative_weights = list(accumulate(weight for _, weight in config.block_minutes))
+    total_weight = cumulative_weights[-1]
+    slot = config.slot_minutes * 60
+    rand = rng.random
+    randrange = rng.randrange
 
-        # Choose random hour between 9 and 15 (to ensure end time <= 17)
-        start_hour = random.randint(work_hours[0], work_hours[1] - 2)
-        duration_hours = random.randint(1, 2)
-        end_hour = min(start_hour + duration_hours, work_hours[1])
+    blocks = []
+    for work_start, work_end in get_workday_bounds(
+        tz_name, start_date, config.horizon_days, tuple(config.work_hours), config.include_weekends
+    ):
+        booked = 0
+        target = (work_end - work_start) * config.density
+        while booked < target:
+            length = lengths[bisect(cumulative_weights, rand() * total_weight)]
+            latest_slot = (work_end - work_start - length) // slot
+            if latest_slot < 0:
+                break
+            block_start = work_start + randrange(latest_slot + 1) * slot
+            blocks.append((block_start, block_start + length))
+            booked += length
 
-        start_dt = datetime.combine(date, time(start_hour, 0)).replace(tzinfo=None)
-        end_dt = datetime.combine(date, time(end_hour, 0)).replace(tzinfo=None)
+    return blocks
 
-        busy_blocks.append({
-            "start": start_dt.isoformat() + "Z",
-            "end": end_dt.isoformat() + "Z",
-        })
 
-    return busy_blocks
+def generate_busy_blocks(interviewer_id, start_date, config=DEFAULT_CONFIG, tz_name="UTC"):
+    return [
+        {"start": format_epoch(start), "end": format_epoch(end)}
+        for start, end in generate_busy_epochs(interviewer_id, start_date, config, tz_name)
+    ]
 
 
-def get_free_busy_data(interviewer_ids: list[int]) -> list[dict]:
-    start_date = datetime.utcnow().date()
+def get_free_busy_data(interviewer_ids: list[int], config: MockCalendarConfig = DEFAULT_CONFIG,
+                       timezones: dict | None = None, start_date: date | None = None, columnar: bool = False) -> list[dict]:
+    """
+    timezones - optional interviewer id -> timezone name, work hours are placed in that timezone (default UTC)
+    start_date - first generated day (default today UTC)
+    columnar - "busy" is a BusyColumns of epoch seconds instead of a list of ISO string dicts
+    """
+    start_date = start_date or datetime.now(timezone.utc).date()
+    timezones = timezones or {}
+    names = get_name_pool()
     data = []
 
     for id_ in interviewer_ids:
         interviewer = {
             "interviewerId": id_,
-            "name": fake.name(),
-            "busy": generate_busy_blocks(start_date)  # Changed from 'availability' to 'busy'
+            "name": names[id_ % NAME_POOL_SIZE],
+            "busy": (
+                BusyColumns.from_pairs(generate_busy_epochs(id_, start_date, config, timezones.get(id_, "UTC")))
+                if columnar else generate_busy_blocks(id_, start_date, config, timezones.get(id_, "UTC"))
+            ),
         }
         data.append(interviewer)
 
-    return data 
\ No newline at end of file
+    return data
@@ -0,0 +1,35 @@
+from array import array
+
+import pytest
+
+from services.busy_columns import BusyColumns
+from services.busy_columns import decode_free_busy
+from services.busy_columns import encode_free_busy
+
+
+def test_round_trip():
+    columns = BusyColumns([0, 1_760_000_000, -60], [900, 1_760_003_600, 0])
+
+    assert BusyColumns.from_bytes(columns.to_bytes()) == columns
+    assert list(columns) == [(0, 900), (1_760_000_000, 1_760_003_600), (-60, 0)]
+    assert isinstance(columns.starts, array)
+
+
+def test_mismatched_lengths():
+    with pytest.raises(ValueError, match="same length"):
+        BusyColumns([1, 2], [3])
+
+
+def test_concat():
+    combined = BusyColumns.concat([BusyColumns([1], [2]), BusyColumns(), BusyColumns([3, 5], [4, 6])])
+
+    assert combined == BusyColumns.from_pairs([(1, 2), (3, 4), (5, 6)])
+
+
+def test_free_busy_round_trip():
+    data = [
+        {"interviewerId": 7, "name": "Zoë Smith", "busy": BusyColumns([10, 20], [15, 30])},
+        {"interviewerId": 8, "name": "", "busy": BusyColumns()},
+    ]
+
+    assert decode_free_busy(encode_free_busy(data)) == data
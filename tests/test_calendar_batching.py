@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+
+import pytest
+
+from services.calendar_batching import FreeBusyBatcher
+from services.calendar_batching import covering_window
+from services.calendar_client import CalendarProviderError
+from services.calendar_client import fetch_free_busy
+from services.calendar_server import CalendarServer
+from services.calendar_server import StandInConfig
+
+
+def run_concurrently(count, fn):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def call(n):
+        barrier.wait()
+        try:
+            results[n] = fn(n)
+        except CalendarProviderError as e:
+            results[n] = e
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_merges_concurrent_calls():
+    calls = []
+
+    def fetch(ids, timezones, window):
+        calls.append((ids, timezones, window))
+        return [{"interviewerId": i, "busy": [i]} for i in ids]
+
+    batcher = FreeBusyBatcher(fetch, window=0.05)
+    results = run_concurrently(8, lambda n: batcher.load([n % 3, 10 + n], {n % 3: "UTC"}, (n, 100 + n)))
+
+    assert len(calls) == 1
+    ids, timezones, window = calls[0]
+    # Every id once
+    assert sorted(ids) == [0, 1, 2] + list(range(10, 18))
+    assert timezones == {0: "UTC", 1: "UTC", 2: "UTC"}
+    assert window == (0, 107)
+    for n, records in enumerate(results):
+        assert [r["interviewerId"] for r in records] == [n % 3, 10 + n]
+
+
+def test_max_batch_dispatches_early():
+    batcher = FreeBusyBatcher(lambda ids, timezones, window: [{"interviewerId": i} for i in ids], window=5.0, max_batch=2)
+    started = time.perf_counter()
+    assert batcher.load([1, 2]) == [{"interviewerId": 1}, {"interviewerId": 2}]
+    assert time.perf_counter() - started < 1.0
+
+
+def test_error_reaches_every_caller():
+    def fetch(ids, timezones, window):
+        raise CalendarProviderError("down")
+
+    batcher = FreeBusyBatcher(fetch, window=0.05)
+    results = run_concurrently(4, lambda n: batcher.load([n]))
+    assert all(isinstance(result, CalendarProviderError) for result in results)
+    assert batcher.upstream_calls == 1
+
+
+def test_missing_interviewer():
+    batcher = FreeBusyBatcher(lambda ids, timezones, window: [], window=0)
+    with pytest.raises(CalendarProviderError):
+        batcher.load([1])
+
+
+def test_covering_window():
+    assert covering_window([(5, 10), (1, 7)]) == (1, 10)
+    assert covering_window([(5, 10), None]) is None
+
+
+def test_batches_against_stand_in():
+    server = CalendarServer(("127.0.0.1", 0), StandInConfig(latency="fixed:20"))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        batcher = FreeBusyBatcher(lambda ids, timezones, window: fetch_free_busy(url, ids, timezones), window=0.01)
+        rng = random.Random(0)
+        panels = [rng.sample(range(1, 30), 5) for _ in range(16)]
+        results = run_concurrently(16, lambda n: batcher.load(panels[n]))
+
+        assert server.request_count < 16
+        for panel, records in zip(panels, results):
+            assert records == fetch_free_busy(url, panel)
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,180 @@
+import random
+import threading
+import time
+from datetime import date, datetime
+
+import pytest
+
+from services.busy_columns import BusyColumns
+from services.calendar_changes import CalendarChangeLog
+from services.calendar_changes import SyncTokenExpired
+from services.calendar_client import CalendarProviderError
+from services.calendar_client import SyncTokenExpiredError
+from services.calendar_client import fetch_busy_changes
+from services.calendar_client import fetch_free_busy
+from services.calendar_server import CalendarServer
+from services.calendar_server import FreeBusyHandler
+from services.calendar_server import StandInConfig
+from services.calendar_server import parse_latency
+from services.mock_availability import get_free_busy_data
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(config: StandInConfig):
+        server = CalendarServer(("127.0.0.1", 0), config)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_serves_mock_calendars(start_server):
+    server, url = start_server(StandInConfig())
+
+    actual = fetch_free_busy(url, [1, 2], {1: "America/New_York"})
+    expected = get_free_busy_data([1, 2], timezones={1: "America/New_York"})
+
+    assert actual == expected
+    # Second call reuses the keep-alive connection
+    assert fetch_free_busy(url, [3])[0]["interviewerId"] == 3
+    assert server.request_count == 2
+
+
+def test_resends_on_idle_closed_connection(start_server):
+    server, url = start_server(StandInConfig())
+    # The server drops keep-alive connections idle for 50ms
+    server.RequestHandlerClass = type("IdleClosingHandler", (FreeBusyHandler,), {"timeout": 0.05})
+
+    assert fetch_free_busy(url, [1])[0]["interviewerId"] == 1
+    time.sleep(0.2)
+    assert fetch_free_busy(url, [2])[0]["interviewerId"] == 2
+    time.sleep(0.2)
+    assert "nextSyncToken" in fetch_busy_changes(url, 3)
+    assert server.request_count == 3
+
+
+def test_injected_errors(start_server):
+    _, url = start_server(StandInConfig(error_rate=1.0))
+
+    with pytest.raises(CalendarProviderError):
+        fetch_free_busy(url, [1])
+
+
+def test_timeout(start_server):
+    _, url = start_server(StandInConfig(hang_rate=1.0, hang_seconds=1.0))
+
+    with pytest.raises(CalendarProviderError):
+        fetch_free_busy(url, [1], timeout=0.1)
+
+
+def test_connection_refused():
+    with pytest.raises(CalendarProviderError):
+        fetch_free_busy("http://127.0.0.1:9", [1], timeout=0.5)
+
+
+@pytest.mark.parametrize(
+    ("spec", "low", "high"),
+    [
+        ("fixed:80", 0.08, 0.08),
+        ("uniform:20:200", 0.02, 0.2),
+    ],
+)
+def test_parse_latency_bounds(spec: str, low: float, high: float):
+    sample = parse_latency(spec)
+    rng = random.Random(0)
+
+    assert all(low <= sample(rng) <= high for _ in range(100))
+
+
+def test_parse_latency_lognormal_tail():
+    sample = parse_latency("lognormal:80:2000")
+    rng = random.Random(0)
+    samples = sorted(sample(rng) for _ in range(20000))
+
+    assert samples[10000] == pytest.approx(0.08, rel=0.1)
+    assert samples[19800] == pytest.approx(2.0, rel=0.25)
+
+
+def test_parse_latency_invalid():
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+
+
+def test_serves_columnar_calendars(start_server):
+    _, url = start_server(StandInConfig())
+
+    actual = fetch_free_busy(url, [1, 2], {1: "America/New_York"}, columnar=True)
+    expected = get_free_busy_data([1, 2], timezones={1: "America/New_York"}, columnar=True)
+
+    assert actual == expected
+    assert isinstance(actual[0]["busy"], BusyColumns)
+
+
+def test_streams_json_into_columns(start_server):
+    _, url = start_server(StandInConfig(columnar=False))
+    window = (1_700_000_000, 1_900_000_000)
+
+    def busy_filter(start, end):
+        start, end = int(datetime.fromisoformat(start).timestamp()), int(datetime.fromisoformat(end).timestamp())
+        return (start, end) if window[0] <= start and end <= window[1] else None
+
+    actual = fetch_free_busy(url, [1, 2], columnar=True, busy_filter=busy_filter)
+    expected = get_free_busy_data([1, 2], columnar=True)
+
+    assert [i["interviewerId"] for i in actual] == [1, 2]
+    assert actual[0]["busy"] == expected[0]["busy"]
+
+
+def test_change_log_deltas():
+    log = CalendarChangeLog(start_date=date(2025, 10, 6))
+    full = log.changes(1)
+    assert len(full["events"]) == len(log.calendars[1].events) > 0
+    token = full["nextSyncToken"]
+
+    assert log.changes(1, sync_token=token)["events"] == []
+    event_id = log.add_event(1, 1_000, 2_000)
+    cancelled_id = full["events"][0]["id"]
+    log.cancel_event(1, cancelled_id)
+    delta = log.changes(1, sync_token=token)
+    assert delta["events"] == [
+        {"id": cancelled_id, "cancelled": True},
+        {"id": event_id, "start": 1_000, "end": 2_000, "cancelled": False},
+    ]
+    assert log.changes(1, sync_token=delta["nextSyncToken"])["events"] == []
+
+
+def test_change_log_token_expiry():
+    log = CalendarChangeLog(max_log=2, start_date=date(2025, 10, 6))
+    token = log.changes(1)["nextSyncToken"]
+    for n in range(3):
+        log.add_event(1, n, n + 1)
+    with pytest.raises(SyncTokenExpired):
+        log.changes(1, sync_token=token)
+    with pytest.raises(SyncTokenExpired):
+        log.changes(1, sync_token="garbage")
+
+
+def test_change_log_churn():
+    log = CalendarChangeLog(churn=5, start_date=date(2025, 10, 6))
+    token = log.changes(1)["nextSyncToken"]
+    delta = log.changes(1, sync_token=token)
+    assert 0 < len(delta["events"]) <= 5
+    assert int(delta["nextSyncToken"]) == int(token) + 5
+
+
+def test_serves_sync(start_server):
+    server, url = start_server(StandInConfig(churn=3))
+
+    full = fetch_busy_changes(url, 1, "America/New_York")
+    delta = fetch_busy_changes(url, 1, "America/New_York", full["nextSyncToken"])
+    assert delta["events"]
+    assert int(delta["nextSyncToken"]) > int(full["nextSyncToken"])
+    with pytest.raises(SyncTokenExpiredError):
+        fetch_busy_changes(url, 1, sync_token="garbage")
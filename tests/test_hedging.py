@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+
+from services.calendar_client import Cancellation
+from services.calendar_client import CalendarProviderError
+from services.calendar_client import fetch_free_busy
+from services.calendar_server import CalendarServer
+from services.calendar_server import StandInConfig
+from services.hedging import HedgeBudget
+from services.hedging import Hedger
+from services.hedging import LatencyTracker
+
+
+def warmed_hedger(max_ratio=1.0, latency=0.01):
+    tracker = LatencyTracker(min_samples=5)
+    for _ in range(5):
+        tracker.record(latency)
+    hedger = Hedger(max_ratio=max_ratio, tracker=tracker)
+    # Start with a full bucket so the first slow call can hedge
+    hedger.budget.tokens = hedger.budget.burst
+    return hedger
+
+
+def slow_then_fast(delays):
+    """
+    fn whose nth request sleeps delays[n], returning n, aborted early once cancelled
+    """
+    lock = threading.Lock()
+    started = []
+    cancelled = []
+
+    def fn(cancellation):
+        with lock:
+            n = len(started)
+            started.append(n)
+        deadline = time.monotonic() + delays[n]
+        while time.monotonic() < deadline:
+            if cancellation.cancelled:
+                cancelled.append(n)
+                raise CalendarProviderError("cancelled")
+            time.sleep(0.001)
+        return n
+
+    return fn, started, cancelled
+
+
+def test_no_hedge_before_enough_samples():
+    hedger = Hedger(max_ratio=1.0, tracker=LatencyTracker(min_samples=5))
+    fn, started, _ = slow_then_fast([0.05, 0])
+    assert hedger.call(fn) == 0
+    assert started == [0]
+    assert hedger.hedges == 0
+
+
+def test_slow_call_hedged_and_loser_cancelled():
+    hedger = warmed_hedger()
+    fn, started, cancelled = slow_then_fast([2.0, 0.0])
+    began = time.monotonic()
+    assert hedger.call(fn) == 1
+    assert time.monotonic() - began < 0.5
+    assert started == [0, 1]
+    assert hedger.hedge_wins == 1
+    deadline = time.monotonic() + 1
+    while not cancelled and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert cancelled == [0]
+
+
+def test_fast_call_not_hedged():
+    hedger = warmed_hedger(latency=0.5)
+    fn, started, _ = slow_then_fast([0.0, 0.0])
+    assert hedger.call(fn) == 0
+    assert started == [0]
+
+
+def test_primary_still_wins_when_hedge_fails():
+    hedger = warmed_hedger()
+    calls = []
+
+    def fn(cancellation):
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            return "primary"
+        raise CalendarProviderError("hedge failed")
+
+    assert hedger.call(fn) == "primary"
+    assert hedger.hedges == 1
+    assert hedger.hedge_wins == 0
+
+
+def test_both_failing_raises():
+    hedger = warmed_hedger()
+
+    def fn(cancellation):
+        time.sleep(0.05)
+        raise CalendarProviderError("down")
+
+    with pytest.raises(CalendarProviderError):
+        hedger.call(fn)
+
+
+def test_budget_caps_hedge_rate():
+    budget = HedgeBudget(0.1)
+    spent = 0
+    for _ in range(200):
+        budget.earn()
+        spent += budget.spend()
+    assert spent == 20
+
+
+def test_cancellation_aborts_hung_request():
+    server = CalendarServer(("127.0.0.1", 0), StandInConfig(hang_rate=1.0, hang_seconds=5))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        cancellation = Cancellation()
+        errors = []
+
+        def call():
+            try:
+                fetch_free_busy(url, [1], timeout=10, cancellation=cancellation)
+            except CalendarProviderError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=call)
+        began = time.monotonic()
+        thread.start()
+        time.sleep(0.1)
+        cancellation.cancel()
+        thread.join(2)
+        assert not thread.is_alive()
+        assert len(errors) == 1
+        assert time.monotonic() - began < 1
+    finally:
+        server.shutdown()
+        server.server_close()
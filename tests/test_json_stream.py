@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from services.busy_columns import BusyColumns
+from services.json_stream import FreeBusyStreamParser
+from services.json_stream import parse_free_busy_stream
+
+PAYLOAD = json.dumps([
+    {"interviewerId": 1, "name": "Zoë \"Z\" Smith", "busy": [
+        {"start": "10", "end": "20"},
+        {"end": "40", "start": "30"},
+        {"start": "50", "end": "60", "source": {"id": 12345}},
+    ]},
+    {"busy": [], "interviewerId": 22, "name": "B", "tags": [1, 2.5, None, True]},
+], indent=1, ensure_ascii=False).encode()
+
+
+def to_ints(start, end):
+    return int(start), int(end)
+
+
+def split(payload, size):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(PAYLOAD)])
+def test_any_chunking_parses_the_same(size):
+    records = parse_free_busy_stream(split(PAYLOAD, size), to_ints)
+
+    assert records == [
+        {"interviewerId": 1, "name": "Zoë \"Z\" Smith", "busy": BusyColumns([10, 30, 50], [20, 40, 60])},
+        {"interviewerId": 22, "name": "B", "busy": BusyColumns(), "tags": [1, 2.5, None, True]},
+    ]
+
+
+def test_filter_drops_blocks():
+    def keep_late(start, end):
+        start, end = to_ints(start, end)
+        return (start, end) if start >= 30 else None
+
+    records = parse_free_busy_stream(split(PAYLOAD, 5), keep_late)
+
+    assert records[0]["busy"] == BusyColumns([30, 50], [40, 60])
+
+
+def test_records_returned_as_they_complete():
+    parser = FreeBusyStreamParser(to_ints)
+    first_end = PAYLOAD.index(b"\"interviewerId\": 22")
+
+    assert [r["interviewerId"] for r in parser.feed(PAYLOAD[:first_end])] == [1]
+    assert [r["interviewerId"] for r in parser.feed(PAYLOAD[first_end:])] == [22]
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize("payload", [b"", b"[", b'[{"busy": [', b'{"busy": []}', b"[] []", b'[{"busy": [{"start": 1'])
+def test_invalid_payloads(payload):
+    with pytest.raises(ValueError):
+        parse_free_busy_stream([payload], to_ints)
@@ -0,0 +1,53 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from services.mock_availability import MockCalendarConfig
+from services.mock_availability import generate_busy_epochs
+from services.mock_availability import get_free_busy_data
+
+START_DATE = date(2025, 10, 6)
+
+
+def test_same_interviewer_same_calendar():
+    first = get_free_busy_data([7, 8], start_date=START_DATE)
+    second = get_free_busy_data([8, 7], start_date=START_DATE)
+
+    assert first[0] == second[1]
+    assert first[1] == second[0]
+    assert first[0]["busy"] != first[1]["busy"]
+
+
+def test_seed_changes_calendar():
+    default = generate_busy_epochs(7, START_DATE)
+    reseeded = generate_busy_epochs(7, START_DATE, MockCalendarConfig(seed=1))
+
+    assert default != reseeded
+
+
+def test_density_and_horizon():
+    config = MockCalendarConfig(density=0.8, horizon_days=30)
+    blocks = generate_busy_epochs(1, START_DATE, config)
+    booked = sum(end - start for start, end in blocks)
+
+    # 30 workdays of 8 hours, 80% booked before overlaps
+    assert booked >= 0.8 * 30 * 8 * 3600
+    assert len(blocks) > len(generate_busy_epochs(1, START_DATE, MockCalendarConfig(horizon_days=30)))
+
+
+def test_blocks_in_local_work_hours():
+    config = MockCalendarConfig(density=0.5, work_hours=(9, 17), include_weekends=False)
+    tz = ZoneInfo("Asia/Kolkata")
+
+    for start, end in generate_busy_epochs(3, START_DATE, config, "Asia/Kolkata"):
+        local_start = datetime.fromtimestamp(start, tz)
+        local_end = datetime.fromtimestamp(end, tz)
+        assert local_start.weekday() < 5
+        assert local_start.hour >= 9
+        assert (local_end.hour, local_end.minute) <= (17, 0)
+
+
+def test_names_from_pool():
+    data = get_free_busy_data([1, 2], start_date=START_DATE)
+
+    assert all(isinstance(interviewer["name"], str) and interviewer["name"] for interviewer in data)
+    assert data[0]["busy"][0]["start"].endswith("Z")